@@ -0,0 +1,55 @@
+"""composite indexes for the hot expense query shapes
+
+Revision ID: 0002_expense_query_indexes
+Revises: 0001_initial_schema
+Create Date: 2026-10-18 09:30:00.000000
+
+Indexes are built CONCURRENTLY so the migration can run against a live
+expenses table without blocking writes.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_expense_query_indexes"
+down_revision: Union[str, None] = "0001_initial_schema"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, columns, INCLUDE columns) - keep in sync with Expense.__table_args__
+INDEXES = [
+    ("ix_expenses_user_id_date", ["user_id", "date", "id"], ["amount", "category_id", "status"]),
+    ("ix_expenses_user_id_created_at", ["user_id", "created_at"], None),
+    ("ix_expenses_status_date", ["status", "date", "id"], None),
+    ("ix_expenses_date_id", ["date", "id"], None),
+    ("ix_expenses_created_at", ["created_at"], None),
+    ("ix_expenses_category_id", ["category_id"], None),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns, include in INDEXES:
+            op.create_index(
+                name,
+                "expenses",
+                columns,
+                postgresql_include=include or [],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name="expenses",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,48 @@
+"""expense monthly rollup table
+
+Revision ID: 0003_expense_monthly_rollups
+Revises: 0002_expense_query_indexes
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_expense_monthly_rollups"
+down_revision: Union[str, None] = "0002_expense_query_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "expense_monthly_rollups",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM("PENDING", "APPROVED", "REJECTED", name="expensestatus", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("total_amount", sa.Float(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["category_id"], ["categories.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("user_id", "category_id", "status", "month"),
+    )
+    op.execute("""
+        INSERT INTO expense_monthly_rollups (user_id, category_id, status, month, total_amount, count)
+        SELECT user_id, category_id, status, date_trunc('month', date)::date, sum(amount), count(*)
+        FROM expenses
+        GROUP BY user_id, category_id, status, date_trunc('month', date)::date
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table("expense_monthly_rollups")
@@ -0,0 +1,36 @@
+"""ai response cache table
+
+Revision ID: 0005_ai_response_cache
+Revises: 0004_user_token_version
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_ai_response_cache"
+down_revision: Union[str, None] = "0004_user_token_version"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ai_response_cache",
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("endpoint", sa.String(), nullable=False),
+        sa.Column("response", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    op.create_index("ix_ai_response_cache_expires_at", "ai_response_cache", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ai_response_cache_expires_at", table_name="ai_response_cache")
+    op.drop_table("ai_response_cache")
@@ -0,0 +1,67 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from app.core.database import get_db, run_db, DbSession
+from app.core.db_pool import pool_stats
+from app.core.slow_queries import slow_query_log
+from app.services.auth_service import AuthService
+from app.services.principal_cache import principal_cache
+from app.services.category_registry import category_registry
+from app.schemas.user import UserAccessUpdate, UserResponse
+from app.models.user import User
+from app.api.conditional import conditional_get_stats
+from app.api.dependencies import get_current_manager
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+@router.get("/db/pool")
+async def get_db_pool_stats(current_user: User = Depends(get_current_manager)):
+    """Get connection pool gauges, checkout wait histograms and recent timeouts (managers only)."""
+    return pool_stats()
+
+
+@router.get("/db/slow-queries")
+async def get_slow_queries(
+    limit: Optional[int] = Query(None, ge=1, description="Most recent entries to return"),
+    current_user: User = Depends(get_current_manager)
+):
+    """Get this worker's recent slow statements, with sampled EXPLAIN ANALYZE plans (managers only)."""
+    return slow_query_log.stats(limit)
+
+
+@router.get("/principal-cache/stats")
+async def get_principal_cache_stats(current_user: User = Depends(get_current_manager)):
+    """Get authenticated-user cache hit/miss/eviction counters (managers only)."""
+    return principal_cache.stats()
+
+
+@router.get("/category-registry/stats")
+async def get_category_registry_stats(current_user: User = Depends(get_current_manager)):
+    """Get this worker's category registry version, size and reload counts (managers only)."""
+    return category_registry.stats()
+
+
+@router.get("/conditional-get/stats")
+async def get_conditional_get_stats(current_user: User = Depends(get_current_manager)):
+    """Get per-endpoint ETag revalidation outcomes and 304 ratios (managers only)."""
+    return conditional_get_stats()
+
+
+@router.patch("/users/{user_id}", response_model=UserResponse)
+async def update_user_access(
+    user_id: int,
+    update: UserAccessUpdate,
+    current_user: User = Depends(get_current_manager),
+    db: DbSession = Depends(get_db)
+):
+    """Activate/deactivate a user or change their role (managers only).
+
+    Any change revokes the user's existing access tokens.
+    """
+    user = await run_db(db, AuthService.update_user_access, user_id, update.is_active, update.role)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    return user
@@ -1,15 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.core.database import get_db, run_db, release_connection, DbSession
 from app.services.ai_service import AIService
+from app.services.ai_response_cache import ai_response_cache
 from app.services.expense_service import ExpenseService
 from app.models.user import User
-from app.api.dependencies import get_current_active_user
-from pydantic import BaseModel
-from typing import Optional
+from app.api.dependencies import get_current_active_user, get_current_manager
+from pydantic import BaseModel, Field
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 router = APIRouter(prefix="/ai", tags=["AI Insights"])
 
+REFRESH_QUERY = Query(False, description="Bypass the stored response and call the model again")
+
 
 class AISummaryRequest(BaseModel):
     days: Optional[int] = 30
@@ -21,67 +26,190 @@ class AISummaryResponse(BaseModel):
     total_amount: float
 
 
+class CategoryPredictionItem(BaseModel):
+    title: str
+    amount: float
+    description: Optional[str] = ""
+
+
+class BatchCategoryPredictionRequest(BaseModel):
+    items: List[CategoryPredictionItem] = Field(..., min_length=1, max_length=settings.AI_BATCH_MAX_ITEMS)
+
+
 @router.post("/summary", response_model=AISummaryResponse)
-def get_ai_summary(
+async def get_ai_summary(
     request: AISummaryRequest,
+    refresh: bool = REFRESH_QUERY,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
     """Get AI-generated financial insights for the current user."""
-    # Get recent expenses for analysis
-    expenses = ExpenseService.get_user_recent_expenses(
-        db=db, user_id=current_user.id, days=request.days
+    # Fingerprint the expenses first; unchanged inputs are answered from the cache
+    versions = await run_db(
+        db, ExpenseService.get_user_recent_expense_versions, user_id=current_user.id, days=request.days
     )
     
-    if not expenses:
+    if not versions:
         return AISummaryResponse(
             insights="No expenses found for analysis. Start by adding some expenses to get personalized insights.",
             total_expenses=0,
             total_amount=0.0
         )
     
-    # Generate AI insights
+    cache_key = ai_response_cache.key("summary", {"days": request.days}, versions)
+    if not refresh:
+        cached = await run_db(db, ai_response_cache.get, cache_key)
+        if cached is not None:
+            return cached
+    
+    # Get recent expenses for analysis
+    expenses = await run_db(
+        db, ExpenseService.get_user_recent_expenses, user_id=current_user.id, days=request.days
+    )
+    
+    # Generate AI insights (without holding a pooled connection while waiting on Groq)
+    await release_connection(db)
     ai_service = AIService()
-    insights = ai_service.analyze_user_expenses(expenses, current_user.full_name)
+    insights = await ai_service.analyze_user_expenses_async(expenses, current_user.full_name)
     
     # Calculate totals
     total_amount = sum(expense.amount for expense in expenses)
     
-    return AISummaryResponse(
+    response = AISummaryResponse(
         insights=insights,
         total_expenses=len(expenses),
         total_amount=float(total_amount)
     )
+    if not AIService.failed(insights):
+        await run_db(db, ai_response_cache.set, cache_key, "summary", response.model_dump())
+    return response
+
+
+def _sse(data: Dict[str, Any], event: Optional[str] = None) -> str:
+    """Format one Server-Sent Event."""
+    message = f"data: {json.dumps(data)}\n\n"
+    return f"event: {event}\n{message}" if event else message
+
+
+def _event_stream(events: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/summary/stream")
+async def stream_ai_summary(
+    request: AISummaryRequest,
+    refresh: bool = REFRESH_QUERY,
+    current_user: User = Depends(get_current_active_user),
+    db: DbSession = Depends(get_db)
+):
+    """Stream AI-generated insights as Server-Sent Events while the model writes them.
+    
+    Events: ``meta`` (totals), unnamed ``{"delta": ...}`` text pieces, then
+    ``done`` or ``error``. If the client disconnects, the Groq stream is closed.
+    """
+    versions = await run_db(
+        db, ExpenseService.get_user_recent_expense_versions, user_id=current_user.id, days=request.days
+    )
+    
+    async def replay(response: Dict[str, Any], cached: bool) -> AsyncIterator[str]:
+        yield _sse({"total_expenses": response["total_expenses"], "total_amount": response["total_amount"]}, "meta")
+        yield _sse({"delta": response["insights"]})
+        yield _sse({"cached": cached}, "done")
+    
+    if not versions:
+        return _event_stream(replay(AISummaryResponse(
+            insights="No expenses found for analysis. Start by adding some expenses to get personalized insights.",
+            total_expenses=0,
+            total_amount=0.0
+        ).model_dump(), cached=False))
+    
+    cache_key = ai_response_cache.key("summary", {"days": request.days}, versions)
+    if not refresh:
+        cached = await run_db(db, ai_response_cache.get, cache_key)
+        if cached is not None:
+            return _event_stream(replay(cached, cached=True))
+    
+    expenses = await run_db(
+        db, ExpenseService.get_user_recent_expenses, user_id=current_user.id, days=request.days
+    )
+    await release_connection(db)
+    total_amount = float(sum(expense.amount for expense in expenses))
+    
+    async def generate() -> AsyncIterator[str]:
+        yield _sse({"total_expenses": len(expenses), "total_amount": total_amount}, "meta")
+        parts = []
+        try:
+            async for delta in AIService().stream_user_expense_analysis(expenses, current_user.full_name):
+                parts.append(delta)
+                yield _sse({"delta": delta})
+        except Exception as e:
+            yield _sse({"detail": f"{AIService.SUMMARY_ERROR} Error: {str(e)}"}, "error")
+            return
+        
+        insights = "".join(parts)
+        if not insights:
+            yield _sse({"detail": f"{AIService.SUMMARY_ERROR} Error: empty response"}, "error")
+            return
+        
+        # Only complete, non-empty answers are stored; a disconnect cancels before this point
+        response = AISummaryResponse(insights=insights, total_expenses=len(expenses), total_amount=total_amount)
+        await run_db(db, ai_response_cache.set, cache_key, "summary", response.model_dump())
+        yield _sse({"cached": False}, "done")
+    
+    return _event_stream(generate())
 
 
 @router.post("/predict-category")
-def predict_expense_category(
+async def predict_expense_category(
     title: str,
     amount: float,
     description: Optional[str] = "",
     current_user: User = Depends(get_current_active_user)
 ):
-    """Predict the most likely category for an expense using AI."""
+    """Predict the most likely category for an expense.
+    
+    The local classifier answers when it is confident enough; otherwise Groq is asked.
+    """
+    local = AIService.local_category_prediction(title, amount, description)
+    if local is not None:
+        return local
+    
     ai_service = AIService()
-    predicted_category = ai_service.predict_expense_category(title, amount, description)
+    predicted_category = await ai_service.predict_expense_category_async(title, amount, description)
     
     return {
         "predicted_category": predicted_category,
-        "confidence": "high"  # Placeholder for confidence score
+        "confidence": None,
+        "source": "llm"
     }
 
 
+@router.post("/predict-category/batch")
+async def predict_expense_categories(
+    request: BatchCategoryPredictionRequest,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Predict categories for many expenses at once; predictions are returned in input order."""
+    items = [(item.title, item.amount, item.description or "") for item in request.items]
+    predictions = await AIService.predict_categories_batch_async(items)
+    return {"predictions": predictions}
+
+
 @router.post("/budget-recommendations")
-def get_budget_recommendations(
+async def get_budget_recommendations(
     monthly_budget: float,
+    refresh: bool = REFRESH_QUERY,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
     """Get AI-generated budget recommendations."""
-    # Get recent expenses for budget analysis
-    expenses = ExpenseService.get_user_recent_expenses(db=db, user_id=current_user.id, days=30)
+    versions = await run_db(db, ExpenseService.get_user_recent_expense_versions, user_id=current_user.id, days=30)
     
-    if not expenses:
+    if not versions:
         return {
             "recommendations": "No expense data available for budget recommendations. Start by adding some expenses.",
             "monthly_budget": monthly_budget,
@@ -89,17 +217,39 @@ def get_budget_recommendations(
             "remaining_budget": monthly_budget
         }
     
+    cache_key = ai_response_cache.key("budget", {"days": 30, "monthly_budget": monthly_budget}, versions)
+    if not refresh:
+        cached = await run_db(db, ai_response_cache.get, cache_key)
+        if cached is not None:
+            return cached
+    
+    # Get recent expenses for budget analysis
+    expenses = await run_db(db, ExpenseService.get_user_recent_expenses, user_id=current_user.id, days=30)
+    
     # Generate budget recommendations
+    await release_connection(db)
     ai_service = AIService()
-    recommendations = ai_service.generate_budget_recommendations(expenses, monthly_budget)
+    recommendations = await ai_service.generate_budget_recommendations_async(expenses, monthly_budget)
     
     # Calculate totals
     total_spent = sum(expense.amount for expense in expenses)
     remaining_budget = monthly_budget - total_spent
     
-    return {
+    response = {
         "recommendations": recommendations,
         "monthly_budget": monthly_budget,
         "total_spent": float(total_spent),
         "remaining_budget": float(remaining_budget)
-    } 
\ No newline at end of file
+    }
+    if not AIService.failed(recommendations):
+        await run_db(db, ai_response_cache.set, cache_key, "budget", response)
+    return response
+
+
+@router.get("/cache/stats")
+async def get_ai_cache_stats(
+    current_user: User = Depends(get_current_manager),
+    db: DbSession = Depends(get_db)
+):
+    """Get AI response cache hit/miss/eviction counters (managers only)."""
+    return await run_db(db, ai_response_cache.stats)
@@ -1,69 +1,142 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.services.analytics_service import AnalyticsService
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from typing import List
+from app.core.database import get_db, run_db, DbSession
+from app.services.analytics_service import AnalyticsService, TREND_MONTHS
+from app.services.analytics_cache import analytics_cache
 from app.schemas.analytics import AnalyticsResponse
 from app.models.user import User, UserRole
+from app.services.data_versions import ALL_SCOPE, CATEGORIES_SCOPE, user_scope
+from app.api.conditional import conditional_get
 from app.api.dependencies import get_current_active_user, get_current_manager
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
 
+def _scopes(user: User) -> List[str]:
+    """Data a user's analytics read: their expenses and the category names."""
+    return [user_scope(user.id), CATEGORIES_SCOPE]
+
+
+def _trend_start():
+    """Part of the ETag of responses with trends: their window moves with the calendar, not with writes."""
+    return AnalyticsService._trend_start(TREND_MONTHS)
+
+
 @router.get("/monthly", response_model=AnalyticsResponse)
-def get_monthly_analytics(
+async def get_monthly_analytics(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
     """Get monthly analytics for the current user."""
-    analytics = AnalyticsService.get_comprehensive_analytics(db=db, user_id=current_user.id)
+    not_modified = await conditional_get(
+        request, response, db, "analytics/monthly", _scopes(current_user), current_user.id, _trend_start()
+    )
+    if not_modified:
+        return not_modified
+    analytics = await run_db(
+        db, analytics_cache.get_or_compute, "comprehensive",
+        AnalyticsService.get_comprehensive_analytics, user_id=current_user.id, stamp=request.state.etag
+    )
     return analytics
 
 
 @router.get("/all", response_model=AnalyticsResponse)
-def get_all_analytics(
+async def get_all_analytics(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_manager),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
     """Get analytics for all users (managers only)."""
-    analytics = AnalyticsService.get_comprehensive_analytics(db=db)
+    not_modified = await conditional_get(
+        request, response, db, "analytics/all", [ALL_SCOPE, CATEGORIES_SCOPE], _trend_start()
+    )
+    if not_modified:
+        return not_modified
+    analytics = await run_db(
+        db, analytics_cache.get_or_compute, "comprehensive",
+        AnalyticsService.get_comprehensive_analytics, stamp=request.state.etag
+    )
     return analytics
 
 
 @router.get("/categories")
-def get_category_breakdown(
+async def get_category_breakdown(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
     """Get expense breakdown by category."""
-    breakdown = AnalyticsService.get_category_breakdown(db=db, user_id=current_user.id)
+    not_modified = await conditional_get(request, response, db, "analytics/categories", _scopes(current_user), current_user.id)
+    if not_modified:
+        return not_modified
+    breakdown = await run_db(
+        db, analytics_cache.get_or_compute, "categories",
+        AnalyticsService.get_category_breakdown, user_id=current_user.id, stamp=request.state.etag
+    )
     return breakdown
 
 
 @router.get("/trends")
-def get_monthly_trends(
+async def get_monthly_trends(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
     """Get monthly expense trends."""
-    trends = AnalyticsService.get_monthly_trends(db=db, user_id=current_user.id)
+    not_modified = await conditional_get(
+        request, response, db, "analytics/trends", _scopes(current_user), current_user.id, _trend_start()
+    )
+    if not_modified:
+        return not_modified
+    trends = await run_db(
+        db, analytics_cache.get_or_compute, "trends",
+        AnalyticsService.get_monthly_trends, user_id=current_user.id, stamp=request.state.etag
+    )
     return trends
 
 
 @router.get("/status")
-def get_status_breakdown(
+async def get_status_breakdown(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
     """Get expense breakdown by status."""
-    breakdown = AnalyticsService.get_status_breakdown(db=db, user_id=current_user.id)
+    not_modified = await conditional_get(request, response, db, "analytics/status", _scopes(current_user), current_user.id)
+    if not_modified:
+        return not_modified
+    breakdown = await run_db(
+        db, analytics_cache.get_or_compute, "status",
+        AnalyticsService.get_status_breakdown, user_id=current_user.id, stamp=request.state.etag
+    )
     return breakdown
 
 
 @router.get("/recent")
-def get_recent_expenses(
+async def get_recent_expenses(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
     """Get recent expenses for analytics."""
-    recent = AnalyticsService.get_recent_expenses(db=db, user_id=current_user.id)
-    return recent 
\ No newline at end of file
+    not_modified = await conditional_get(request, response, db, "analytics/recent", _scopes(current_user), current_user.id)
+    if not_modified:
+        return not_modified
+    recent = await run_db(
+        db, analytics_cache.get_or_compute, "recent",
+        AnalyticsService.get_recent_expenses, user_id=current_user.id, stamp=request.state.etag
+    )
+    return recent
+
+
+@router.get("/cache/stats")
+async def get_cache_stats(current_user: User = Depends(get_current_manager)):
+    """Get analytics cache hit/miss/eviction counters (managers only)."""
+    return analytics_cache.stats()
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_db, run_db, DbSession
+from app.core.password_hasher import PasswordHasherBusy
 from app.services.auth_service import AuthService
 from app.schemas.user import UserCreate, UserResponse, UserLogin, Token
 from app.models.user import User
@@ -8,11 +9,19 @@ from app.models.user import User
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many password checks in progress, please retry shortly",
+        headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+    )
+
+
 @router.post("/register", response_model=UserResponse)
-def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: DbSession = Depends(get_db)):
     """Register a new user."""
     # Check if user already exists
-    db_user = AuthService.get_user_by_email(db, email=user.email)
+    db_user = await run_db(db, AuthService.get_user_by_email, email=user.email)
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -20,16 +29,22 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Create new user
-    db_user = AuthService.create_user(db=db, user=user)
+    try:
+        db_user = await AuthService.create_user_async(db=db, user=user)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
     return db_user
 
 
 @router.post("/login", response_model=Token)
-def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(user_credentials: UserLogin, db: DbSession = Depends(get_db)):
     """Login user and return access token."""
-    user = AuthService.authenticate_user(
-        db, email=user_credentials.email, password=user_credentials.password
-    )
+    try:
+        user = await AuthService.authenticate_user_async(
+            db, email=user_credentials.email, password=user_credentials.password
+        )
+    except PasswordHasherBusy:
+        raise _hasher_busy()
     
     if not user:
         raise HTTPException(
@@ -51,6 +66,6 @@ def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
 from app.api.dependencies import get_current_active_user
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(current_user: User = Depends(get_current_active_user)):
+async def get_current_user_info(current_user: User = Depends(get_current_active_user)):
     """Get current user information."""
     return current_user 
\ No newline at end of file
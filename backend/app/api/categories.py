@@ -1,58 +1,79 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from typing import List
-from app.core.database import get_db
+from app.core.database import get_db, run_db, DbSession
 from app.schemas.category import CategoryCreate, CategoryResponse
 from app.models.category import Category
 from app.models.user import User
+from app.services.category_registry import category_registry
+from app.services.data_versions import CATEGORIES_SCOPE, DataVersions
+from app.api.conditional import conditional_get
 from app.api.dependencies import get_current_active_user
 
 router = APIRouter(prefix="/categories", tags=["Categories"])
 
 
 @router.get("/", response_model=List[CategoryResponse])
-def get_categories(
-    db: Session = Depends(get_db),
+async def get_categories(
+    request: Request,
+    response: Response,
+    db: DbSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get all expense categories."""
-    categories = db.query(Category).all()
-    return categories
+    not_modified = await conditional_get(request, response, db, "categories", [CATEGORIES_SCOPE])
+    if not_modified:
+        return not_modified
+    # At least as fresh as the version in the ETag; no query unless it moved
+    version = request.state.data_versions[CATEGORIES_SCOPE]
+    categories = await run_db(db, category_registry.all, version)
+    return [category._asdict() for category in categories]
 
 
 @router.post("/", response_model=CategoryResponse)
-def create_category(
+async def create_category(
     category: CategoryCreate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Create a new expense category."""
-    # Check if category already exists
-    existing_category = db.query(Category).filter(Category.name == category.name).first()
-    if existing_category:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Category already exists"
+    already_exists = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Category already exists"
+    )
+    
+    def create(db: Session) -> Category:
+        # Check if category already exists (the unique index catches ones the registry hasn't seen yet)
+        if category_registry.find(db, category.name):
+            raise already_exists
+        
+        db_category = Category(
+            name=category.name,
+            description=category.description
         )
+        db.add(db_category)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise already_exists
+        DataVersions.bump(db, [CATEGORIES_SCOPE])
+        category_registry.invalidate()
+        db.refresh(db_category)
+        return db_category
     
-    db_category = Category(
-        name=category.name,
-        description=category.description
-    )
-    db.add(db_category)
-    db.commit()
-    db.refresh(db_category)
-    return db_category
+    return await run_db(db, create)
 
 
 @router.get("/{category_id}", response_model=CategoryResponse)
-def get_category(
+async def get_category(
     category_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get a specific category."""
-    category = db.query(Category).filter(Category.id == category_id).first()
+    category = await run_db(db, category_registry.get, category_id)
     
     if not category:
         raise HTTPException(
@@ -60,4 +81,4 @@ def get_category(
             detail="Category not found"
         )
     
-    return category 
\ No newline at end of file
+    return category._asdict()
@@ -0,0 +1,68 @@
+import hashlib
+from typing import Any, Dict, Optional, Sequence
+from fastapi import Request, Response, status
+from app.core.database import run_db, DbSession
+from app.core.metrics import Counter
+from app.services.data_versions import DataVersions
+
+CONDITIONAL_GETS = Counter(
+    "http_conditional_get_total", "ETag-enabled GETs by outcome (not_modified, modified, unconditional)",
+    ["endpoint", "outcome"],
+)
+
+# Clients may store responses but must revalidate them on every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag over the given parts."""
+    return '"' + hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """RFC 9110 If-None-Match check (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return etag in (candidate[2:] if candidate.startswith("W/") else candidate for candidate in candidates)
+
+
+async def conditional_get(
+    request: Request, response: Response, db: DbSession, endpoint: str, scopes: Sequence[str], *key: Any
+) -> Optional[Response]:
+    """Answer 304 if the client's copy is current, before any real work is done.
+
+    The ETag covers the endpoint, ``key`` (e.g. the user id) and the current
+    version of each data scope the response reads. Returns the 304 response
+    to send, or None after setting the ETag on ``response``. The versions
+    and the ETag are left in ``request.state.data_versions`` and
+    ``request.state.etag`` for the handler.
+    """
+    versions = await run_db(db, DataVersions.get, scopes)
+    request.state.data_versions = versions
+    etag = request.state.etag = make_etag(endpoint, *key, *(f"{scope}={versions[scope]}" for scope in scopes))
+    if_none_match = request.headers.get("if-none-match")
+    if etag_matches(if_none_match, etag):
+        CONDITIONAL_GETS.inc(endpoint=endpoint, outcome="not_modified")
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+        )
+    CONDITIONAL_GETS.inc(endpoint=endpoint, outcome="modified" if if_none_match else "unconditional")
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return None
+
+
+def conditional_get_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-endpoint outcome counts and the share of requests answered with 304."""
+    stats: Dict[str, Dict[str, Any]] = {}
+    for labels, value in CONDITIONAL_GETS.samples():
+        counts = stats.setdefault(labels["endpoint"], {"not_modified": 0, "modified": 0, "unconditional": 0})
+        counts[labels["outcome"]] += int(value)
+    for counts in stats.values():
+        total = counts["not_modified"] + counts["modified"] + counts["unconditional"]
+        counts["not_modified_ratio"] = round(counts["not_modified"] / total, 4) if total else 0.0
+    return stats
@@ -1,20 +1,20 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_db, run_db, DbSession
 from app.core.security import verify_token
 from app.services.auth_service import AuthService
+from app.services.principal_cache import principal_cache
 from app.models.user import User, UserRole
 from typing import Optional
 
 security = HTTPBearer()
 
 
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ) -> User:
-    """Get current authenticated user."""
+    """Get current authenticated user, from the principal cache when possible."""
     token = credentials.credentials
     payload = verify_token(token)
     
@@ -33,7 +33,12 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = AuthService.get_user_by_id(db, user_id)
+    token_version = payload.get("ver", 0)
+    user = principal_cache.get(user_id, token_version)
+    if user is not None:
+        return user
+    
+    user = await run_db(db, AuthService.get_user_by_id, user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -41,10 +46,18 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    if user.token_version != token_version:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    principal_cache.set(user)
     return user
 
 
-def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     """Get current active user."""
     if not current_user.is_active:
         raise HTTPException(
@@ -54,11 +67,11 @@ def get_current_active_user(current_user: User = Depends(get_current_user)) -> U
     return current_user
 
 
-def get_current_manager(current_user: User = Depends(get_current_active_user)) -> User:
+async def get_current_manager(current_user: User = Depends(get_current_active_user)) -> User:
     """Get current user if they are a manager."""
     if current_user.role != UserRole.MANAGER:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
-    return current_user 
\ No newline at end of file
+    return current_user
\ No newline at end of file
@@ -1,76 +1,186 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List
-from app.core.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response, UploadFile, File
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Tuple
+import io
+from datetime import datetime
+from app.core.database import get_db, run_db, DbSession
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.responses import FastJSONResponse
 from app.services.expense_service import ExpenseService
-from app.schemas.expense import ExpenseCreate, ExpenseResponse, ExpenseUpdate
+from app.services.expense_import_service import ExpenseImportService, FORMATS
+from app.services.expense_export_service import ExpenseExportService, MEDIA_TYPES
+from app.services.category_registry import category_registry
+from app.schemas.expense import (
+    ExpenseCreate, ExpenseResponse, ExpenseUpdate, ExpenseImportResult, BulkStatusUpdate, BulkStatusResult
+)
 from app.models.expense import ExpenseStatus
 from app.models.user import User, UserRole
 from app.api.dependencies import get_current_active_user, get_current_manager
 
 router = APIRouter(prefix="/expenses", tags=["Expenses"])
 
+SKIP_QUERY = Query(0, ge=0, deprecated=True, description="Offset paging (deprecated, use cursor)")
+CURSOR_QUERY = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page")
+
+
+def _decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    """Decode the cursor query parameter, rejecting malformed values."""
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def _list_response(expenses: list, limit: int, skip: int) -> FastJSONResponse:
+    """Render list dicts directly (no per-row model validation) with paging headers."""
+    response = FastJSONResponse(expenses)
+    _set_page_headers(response, expenses, limit, skip)
+    return response
+
+
+def _set_page_headers(response: Response, expenses: list, limit: int, skip: int) -> None:
+    """Advertise the next page cursor and flag deprecated offset paging."""
+    if len(expenses) == limit:
+        last = expenses[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last["date"], last["id"])
+    if skip:
+        response.headers["Deprecation"] = "true"
+
 
 @router.post("/", response_model=ExpenseResponse)
-def create_expense(
+async def create_expense(
     expense: ExpenseCreate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
     """Create a new expense."""
-    db_expense = ExpenseService.create_expense(db=db, expense=expense, user_id=current_user.id)
+    def create(db):
+        db_expense = ExpenseService.create_expense(db=db, expense=expense, user_id=current_user.id)
+        
+        # Add category and user names for response
+        db_expense.category_name = category_registry.get(db, db_expense.category_id).name
+        db_expense.user_name = current_user.full_name
+        return db_expense
     
-    # Add category and user names for response
-    db_expense.category_name = db_expense.category.name
-    db_expense.user_name = current_user.full_name
-    
-    return db_expense
+    return await run_db(db, create)
+
+
+def _import_format(file: UploadFile, format: Optional[str]) -> str:
+    """The upload's format: the format parameter, else the file extension or content type."""
+    if format:
+        return format
+    name, content_type = (file.filename or "").lower(), file.content_type or ""
+    if name.endswith(".csv") or content_type == "text/csv":
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or content_type in ("application/x-ndjson", "application/jsonl"):
+        return "ndjson"
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Cannot tell the file format; pass format={' or '.join(FORMATS)}"
+    )
+
+
+@router.post("/import", response_model=ExpenseImportResult)
+async def import_expenses(
+    file: UploadFile = File(..., description="CSV with a header row, or NDJSON (one expense object per line)"),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    current_user: User = Depends(get_current_active_user),
+    db: DbSession = Depends(get_db)
+):
+    """Bulk-import expenses; invalid rows are reported and skipped.
+
+    Managers may set ``user_id`` and ``status`` per row; everyone else
+    imports pending expenses of their own.
+    """
+    fmt = _import_format(file, format)
+    # The upload is spooled to a temporary file and parsed from it in chunks; invalid
+    # UTF-8 is kept undecoded so the import stops at (and reports) the exact line
+    text = io.TextIOWrapper(file.file, encoding="utf-8-sig", errors="surrogateescape", newline="")
+    return await run_db(
+        db, ExpenseImportService.import_file, text, fmt,
+        owner_id=current_user.id, any_user=current_user.role == UserRole.MANAGER
+    )
 
 
 @router.get("/user", response_model=List[ExpenseResponse])
-def get_user_expenses(
-    skip: int = Query(0, ge=0),
+async def get_user_expenses(
+    skip: int = SKIP_QUERY,
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = CURSOR_QUERY,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
-    """Get expenses for the current user."""
-    expenses = ExpenseService.get_user_expenses(db=db, user_id=current_user.id, skip=skip, limit=limit)
-    
-    # Add category and user names for response
-    for expense in expenses:
-        expense.category_name = expense.category.name
-        expense.user_name = current_user.full_name
-    
-    return expenses
+    """Get expenses for the current user, newest first."""
+    expenses = await run_db(
+        db, ExpenseService.get_user_expenses, user_id=current_user.id, skip=skip, limit=limit, after=_decode_cursor(cursor)
+    )
+    return _list_response(expenses, limit, skip)
 
 
 @router.get("/", response_model=List[ExpenseResponse])
-def get_all_expenses(
-    skip: int = Query(0, ge=0),
+async def get_all_expenses(
+    skip: int = SKIP_QUERY,
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = CURSOR_QUERY,
     current_user: User = Depends(get_current_manager),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
-    """Get all expenses (managers only)."""
-    expenses = ExpenseService.get_all_expenses(db=db, skip=skip, limit=limit)
-    
-    # Add category and user names for response
-    for expense in expenses:
-        expense.category_name = expense.category.name
-        expense.user_name = expense.user.full_name
-    
-    return expenses
+    """Get all expenses, newest first (managers only)."""
+    expenses = await run_db(
+        db, ExpenseService.get_all_expenses, skip=skip, limit=limit, after=_decode_cursor(cursor)
+    )
+    return _list_response(expenses, limit, skip)
+
+
+@router.get("/export")
+async def export_expenses(
+    format: str = Query("csv", pattern="^(csv|ndjson|parquet)$"),
+    date_from: Optional[datetime] = Query(None, description="Expense date, inclusive"),
+    date_to: Optional[datetime] = Query(None, description="Expense date, inclusive"),
+    status_filter: Optional[ExpenseStatus] = Query(None, alias="status"),
+    user_id: Optional[int] = Query(None, description="Managers only; others always export their own expenses"),
+    category_id: Optional[int] = None,
+    current_user: User = Depends(get_current_active_user),
+    db: DbSession = Depends(get_db)
+):
+    """Stream every matching expense as CSV, NDJSON or Parquet, oldest first."""
+    if current_user.role != UserRole.MANAGER:
+        if user_id not in (None, current_user.id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions"
+            )
+        user_id = current_user.id
+    try:
+        encode = ExpenseExportService.encoder(format)
+    except ImportError as e:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=str(e)
+        )
+    query = ExpenseExportService.export_query(
+        user_id=user_id, status=status_filter, category_id=category_id, date_from=date_from, date_to=date_to
+    )
+    return StreamingResponse(
+        ExpenseExportService.stream(db, query, encode),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="expenses.{format}"'},
+    )
 
 
 @router.get("/{expense_id}", response_model=ExpenseResponse)
-def get_expense(
+async def get_expense(
     expense_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
     """Get a specific expense."""
-    expense = ExpenseService.get_expense_by_id(db=db, expense_id=expense_id)
+    expense = await run_db(db, ExpenseService.get_expense_by_id, expense_id=expense_id)
     
     if not expense:
         raise HTTPException(
@@ -85,22 +195,18 @@ def get_expense(
             detail="Not enough permissions"
         )
     
-    # Add category and user names for response
-    expense.category_name = expense.category.name
-    expense.user_name = expense.user.full_name
-    
     return expense
 
 
 @router.put("/{expense_id}/approve")
-def approve_expense(
+async def approve_expense(
     expense_id: int,
     current_user: User = Depends(get_current_manager),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
     """Approve an expense (managers only)."""
-    expense = ExpenseService.update_expense_status(
-        db=db, expense_id=expense_id, status=ExpenseStatus.APPROVED, manager_id=current_user.id
+    expense = await run_db(
+        db, ExpenseService.update_expense_status, expense_id=expense_id, status=ExpenseStatus.APPROVED, manager_id=current_user.id
     )
     
     if not expense:
@@ -113,14 +219,14 @@ def approve_expense(
 
 
 @router.put("/{expense_id}/reject")
-def reject_expense(
+async def reject_expense(
     expense_id: int,
     current_user: User = Depends(get_current_manager),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
     """Reject an expense (managers only)."""
-    expense = ExpenseService.update_expense_status(
-        db=db, expense_id=expense_id, status=ExpenseStatus.REJECTED, manager_id=current_user.id
+    expense = await run_db(
+        db, ExpenseService.update_expense_status, expense_id=expense_id, status=ExpenseStatus.REJECTED, manager_id=current_user.id
     )
     
     if not expense:
@@ -132,20 +238,29 @@ def reject_expense(
     return {"message": "Expense rejected successfully"}
 
 
+@router.post("/bulk-status", response_model=BulkStatusResult)
+async def bulk_update_status(
+    request: BulkStatusUpdate,
+    current_user: User = Depends(get_current_manager),
+    db: DbSession = Depends(get_db)
+):
+    """Approve or reject many expenses at once, by ids or by filter (managers only)."""
+    return await run_db(
+        db, ExpenseService.bulk_update_status, status=request.status, ids=request.ids, filters=request.filter
+    )
+
+
 @router.get("/status/{status}", response_model=List[ExpenseResponse])
-def get_expenses_by_status(
+async def get_expenses_by_status(
     status: ExpenseStatus,
-    skip: int = Query(0, ge=0),
+    skip: int = SKIP_QUERY,
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = CURSOR_QUERY,
     current_user: User = Depends(get_current_manager),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
-    """Get expenses by status (managers only)."""
-    expenses = ExpenseService.get_expenses_by_status(db=db, status=status, skip=skip, limit=limit)
-    
-    # Add category and user names for response
-    for expense in expenses:
-        expense.category_name = expense.category.name
-        expense.user_name = expense.user.full_name
-    
-    return expenses 
\ No newline at end of file
+    """Get expenses by status, newest first (managers only)."""
+    expenses = await run_db(
+        db, ExpenseService.get_expenses_by_status, status=status, skip=skip, limit=limit, after=_decode_cursor(cursor)
+    )
+    return _list_response(expenses, limit, skip) 
\ No newline at end of file
@@ -0,0 +1,144 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class CacheStats:
+    """Hit/miss/eviction counters for a cache backend."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class MemoryCache:
+    """In-process LRU cache with a per-entry TTL.
+
+    Counters (see ``incr``) share the bounded LRU store but never expire. An
+    evicted counter reads as 0 again; callers only use counters as versions
+    embedded in cache keys, so that at worst misses entries, and a counter is
+    touched on every read so it outlives the entries keyed by it.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 60):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None on a miss or expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._store(key, time.monotonic() + ttl, value)
+
+    def _store(self, key: str, expires_at: float, value: Any) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def counter(self, key: str) -> int:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return 0
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            entry = self._entries.get(key)
+            value = (entry[1] if entry else 0) + 1
+            self._store(key, float("inf"), value)
+            return value
+
+    def stats_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats.as_dict(), "backend": "memory",
+                    "entries": len(self._entries), "max_entries": self.max_entries}
+
+
+class RedisCache:
+    """Redis-backed cache with the same interface as MemoryCache.
+
+    Values are stored as JSON. Eviction is left to Redis (maxmemory policy);
+    its evicted_keys counter is reported alongside the local hit/miss counts.
+    """
+
+    def __init__(self, url: str, ttl_seconds: float = 60, prefix: str = "expense-manager:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError("The redis cache backend requires the 'redis' package: pip install redis") from e
+        self.client = redis.Redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self.stats = CacheStats()
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.client.set(self.prefix + key, json.dumps(value), px=int(ttl * 1000))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def counter(self, key: str) -> int:
+        return int(self.client.get(self.prefix + key) or 0)
+
+    def incr(self, key: str) -> int:
+        return self.client.incr(self.prefix + key)
+
+    def stats_dict(self) -> Dict[str, Any]:
+        self.stats.evictions = self.client.info("stats").get("evicted_keys", 0)
+        return {**self.stats.as_dict(), "backend": "redis"}
+
+
+def create_cache(backend: str, max_entries: int, ttl_seconds: float, redis_url: str = ""):
+    """Build the cache backend named in settings ("memory" or "redis")."""
+    if backend == "redis":
+        return RedisCache(redis_url, ttl_seconds=ttl_seconds)
+    if backend == "memory":
+        return MemoryCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+    raise ValueError(f"Unknown cache backend: {backend}")
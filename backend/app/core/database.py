@@ -1,22 +1,82 @@
+from typing import Any, Callable, Union
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
+from app.core.db_pool import InstrumentedQueuePool, instrument_engine, pool_options
+from app.core.request_metrics import track_statements
 
 # Create database engine
-engine = create_engine(settings.DATABASE_URL)
+engine = create_engine(settings.DATABASE_URL, poolclass=InstrumentedQueuePool, **pool_options("sync", settings))
+instrument_engine(engine, "sync")
+if settings.METRICS_ENABLED or settings.SLOW_QUERY_MS > 0:
+    track_statements(engine)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine/session (only when ASYNC_DB is enabled; needs an async driver such as asyncpg)
+async_engine = None
+AsyncSessionLocal = None
+if settings.ASYNC_DB:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    from app.core.db_pool import InstrumentedAsyncQueuePool
+
+    async_engine = create_async_engine(
+        settings.async_database_url, poolclass=InstrumentedAsyncQueuePool, **pool_options("async", settings)
+    )
+    instrument_engine(async_engine.sync_engine, "async")
+    if settings.METRICS_ENABLED or settings.SLOW_QUERY_MS > 0:
+        track_statements(async_engine.sync_engine)
+    # expire_on_commit=False: attributes stay loaded after commit, so response
+    # serialization never triggers IO outside of run_db.
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Create Base class
 Base = declarative_base()
 
+DbSession = Union[Session, AsyncSession]
+
 
-def get_db():
-    """Dependency to get database session."""
+async def get_db():
+    """Dependency to get database session.
+
+    Yields an AsyncSession when ASYNC_DB is enabled, otherwise a regular
+    Session. Either way, run service calls through ``run_db``.
+    """
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        await run_in_threadpool(db.close)
+
+
+async def run_db(db: DbSession, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run sync ORM code ``fn(session, *args, **kwargs)`` without blocking the event loop.
+
+    On an AsyncSession this uses ``run_sync`` (greenlet-based, no thread); on
+    a sync Session the call is moved to the threadpool.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(lambda session: fn(session, *args, **kwargs))
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+def _release(session: Session) -> None:
+    session.expunge_all()
+    session.rollback()
+
+
+async def release_connection(db: DbSession) -> None:
+    """Return the session's connection to the pool before a long non-DB wait.
+
+    Loaded objects are detached first so they stay readable (without further
+    lazy loads) after the transaction ends. Use before awaiting the LLM.
+    """
+    await run_db(db, _release)
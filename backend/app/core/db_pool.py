@@ -0,0 +1,97 @@
+import logging
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.core.metrics import Counter, Gauge, Histogram
+
+logger = logging.getLogger(__name__)
+
+CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection", ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+CHECKOUT_TIMEOUTS = Counter("db_pool_checkout_timeouts_total", "Checkouts that hit pool_timeout", ["pool"])
+IN_USE = Gauge("db_pool_connections_in_use", "Connections currently checked out", ["pool"])
+OVERFLOW = Gauge("db_pool_overflow", "Connections open beyond pool_size (negative while the pool fills)", ["pool"])
+SIZE = Gauge("db_pool_size", "Configured pool_size", ["pool"])
+CONNECTS = Counter("db_pool_connects_total", "New DBAPI connections opened", ["pool"])
+
+# Most recent checkout timeouts, newest last.
+recent_timeouts: "deque[Dict[str, Any]]" = deque(maxlen=100)
+
+
+class _CheckoutTimingMixin:
+    """Times every checkout (including the wait for a free slot) and records timeouts.
+
+    The pool's name comes from ``pool_logging_name`` so it survives
+    ``Pool.recreate()`` on ``engine.dispose()``.
+    """
+
+    def _do_get(self):
+        name = self._orig_logging_name or "default"
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            waited = time.perf_counter() - start
+            CHECKOUT_TIMEOUTS.inc(pool=name)
+            recent_timeouts.append({
+                "pool": name,
+                "at": datetime.now(timezone.utc).isoformat(),
+                "waited_seconds": round(waited, 3),
+                "status": self.status(),
+            })
+            logger.warning("DB pool %r checkout timed out after %.2fs (%s)", name, waited, self.status())
+            raise
+        finally:
+            CHECKOUT_WAIT.observe(time.perf_counter() - start, pool=name)
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_options(name: str, settings) -> Dict[str, Any]:
+    """create_engine / create_async_engine keyword arguments for a pool named ``name``."""
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_logging_name": name,
+    }
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """Attach pool event listeners and gauges to a sync engine (or an async engine's ``sync_engine``)."""
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        CONNECTS.inc(pool=name)
+
+    # Gauges read the live pool, which may be replaced by engine.dispose().
+    IN_USE.set_function(lambda: _pool_stat(engine, "checkedout"), pool=name)
+    OVERFLOW.set_function(lambda: _pool_stat(engine, "overflow"), pool=name)
+    SIZE.set_function(lambda: _pool_stat(engine, "size"), pool=name)
+
+
+def _pool_stat(engine: Engine, attr: str) -> int:
+    method = getattr(engine.pool, attr, None)
+    return method() if method else 0
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Snapshot of every pool metric plus the recent checkout timeouts."""
+    metrics = (CHECKOUT_WAIT, CHECKOUT_TIMEOUTS, IN_USE, OVERFLOW, SIZE, CONNECTS)
+    result: Dict[str, Any] = {metric.name: metric.snapshot() for metric in metrics}
+    result["recent_timeouts"] = list(recent_timeouts)
+    return result
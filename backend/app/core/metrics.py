@@ -0,0 +1,220 @@
+import bisect
+import math
+import threading
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+# Latency buckets in seconds (upper bounds); +Inf is implicit.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class MetricsRegistry:
+    """Process-wide collection of metrics, in registration order."""
+
+    def __init__(self):
+        self.metrics: List["Metric"] = []
+
+    def register(self, metric: "Metric") -> None:
+        self.metrics.append(metric)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {metric.name: metric.snapshot() for metric in self.metrics}
+
+    def render_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.description)}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.exposition())
+        return "\n".join(lines) + "\n"
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = (
+        f'{name}="' + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for name, value in labels.items()
+    )
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, bool):
+        value = int(value)
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+REGISTRY = MetricsRegistry()
+
+
+class Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = (), registry: MetricsRegistry = REGISTRY):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def labels(self, **labels) -> "BoundMetric":
+        """This metric with fixed label values; keep it on hot paths to skip the label lookup."""
+        return BoundMetric(self, self._key(labels))
+
+    def samples(self) -> List[Tuple[Dict[str, str], Any]]:
+        """(labels, value) pairs for every label combination seen so far."""
+        with self._lock:
+            items = list(self._values.items())
+        return [(dict(zip(self.labelnames, key)), value) for key, value in items]
+
+    def snapshot(self) -> Any:
+        samples = self.samples()
+        if not self.labelnames:
+            return samples[0][1] if samples else 0
+        return [{**labels, "value": value} for labels, value in samples]
+
+    def exposition(self) -> List[str]:
+        """Sample lines in the Prometheus text format."""
+        return [f"{self.name}{_format_labels(labels)} {_format_value(value)}" for labels, value in self.samples()]
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        self._inc(self._key(labels), amount)
+
+    def _inc(self, key: Tuple[str, ...], amount: float) -> None:
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """A value that goes up and down; may be backed by a callback read on demand."""
+    type = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._functions: Dict[Tuple[str, ...], Callable[[], float]] = {}
+
+    def set(self, value: float, **labels) -> None:
+        self._set(self._key(labels), value)
+
+    def _set(self, key: Tuple[str, ...], value: float) -> None:
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        self._inc(self._key(labels), amount)
+
+    def _inc(self, key: Tuple[str, ...], amount: float) -> None:
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], float], **labels) -> None:
+        with self._lock:
+            self._functions[self._key(labels)] = function
+
+    def samples(self) -> List[Tuple[Dict[str, str], Any]]:
+        with self._lock:
+            functions = list(self._functions.items())
+        computed = [(dict(zip(self.labelnames, key)), function()) for key, function in functions]
+        return super().samples() + computed
+
+
+class Histogram(Metric):
+    """Cumulative-bucket histogram (Prometheus semantics).
+
+    Observations are counted in the single bucket they fall into (the last
+    slot is the implicit +Inf bucket); ``samples`` returns cumulative counts.
+    """
+    type = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        self._observe(self._key(labels), value)
+
+    def _observe(self, key: Tuple[str, ...], value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"buckets": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+            state["buckets"][index] += 1
+            state["sum"] += value
+            state["count"] += 1
+
+    def samples(self) -> List[Tuple[Dict[str, str], Any]]:
+        with self._lock:
+            items = [(key, list(state["buckets"]), state["sum"], state["count"]) for key, state in self._values.items()]
+        result = []
+        for key, counts, total, count in items:
+            cumulative, running = [], 0
+            for bucket_count in counts[:-1]:
+                running += bucket_count
+                cumulative.append(running)
+            result.append((dict(zip(self.labelnames, key)), {"buckets": cumulative, "sum": total, "count": count}))
+        return result
+
+    def snapshot(self) -> Any:
+        result = []
+        for labels, state in self.samples():
+            result.append({
+                **labels,
+                "count": state["count"],
+                "sum": round(state["sum"], 6),
+                "buckets": {str(bound): count for bound, count in zip(self.buckets, state["buckets"])},
+            })
+        return result
+
+    def exposition(self) -> List[str]:
+        lines = []
+        for labels, state in self.samples():
+            for bound, count in zip(self.buckets, state["buckets"]):
+                lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': _format_value(float(bound))})} {count}")
+            lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': '+Inf'})} {state['count']}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(float(state['sum']))}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {state['count']}")
+        return lines
+
+
+class BoundMetric:
+    """A metric with its label values resolved once (see ``Metric.labels``)."""
+    __slots__ = ("metric", "key")
+
+    def __init__(self, metric: Metric, key: Tuple[str, ...]):
+        self.metric = metric
+        self.key = key
+
+    def inc(self, amount: float = 1) -> None:
+        self.metric._inc(self.key, amount)
+
+    def dec(self, amount: float = 1) -> None:
+        self.metric._inc(self.key, -amount)
+
+    def set(self, value: float) -> None:
+        self.metric._set(self.key, value)
+
+    def observe(self, value: float) -> None:
+        self.metric._observe(self.key, value)
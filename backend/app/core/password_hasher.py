@@ -0,0 +1,67 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import Counter, Gauge
+from app.core.security import pwd_context
+
+REJECTIONS = Counter("password_hash_rejections_total", "Hash/verify calls rejected because the pool was full")
+IN_FLIGHT = Gauge("password_hash_in_flight", "Hash/verify calls running or queued")
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when every hashing worker is busy and the queue is full."""
+
+
+class PasswordHasher:
+    """Runs bcrypt on a dedicated, size-limited thread pool.
+
+    bcrypt releases the GIL, so the workers hash in parallel without taking
+    slots from the request threadpool. At most ``workers + queue_size`` calls
+    are admitted at once; further calls fail fast with PasswordHasherBusy
+    instead of piling up behind a login storm.
+    """
+
+    def __init__(self, workers: int, queue_size: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        IN_FLIGHT.set_function(lambda: self._in_flight)
+
+    def _acquire(self) -> bool:
+        with self._lock:
+            if self._in_flight >= self.workers + self.queue_size:
+                return False
+            self._in_flight += 1
+            return True
+
+    def _release(self, _future=None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    async def _run(self, fn: Callable[..., Any], *args) -> Any:
+        if not self._acquire():
+            REJECTIONS.inc()
+            raise PasswordHasherBusy()
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    async def hash(self, password: str) -> str:
+        """Hash a password at the configured cost."""
+        return await self._run(pwd_context.hash, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verify a password; also return a rehash when the stored cost differs from the configured one."""
+        return await self._run(pwd_context.verify_and_update, password, hashed_password)
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE_SIZE)
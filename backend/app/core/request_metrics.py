@@ -0,0 +1,163 @@
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.metrics import BoundMetric, Counter, Gauge, Histogram
+from app.core.slow_queries import slow_query_log
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Request latency by route template, until the response body is sent",
+    ["method", "route"],
+)
+REQUESTS = Counter("http_requests_total", "Requests by route template and status code", ["method", "route", "status"])
+IN_FLIGHT = Gauge("http_requests_in_flight", "Requests currently being served")
+REQUEST_SQL_STATEMENTS = Histogram(
+    "http_request_db_statements", "SQL statements executed per request", ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 1000),
+)
+REQUEST_SQL_SECONDS = Histogram(
+    "http_request_db_seconds", "Total time spent executing SQL per request", ["method", "route"],
+)
+
+# Label used for requests that matched no route, so unknown paths cannot add label values
+UNMATCHED_ROUTE = "unmatched"
+KNOWN_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+
+class _RequestStats:
+    """SQL usage of the request being served, and its scope for the route template."""
+    __slots__ = ("scope", "statements", "sql_seconds")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.statements = 0
+        self.sql_seconds = 0.0
+
+
+# anyio copies the context into threadpool workers (and run_sync stays in the
+# task), so statements run through run_db are attributed to the request too.
+_request: ContextVar[Optional[_RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def _route_template(scope) -> str:
+    return getattr(scope.get("route"), "path_format", None) or UNMATCHED_ROUTE
+
+
+class RequestMetricsMiddleware:
+    """Pure ASGI middleware recording latency, status and SQL usage per route template.
+
+    The route template (e.g. ``/api/v1/expenses/{expense_id}``) is read from
+    the ``route`` FastAPI puts in the scope once routing has matched, so
+    path parameters never become label values. Bound metrics are cached per
+    (method, route, status) to keep the per-request cost to a few dict and
+    lock operations.
+    """
+    # Only touched on the event loop thread
+    in_flight = 0
+
+    def __init__(self, app):
+        self.app = app
+        self._bound: Dict[Tuple[str, str, int], Tuple[BoundMetric, ...]] = {}
+
+    def _metrics_for(self, method: str, route: str, status_code: int) -> Tuple[BoundMetric, ...]:
+        labels = {"method": method, "route": route}
+        bound = self._bound[(method, route, status_code)] = (
+            REQUEST_LATENCY.labels(**labels),
+            REQUESTS.labels(**labels, status=status_code),
+            REQUEST_SQL_STATEMENTS.labels(**labels),
+            REQUEST_SQL_SECONDS.labels(**labels),
+        )
+        return bound
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        stats = _RequestStats(scope)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        token = _request.set(stats)
+        RequestMetricsMiddleware.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            RequestMetricsMiddleware.in_flight -= 1
+            _request.reset(token)
+            route = _route_template(scope)
+            method = scope["method"] if scope["method"] in KNOWN_METHODS else "OTHER"
+            bound = self._bound.get((method, route, status_code)) or self._metrics_for(method, route, status_code)
+            latency, requests, statements, sql_seconds = bound
+            latency.observe(elapsed)
+            requests.inc()
+            statements.observe(stats.statements)
+            sql_seconds.observe(stats.sql_seconds)
+
+
+IN_FLIGHT.set_function(lambda: RequestMetricsMiddleware.in_flight)
+
+
+def _record(statement, parameters, context, seconds: float, succeeded: bool, executemany: bool = False) -> None:
+    request = _request.get()
+    if request is not None:
+        request.statements += 1
+        request.sql_seconds += seconds
+    if seconds >= slow_query_log.threshold_seconds:
+        route = _route_template(request.scope) if request is not None else None
+        slow_query_log.record(statement, parameters, context, seconds, route, succeeded, executemany)
+
+
+def _do_execute(cursor, statement, parameters, context) -> bool:
+    start, succeeded = time.perf_counter(), False
+    try:
+        context.dialect.do_execute(cursor, statement, parameters, context)
+        succeeded = True
+    finally:
+        _record(statement, parameters, context, time.perf_counter() - start, succeeded)
+    return True
+
+
+def _do_executemany(cursor, statement, parameters, context) -> bool:
+    start, succeeded = time.perf_counter(), False
+    try:
+        context.dialect.do_executemany(cursor, statement, parameters, context)
+        succeeded = True
+    finally:
+        _record(statement, parameters, context, time.perf_counter() - start, succeeded, executemany=True)
+    return True
+
+
+def _do_execute_no_params(cursor, statement, context) -> bool:
+    start, succeeded = time.perf_counter(), False
+    try:
+        context.dialect.do_execute_no_params(cursor, statement, context)
+        succeeded = True
+    finally:
+        _record(statement, None, context, time.perf_counter() - start, succeeded)
+    return True
+
+
+def track_statements(engine: Engine) -> None:
+    """Time statements run on a sync engine (or an async engine's ``sync_engine``).
+
+    Each statement is attributed to the current request and handed to the
+    slow query log when it exceeds ``SLOW_QUERY_MS``.
+
+    These are the dialect-level ``do_execute*`` hooks, which run the DBAPI
+    call themselves (returning True tells SQLAlchemy it was handled). Unlike
+    ``before/after_cursor_execute`` they do not switch every Connection onto
+    its slower event-dispatching path, which costs ~5x as much per statement.
+    """
+    event.listen(engine, "do_execute", _do_execute)
+    event.listen(engine, "do_executemany", _do_executemany)
+    event.listen(engine, "do_execute_no_params", _do_execute_no_params)
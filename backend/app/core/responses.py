@@ -0,0 +1,14 @@
+from typing import Any
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+class FastJSONResponse(ORJSONResponse):
+    """orjson-rendered JSON, formatted like FastAPI's pydantic output (UTC datetimes end in "Z").
+
+    Return it with plain dicts/rows to skip response-model validation on
+    large list responses.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,154 @@
+import json
+import logging
+import random
+import re
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERIES = Counter("db_slow_queries_total", "Statements slower than SLOW_QUERY_MS by route template", ["route"])
+EXPLAINS = Counter("db_slow_query_explains_total", "EXPLAIN ANALYZE captures of slow queries by outcome", ["outcome"])
+
+EXPLAIN_SAVEPOINT = "slow_query_explain"
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+# Placeholders of every DBAPI paramstyle in use (literals are already "?" by then)
+_PLACEHOLDER = r"(?:%\(\w+\)s|%s|\?|\$\d+|:\w+)"
+_IN_LIST = re.compile(rf"\bIN \(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)", re.IGNORECASE)
+
+
+def normalize_sql(statement: str) -> str:
+    """Statement on one line with inline literals and expanded IN lists collapsed."""
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+    return _IN_LIST.sub("IN (...)", statement)
+
+
+# Longer parameter lists (e.g. batched multi-row INSERTs) are cut to this many entries
+MAX_REDACTED_PARAMETERS = 20
+
+
+def _redact_value(value: Any) -> str:
+    return "NULL" if value is None else f"<{type(value).__name__}>"
+
+
+def redact_parameters(parameters: Any, executemany: bool = False) -> Any:
+    """Parameter names and types only; values never leave the process."""
+    if executemany:
+        parameters = list(parameters or ())
+        first = redact_parameters(parameters[0]) if parameters else None
+        return {"sets": len(parameters), "first": first}
+    if isinstance(parameters, dict):
+        items = list(parameters.items())
+        redacted: Any = {name: _redact_value(value) for name, value in items[:MAX_REDACTED_PARAMETERS]}
+    elif isinstance(parameters, (list, tuple)):
+        items = list(parameters)
+        redacted = [_redact_value(value) for value in items[:MAX_REDACTED_PARAMETERS]]
+    else:
+        return None
+    if len(items) > MAX_REDACTED_PARAMETERS:
+        return {"count": len(items), "first": redacted}
+    return redacted
+
+
+def _is_read(statement: str) -> bool:
+    words = statement.split(None, 1)
+    return bool(words) and words[0].upper() in ("SELECT", "WITH")
+
+
+class SlowQueryLog:
+    """Logs statements slower than a threshold and keeps the latest in a ring buffer.
+
+    Each slow statement is logged with its normalized SQL, redacted
+    parameters, duration and the route of the request that ran it. A
+    ``explain_sample_rate`` share of the slow reads on PostgreSQL is re-run
+    right away under ``EXPLAIN (ANALYZE, BUFFERS)`` on the same connection,
+    inside a savepoint that is always rolled back, so the plan reflects the
+    same transaction and never leaves side effects or an aborted transaction
+    behind. That repeats the statement's work, hence the sampling.
+    """
+
+    # Route label for statements run outside a request (scripts, startup)
+    NO_ROUTE = "none"
+
+    def __init__(self, threshold_ms: float, explain_sample_rate: float, size: int):
+        self.threshold_ms = threshold_ms
+        # Compared against every statement's duration; inf when disabled
+        self.threshold_seconds = threshold_ms / 1000 if threshold_ms > 0 else float("inf")
+        self.explain_sample_rate = explain_sample_rate
+        self.recent: "deque[Dict[str, Any]]" = deque(maxlen=size)
+
+    def record(self, statement: str, parameters: Any, context: Any, seconds: float,
+               route: Optional[str], succeeded: bool, executemany: bool = False) -> None:
+        entry: Dict[str, Any] = {
+            "at": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(seconds * 1000, 3),
+            "route": route,
+            "statement": normalize_sql(statement),
+            "parameters": redact_parameters(parameters, executemany),
+            "failed": not succeeded,
+            "plan": None,
+        }
+        SLOW_QUERIES.inc(route=route or self.NO_ROUTE)
+        logger.warning(
+            "Slow query (%.1f ms) on %s: %s params=%s", entry["duration_ms"], route or "-",
+            entry["statement"], entry["parameters"],
+        )
+        if (succeeded and not executemany and context is not None and context.dialect.name == "postgresql"
+                and _is_read(statement) and random.random() < self.explain_sample_rate):
+            entry["plan"] = self._explain(statement, parameters, context)
+        self.recent.append(entry)
+
+    @staticmethod
+    def _explain(statement: str, parameters: Any, context: Any) -> Optional[Any]:
+        cursor = context.root_connection.connection.cursor()
+        try:
+            cursor.execute(f"SAVEPOINT {EXPLAIN_SAVEPOINT}")
+        except Exception:
+            # No transaction to protect (autocommit) is the only expected case; skip the capture
+            cursor.close()
+            EXPLAINS.inc(outcome="skipped")
+            return None
+        try:
+            explain = "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement
+            if parameters is None:
+                cursor.execute(explain)
+            else:
+                cursor.execute(explain, parameters)
+            plan = cursor.fetchone()[0]
+            EXPLAINS.inc(outcome="captured")
+            return json.loads(plan) if isinstance(plan, str) else plan
+        except Exception as e:
+            logger.warning("EXPLAIN of slow query failed: %s", e)
+            EXPLAINS.inc(outcome="failed")
+            return None
+        finally:
+            try:
+                cursor.execute(f"ROLLBACK TO SAVEPOINT {EXPLAIN_SAVEPOINT}")
+                cursor.execute(f"RELEASE SAVEPOINT {EXPLAIN_SAVEPOINT}")
+            except Exception as e:
+                logger.error("Could not roll back the slow query EXPLAIN savepoint: %s", e)
+            cursor.close()
+
+    def stats(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Settings, capture counts and the most recent slow statements, newest first."""
+        entries: List[Dict[str, Any]] = list(self.recent)[::-1]
+        return {
+            "threshold_ms": self.threshold_ms,
+            "explain_sample_rate": self.explain_sample_rate,
+            "slow_queries": {labels["route"]: int(value) for labels, value in SLOW_QUERIES.samples()},
+            "explains": {labels["outcome"]: int(value) for labels, value in EXPLAINS.samples()},
+            "recent": entries[:limit] if limit else entries,
+        }
+
+
+slow_query_log = SlowQueryLog(
+    settings.SLOW_QUERY_MS, settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE, settings.SLOW_QUERY_LOG_SIZE
+)
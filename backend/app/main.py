@@ -1,11 +1,10 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.core.config import settings
-from app.core.database import engine, Base
-from app.api import auth_router, expenses_router, analytics_router, ai_router, categories_router
-
-# Create database tables
-Base.metadata.create_all(bind=engine)
+from app.core.metrics import REGISTRY
+from app.core.request_metrics import RequestMetricsMiddleware
+from app.api import auth_router, expenses_router, analytics_router, ai_router, categories_router, admin_router
 
 # Create FastAPI app
 app = FastAPI(
@@ -23,14 +22,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Deprecation"],
 )
 
+# Outermost, so its latency covers CORS handling too
+if settings.METRICS_ENABLED:
+    app.add_middleware(RequestMetricsMiddleware)
+
 # Include routers
 app.include_router(auth_router, prefix=settings.API_V1_STR)
 app.include_router(expenses_router, prefix=settings.API_V1_STR)
 app.include_router(analytics_router, prefix=settings.API_V1_STR)
 app.include_router(ai_router, prefix=settings.API_V1_STR)
 app.include_router(categories_router, prefix=settings.API_V1_STR)
+app.include_router(admin_router, prefix=settings.API_V1_STR)
 
 
 @app.get("/")
@@ -50,6 +55,13 @@ async def health_check():
     return {"status": "healthy", "service": "OracleCloud Expense Manager"}
 
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+    async def metrics():
+        """Prometheus scrape endpoint (per worker process)."""
+        return PlainTextResponse(REGISTRY.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
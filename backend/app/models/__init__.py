@@ -1,5 +1,8 @@
 from .user import User
 from .expense import Expense
 from .category import Category
+from .expense_rollup import ExpenseMonthlyRollup
+from .ai_response import AIResponseCacheEntry
+from .data_version import DataVersion
 
-__all__ = ["User", "Expense", "Category"] 
\ No newline at end of file
+__all__ = ["User", "Expense", "Category", "ExpenseMonthlyRollup", "AIResponseCacheEntry", "DataVersion"]
\ No newline at end of file
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, DateTime, JSON
+from app.core.database import Base
+
+
+class AIResponseCacheEntry(Base):
+    """A stored AI response, keyed by a fingerprint of everything that went into the prompt."""
+    __tablename__ = "ai_response_cache"
+
+    key = Column(String(64), primary_key=True)
+    endpoint = Column(String, nullable=False)
+    response = Column(JSON, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String, BigInteger, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class DataVersion(Base):
+    """A counter per data scope (a user's expenses, all expenses, categories), bumped on every write."""
+    __tablename__ = "data_versions"
+
+    scope = Column(String(64), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
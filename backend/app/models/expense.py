@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, Text, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -13,6 +13,21 @@ class ExpenseStatus(str, enum.Enum):
 
 class Expense(Base):
     __tablename__ = "expenses"
+    __table_args__ = (
+        # Per-user date ranges, listings and aggregates (covering for analytics)
+        Index(
+            "ix_expenses_user_id_date", "user_id", "date", "id",
+            postgresql_include=["amount", "category_id", "status"],
+        ),
+        # Per-user "most recently submitted"
+        Index("ix_expenses_user_id_created_at", "user_id", "created_at"),
+        # Manager queue by status
+        Index("ix_expenses_status_date", "status", "date", "id"),
+        # Manager-wide listings and date ranges
+        Index("ix_expenses_date_id", "date", "id"),
+        Index("ix_expenses_created_at", "created_at"),
+        Index("ix_expenses_category_id", "category_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, Float, Date, ForeignKey, Enum
+from app.core.database import Base
+from app.models.expense import ExpenseStatus
+
+
+class ExpenseMonthlyRollup(Base):
+    """Running sum/count of expenses per (user, category, status, month).
+
+    Maintained by RollupService in the same transaction as the expense
+    write, so analytics can aggregate these rows instead of raw expenses.
+    """
+    __tablename__ = "expense_monthly_rollups"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    category_id = Column(Integer, ForeignKey("categories.id"), primary_key=True)
+    status = Column(Enum(ExpenseStatus), primary_key=True)
+    month = Column(Date, primary_key=True)
+    total_amount = Column(Float, nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
@@ -1,11 +1,15 @@
-from .user import UserCreate, UserResponse, UserLogin, Token
-from .expense import ExpenseCreate, ExpenseResponse, ExpenseUpdate
+from .user import UserCreate, UserResponse, UserLogin, Token, UserAccessUpdate
+from .expense import (
+    ExpenseCreate, ExpenseResponse, ExpenseUpdate, ExpenseImportRow, ExpenseImportResult,
+    BulkStatusUpdate, BulkStatusResult
+)
 from .category import CategoryCreate, CategoryResponse
 from .analytics import AnalyticsResponse
 
 __all__ = [
-    "UserCreate", "UserResponse", "UserLogin", "Token",
-    "ExpenseCreate", "ExpenseResponse", "ExpenseUpdate",
+    "UserCreate", "UserResponse", "UserLogin", "Token", "UserAccessUpdate",
+    "ExpenseCreate", "ExpenseResponse", "ExpenseUpdate", "ExpenseImportRow", "ExpenseImportResult",
+    "BulkStatusUpdate", "BulkStatusResult",
     "CategoryCreate", "CategoryResponse",
     "AnalyticsResponse"
 ] 
\ No newline at end of file
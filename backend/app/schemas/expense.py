@@ -1,6 +1,7 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import List, Literal, Optional
 from datetime import datetime
+from app.core.config import settings
 from app.models.expense import ExpenseStatus
 
 
@@ -37,4 +38,73 @@ class ExpenseResponse(ExpenseBase):
     user_name: Optional[str] = None
     
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+
+class ExpenseImportRow(BaseModel):
+    """One CSV/NDJSON import row; the category is given by id or by name."""
+    title: str = Field(..., min_length=1)
+    amount: float
+    description: Optional[str] = None
+    date: datetime
+    category_id: Optional[int] = None
+    category: Optional[str] = None
+    # Honoured for managers only; default to the importing user and pending.
+    # A Literal validates several times faster than the enum on bulk imports.
+    user_id: Optional[int] = None
+    status: Optional[Literal["pending", "approved", "rejected"]] = None
+
+    @field_validator("date", mode="before")
+    @classmethod
+    def date_only_is_midnight(cls, value):
+        """Accept plain YYYY-MM-DD dates, common in exported spreadsheets."""
+        if isinstance(value, str) and len(value) == 10:
+            return f"{value}T00:00:00"
+        return value
+
+
+class ExpenseImportError(BaseModel):
+    line: int
+    errors: List[str]
+
+
+class ExpenseImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: List[ExpenseImportError]
+    errors_truncated: bool = False
+
+
+class ExpenseStatusFilter(BaseModel):
+    """Selects expenses for a bulk status change; bounds are inclusive."""
+    status: ExpenseStatus = ExpenseStatus.PENDING
+    category_id: Optional[int] = None
+    user_id: Optional[int] = None
+    min_amount: Optional[float] = None
+    max_amount: Optional[float] = None
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+
+
+class BulkStatusUpdate(BaseModel):
+    """New status for the expenses given by ``ids`` or matched by ``filter`` (exactly one)."""
+    status: Literal[ExpenseStatus.APPROVED, ExpenseStatus.REJECTED]
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=settings.BULK_STATUS_MAX_IDS)
+    filter: Optional[ExpenseStatusFilter] = None
+
+    @model_validator(mode="after")
+    def ids_or_filter(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Give either ids or filter")
+        return self
+
+
+class BulkStatusSkip(BaseModel):
+    id: int
+    reason: str
+
+
+class BulkStatusResult(BaseModel):
+    status: ExpenseStatus
+    updated: List[int]
+    skipped: List[BulkStatusSkip]
@@ -30,6 +30,11 @@ class UserResponse(UserBase):
         from_attributes = True
 
 
+class UserAccessUpdate(BaseModel):
+    is_active: Optional[bool] = None
+    role: Optional[UserRole] = None
+
+
 class Token(BaseModel):
     access_token: str
     token_type: str
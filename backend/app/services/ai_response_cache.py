@@ -0,0 +1,97 @@
+import hashlib
+import json
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.cache import CacheStats
+from app.core.config import settings
+from app.models.ai_response import AIResponseCacheEntry
+from app.services.ai_service import MODEL
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class AIResponseCache:
+    """Database-backed cache of AI responses, shared by all workers and kept across restarts.
+
+    The key is a hash of the endpoint, its parameters, the model and the
+    (id, updated_at) of every expense that fed the prompt, so any added or
+    edited expense produces a new key. Entries expire after ``ttl_seconds``;
+    past ``max_entries`` the ones closest to expiry are evicted.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int, enabled: bool = True):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.counters = CacheStats()
+
+    @staticmethod
+    def key(endpoint: str, params: Dict[str, Any], versions: List[Tuple[int, Optional[datetime]]]) -> str:
+        """Fingerprint of an AI request's inputs."""
+        payload = {
+            "endpoint": endpoint,
+            "model": MODEL,
+            "params": params,
+            "expenses": [[expense_id, updated_at.isoformat() if updated_at else None]
+                         for expense_id, updated_at in sorted(versions)],
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def get(self, db: Session, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored response, or None if missing or expired."""
+        if not self.enabled:
+            return None
+        entry = db.get(AIResponseCacheEntry, key)
+        if entry is None or entry.expires_at <= datetime.utcnow():
+            self.counters.misses += 1
+            return None
+        self.counters.hits += 1
+        return entry.response
+
+    def set(self, db: Session, key: str, endpoint: str, response: Dict[str, Any]) -> None:
+        """Store a response and evict expired or surplus entries."""
+        if not self.enabled:
+            return
+        now = datetime.utcnow()
+        try:
+            db.merge(AIResponseCacheEntry(
+                key=key,
+                endpoint=endpoint,
+                response=response,
+                created_at=now,
+                expires_at=now + timedelta(seconds=self.ttl_seconds),
+            ))
+            db.flush()
+        except IntegrityError:
+            # A concurrent request stored the same key first
+            db.rollback()
+            return
+        self._evict(db, now)
+        db.commit()
+
+    def _evict(self, db: Session, now: datetime) -> None:
+        evicted = db.query(AIResponseCacheEntry).filter(
+            AIResponseCacheEntry.expires_at <= now
+        ).delete(synchronize_session=False)
+        surplus = db.query(func.count(AIResponseCacheEntry.key)).scalar() - self.max_entries
+        if surplus > 0:
+            oldest = db.query(AIResponseCacheEntry.key).order_by(
+                AIResponseCacheEntry.expires_at
+            ).limit(surplus).subquery()
+            evicted += db.query(AIResponseCacheEntry).filter(
+                AIResponseCacheEntry.key.in_(oldest.select())
+            ).delete(synchronize_session=False)
+        self.counters.evictions += evicted
+
+    def stats(self, db: Session) -> Dict[str, Any]:
+        entries = db.query(func.count(AIResponseCacheEntry.key)).scalar()
+        return {"enabled": self.enabled, **self.counters.as_dict(), "backend": "database",
+                "entries": entries, "max_entries": self.max_entries}
+
+
+ai_response_cache = AIResponseCache(
+    ttl_seconds=settings.AI_CACHE_TTL_SECONDS,
+    max_entries=settings.AI_CACHE_MAX_ENTRIES,
+    enabled=settings.AI_CACHE_ENABLED,
+)
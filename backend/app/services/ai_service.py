@@ -1,43 +1,82 @@
+import asyncio
 import json
-from typing import List, Dict, Any
-from groq import Groq
+import logging
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
+import anyio
 from app.core.config import settings
+from app.core.metrics import Histogram
 from app.models.expense import Expense
 from app.models.category import Category
+from app.services.category_classifier import get_classifier
+from app.services.llm_client import llm_client
+from app.services.prompt_builder import ExpenseDigest, estimate_tokens
+
+MODEL = "llama3-8b-8192"
+
+CATEGORY_CHOICES = [
+    "Travel",
+    "Meals & Entertainment",
+    "Office Supplies",
+    "Software & Subscriptions",
+    "Transportation",
+    "Utilities",
+    "Marketing & Advertising",
+    "Professional Services",
+    "Training & Education",
+    "Miscellaneous",
+]
+FALLBACK_CATEGORY = "Miscellaneous"
+
+# (title, amount, description)
+CategoryItem = Tuple[str, float, str]
+
+logger = logging.getLogger(__name__)
+
+PROMPT_TOKENS = Histogram(
+    "ai_prompt_tokens", "Estimated tokens in each AI user prompt", ["endpoint"],
+    buckets=(100, 250, 500, 1000, 1500, 2000, 3000, 4000, 6000, 8000),
+)
 
 
 class AIService:
+    """Groq-backed insights.
+
+    Each public method has an ``*_async`` twin that awaits the AsyncGroq
+    client, so async route handlers don't hold a worker thread while the
+    model is generating. Both share the same prompt builders.
+    """
+    SUMMARY_ERROR = "Unable to generate AI insights at this time."
+    BUDGET_ERROR = "Unable to generate budget recommendations."
+    
     def __init__(self):
-        self.client = Groq(api_key=settings.GROQ_API_KEY)
+        # Shared per process: one connection pool, retry policy and circuit breaker
+        self.llm = llm_client
     
-    def analyze_user_expenses(self, expenses: List[Expense], user_name: str) -> str:
-        """Analyze user expenses and generate financial insights using Groq."""
-        if not expenses:
-            return "No expenses found for analysis."
-        
-        # Prepare expense data for AI analysis
-        expense_data = []
-        total_amount = 0
-        
-        for expense in expenses:
-            expense_data.append({
-                "title": expense.title,
-                "amount": float(expense.amount),
-                "category": expense.category.name,
-                "date": expense.date.strftime("%Y-%m-%d"),
-                "description": expense.description or "No description"
-            })
-            total_amount += expense.amount
-        
-        # Create prompt for Groq
-        prompt = f"""
+    @staticmethod
+    def failed(text: str) -> bool:
+        """True if ``text`` is the fallback message returned when a Groq call fails."""
+        return text.startswith((AIService.SUMMARY_ERROR, AIService.BUDGET_ERROR))
+    
+    @staticmethod
+    def _fit_prompt(endpoint: str, template: str, expenses: List[Expense]) -> str:
+        """Fill ``{digest}`` in ``template`` with an expense digest sized to AI_PROMPT_TOKEN_BUDGET."""
+        digest = ExpenseDigest(expenses, settings.AI_PROMPT_TOP_OUTLIERS)
+        overhead = estimate_tokens(template.replace("{digest}", ""))
+        prompt = template.replace("{digest}", digest.fit(settings.AI_PROMPT_TOKEN_BUDGET - overhead))
+        tokens = estimate_tokens(prompt)
+        PROMPT_TOKENS.observe(tokens, endpoint=endpoint)
+        logger.info("AI %s prompt: %d expenses, ~%d tokens", endpoint, len(expenses), tokens)
+        return prompt
+    
+    @staticmethod
+    def _summary_request(expenses: List[Expense], user_name: str) -> Dict[str, Any]:
+        """Build the chat completion arguments for an expense analysis."""
+        # Expenses are pre-aggregated so the prompt stays within the token budget
+        prompt = AIService._fit_prompt("summary", f"""
         Analyze the following expense data for {user_name} and provide financial insights.
         
-        Total expenses: ${total_amount:.2f}
-        Number of expenses: {len(expenses)}
-        
-        Expense Details:
-        {json.dumps(expense_data, indent=2)}
+        Expense Summary:
+        {{digest}}
         
         Please provide:
         1. A summary of spending patterns
@@ -47,32 +86,28 @@ class AIService:
         5. Any unusual spending patterns or concerns
         
         Format your response in a clear, actionable manner suitable for a business expense management system.
-        """
+        """, expenses)
         
-        try:
-            response = self.client.chat.completions.create(
-                model="llama3-8b-8192",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a financial advisor specializing in expense analysis and budget optimization. Provide clear, actionable insights based on expense data."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.7,
-                max_tokens=1000
-            )
-            
-            return response.choices[0].message.content
-            
-        except Exception as e:
-            return f"Unable to generate AI insights at this time. Error: {str(e)}"
+        return dict(
+            model=MODEL,
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are a financial advisor specializing in expense analysis and budget optimization. Provide clear, actionable insights based on expense data."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            temperature=0.7,
+            max_tokens=1000
+        )
     
-    def predict_expense_category(self, expense_title: str, amount: float, description: str = "") -> str:
-        """Predict the most likely category for an expense using AI."""
+    @staticmethod
+    def _category_request(expense_title: str, amount: float, description: str = "") -> Dict[str, Any]:
+        """Build the chat completion arguments for a category prediction."""
+        choices = "\n        ".join(f"- {name}" for name in CATEGORY_CHOICES)
         prompt = f"""
         Based on the following expense information, predict the most appropriate category:
         
@@ -81,51 +116,83 @@ class AIService:
         Description: {description}
         
         Choose from these common expense categories:
-        - Travel
-        - Meals & Entertainment
-        - Office Supplies
-        - Software & Subscriptions
-        - Transportation
-        - Utilities
-        - Marketing & Advertising
-        - Professional Services
-        - Training & Education
-        - Miscellaneous
+        {choices}
         
         Respond with only the category name.
         """
         
-        try:
-            response = self.client.chat.completions.create(
-                model="llama3-8b-8192",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expense categorization expert. Respond with only the category name."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,
-                max_tokens=50
-            )
-            
-            return response.choices[0].message.content.strip()
-            
-        except Exception as e:
-            return "Miscellaneous"
+        return dict(
+            model=MODEL,
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are an expense categorization expert. Respond with only the category name."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            temperature=0.3,
+            max_tokens=50
+        )
     
-    def generate_budget_recommendations(self, user_expenses: List[Expense], monthly_budget: float) -> str:
-        """Generate budget recommendations based on spending patterns."""
-        if not user_expenses:
-            return "No expense data available for budget recommendations."
+    @staticmethod
+    def _category_batch_request(items: List[CategoryItem]) -> Dict[str, Any]:
+        """Build the chat completion arguments for categorizing several expenses at once (JSON output)."""
+        numbered = [
+            {"i": index, "title": title, "amount": round(float(amount), 2), "description": description or ""}
+            for index, (title, amount, description) in enumerate(items)
+        ]
+        prompt = f"""
+        Predict the most appropriate category for each expense below.
+        
+        Choose from these common expense categories: {", ".join(CATEGORY_CHOICES)}
+        
+        Expenses:
+        {json.dumps(numbered)}
+        
+        Respond with a JSON object of the form {{"categories": ["<category of expense 0>", "<category of expense 1>", ...]}}
+        containing exactly {len(items)} category names, in the same order as the expenses.
+        """
         
+        return dict(
+            model=MODEL,
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are an expense categorization expert. Respond only with JSON."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            temperature=0.3,
+            max_tokens=20 + 12 * len(items),
+            response_format={"type": "json_object"}
+        )
+    
+    @staticmethod
+    def _parse_category_batch(content: str, count: int) -> List[str]:
+        """Read the batch answer; anything missing or not a known category becomes FALLBACK_CATEGORY."""
+        try:
+            categories = json.loads(content).get("categories")
+        except (ValueError, AttributeError):
+            categories = None
+        if not isinstance(categories, list):
+            categories = []
+        known = {name.lower(): name for name in CATEGORY_CHOICES}
+        parsed = [known.get(str(name).strip().lower(), FALLBACK_CATEGORY) for name in categories[:count]]
+        return parsed + [FALLBACK_CATEGORY] * (count - len(parsed))
+    
+    @staticmethod
+    def _budget_request(user_expenses: List[Expense], monthly_budget: float) -> Dict[str, Any]:
+        """Build the chat completion arguments for budget recommendations."""
         total_spent = sum(expense.amount for expense in user_expenses)
         remaining_budget = monthly_budget - total_spent
         
-        prompt = f"""
+        prompt = AIService._fit_prompt("budget", f"""
         Generate budget recommendations based on the following data:
         
         Monthly Budget: ${monthly_budget:.2f}
@@ -133,37 +200,173 @@ class AIService:
         Remaining Budget: ${remaining_budget:.2f}
         
         Recent Expenses:
-        {json.dumps([{
-            "title": exp.title,
-            "amount": float(exp.amount),
-            "category": exp.category.name
-        } for exp in user_expenses], indent=2)}
+        {{digest}}
         
         Provide:
         1. Budget status assessment
         2. Recommendations for remaining budget allocation
         3. Suggestions for cost-cutting if over budget
         4. Next month's budget planning tips
+        """, user_expenses)
+        
+        return dict(
+            model=MODEL,
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are a budget planning expert. Provide practical budget recommendations."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            temperature=0.6,
+            max_tokens=800
+        )
+    
+    def analyze_user_expenses(self, expenses: List[Expense], user_name: str) -> str:
+        """Analyze user expenses and generate financial insights using Groq."""
+        if not expenses:
+            return "No expenses found for analysis."
+        
+        try:
+            response = self.llm.create("summary", **self._summary_request(expenses, user_name))
+            return response.choices[0].message.content
+            
+        except Exception as e:
+            return f"{self.SUMMARY_ERROR} Error: {str(e)}"
+    
+    async def analyze_user_expenses_async(self, expenses: List[Expense], user_name: str) -> str:
+        """Async variant of analyze_user_expenses."""
+        if not expenses:
+            return "No expenses found for analysis."
+        
+        try:
+            response = await self.llm.acreate("summary", **self._summary_request(expenses, user_name))
+            return response.choices[0].message.content
+            
+        except Exception as e:
+            return f"{self.SUMMARY_ERROR} Error: {str(e)}"
+    
+    async def stream_user_expense_analysis(self, expenses: List[Expense], user_name: str) -> AsyncIterator[str]:
+        """Yield the analysis text piece by piece as Groq generates it.
+        
+        Errors are raised to the caller. If the consumer stops early (e.g. the
+        client disconnected), the upstream stream is closed so Groq stops generating.
+        """
+        stream = await self.llm.acreate(
+            "summary_stream", **self._summary_request(expenses, user_name), stream=True
+        )
+        try:
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
+        finally:
+            # Shielded: on cancellation any other await here would be cancelled too
+            with anyio.CancelScope(shield=True):
+                await stream.close()
+    
+    def predict_expense_category(self, expense_title: str, amount: float, description: str = "") -> str:
+        """Predict the most likely category for an expense using AI."""
+        try:
+            response = self.llm.create(
+                "category", **self._category_request(expense_title, amount, description)
+            )
+            return response.choices[0].message.content.strip()
+            
+        except Exception as e:
+            return "Miscellaneous"
+    
+    async def predict_expense_category_async(self, expense_title: str, amount: float, description: str = "") -> str:
+        """Async variant of predict_expense_category."""
+        try:
+            response = await self.llm.acreate(
+                "category", **self._category_request(expense_title, amount, description)
+            )
+            return response.choices[0].message.content.strip()
+            
+        except Exception as e:
+            return "Miscellaneous"
+    
+    async def predict_expense_categories_async(self, items: List[CategoryItem]) -> List[str]:
+        """Predict categories for several expenses with a single Groq call."""
+        try:
+            response = await self.llm.acreate("category_batch", **self._category_batch_request(items))
+            return self._parse_category_batch(response.choices[0].message.content, len(items))
+            
+        except Exception as e:
+            return [FALLBACK_CATEGORY] * len(items)
+    
+    @staticmethod
+    def local_category_prediction(title: str, amount: float, description: str = "") -> Optional[Dict[str, Any]]:
+        """The local classifier's prediction, or None if there is no model or it is not confident enough."""
+        model = get_classifier()
+        if model is None:
+            return None
+        predicted_category, confidence = model.predict(title, description, amount)
+        if confidence < settings.CATEGORY_CONFIDENCE_THRESHOLD:
+            return None
+        return {"predicted_category": predicted_category, "confidence": round(confidence, 4), "source": "local"}
+    
+    @staticmethod
+    async def predict_categories_batch_async(items: List[CategoryItem]) -> List[Dict[str, Any]]:
+        """Predict a category for every item, in input order.
+        
+        Identical items are predicted once. The local classifier answers what
+        it can; the rest are packed AI_BATCH_CHUNK_SIZE per Groq request, with
+        at most AI_BATCH_CONCURRENCY requests in flight.
         """
+        results: Dict[CategoryItem, Dict[str, Any]] = {}
+        pending: List[CategoryItem] = []
+        for item in dict.fromkeys(items):
+            local = AIService.local_category_prediction(*item)
+            if local is not None:
+                results[item] = local
+            else:
+                pending.append(item)
+        
+        if pending:
+            ai_service = AIService()
+            semaphore = asyncio.Semaphore(settings.AI_BATCH_CONCURRENCY)
+            size = settings.AI_BATCH_CHUNK_SIZE
+            chunks = [pending[i:i + size] for i in range(0, len(pending), size)]
+            
+            async def predict(chunk: List[CategoryItem]) -> List[str]:
+                async with semaphore:
+                    return await ai_service.predict_expense_categories_async(chunk)
+            
+            for chunk, categories in zip(chunks, await asyncio.gather(*(predict(chunk) for chunk in chunks))):
+                for item, category in zip(chunk, categories):
+                    results[item] = {"predicted_category": category, "confidence": None, "source": "llm"}
+        
+        return [results[item] for item in items]
+    
+    def generate_budget_recommendations(self, user_expenses: List[Expense], monthly_budget: float) -> str:
+        """Generate budget recommendations based on spending patterns."""
+        if not user_expenses:
+            return "No expense data available for budget recommendations."
         
         try:
-            response = self.client.chat.completions.create(
-                model="llama3-8b-8192",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a budget planning expert. Provide practical budget recommendations."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.6,
-                max_tokens=800
+            response = self.llm.create(
+                "budget", **self._budget_request(user_expenses, monthly_budget)
             )
+            return response.choices[0].message.content
             
+        except Exception as e:
+            return f"{self.BUDGET_ERROR} Error: {str(e)}"
+    
+    async def generate_budget_recommendations_async(self, user_expenses: List[Expense], monthly_budget: float) -> str:
+        """Async variant of generate_budget_recommendations."""
+        if not user_expenses:
+            return "No expense data available for budget recommendations."
+        
+        try:
+            response = await self.llm.acreate(
+                "budget", **self._budget_request(user_expenses, monthly_budget)
+            )
             return response.choices[0].message.content
             
         except Exception as e:
-            return f"Unable to generate budget recommendations. Error: {str(e)}" 
\ No newline at end of file
+            return f"{self.BUDGET_ERROR} Error: {str(e)}"
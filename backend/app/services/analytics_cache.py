@@ -0,0 +1,71 @@
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+from app.core.cache import create_cache
+from app.core.config import settings
+from typing import Any, Callable, Dict, Optional
+
+
+class AnalyticsCache:
+    """Read-through cache for AnalyticsService results.
+
+    Entries are scoped per user, plus one global scope for manager-wide
+    analytics. Each scope has a version number that is part of every key;
+    invalidating a scope bumps its version so stale entries are never read
+    again and simply age out of the backend. Those versions only see writes
+    made by this process (with the memory backend), so callers also pass a
+    ``stamp`` derived from the shared ``data_versions`` (the response ETag),
+    which keys entries to the data they were computed from.
+    """
+    GLOBAL_SCOPE = "all"
+
+    def __init__(self, backend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+
+    @staticmethod
+    def _scope(user_id: Optional[int]) -> str:
+        return f"user:{user_id}" if user_id else AnalyticsCache.GLOBAL_SCOPE
+
+    def _key(self, scope: str, name: str, stamp: str, params: Dict[str, Any]) -> str:
+        version = self.backend.counter(f"analytics-version:{scope}")
+        args = ",".join(f"{k}={params[k]}" for k in sorted(params))
+        return f"analytics:{scope}:v{version}:{stamp}:{name}:{args}"
+
+    def get_or_compute(
+        self, db: Session, name: str, compute: Callable[..., Any], user_id: Optional[int] = None,
+        stamp: str = "", **params
+    ) -> Any:
+        """Return the cached ``compute(db, user_id=user_id, **params)``, computing and storing it on a miss.
+
+        Entries are only reused for the same ``stamp``.
+        """
+        if not self.enabled:
+            return compute(db, user_id=user_id, **params)
+        key = self._key(self._scope(user_id), name, stamp, params)
+        cached = self.backend.get(key)
+        if cached is not None:
+            return cached
+        value = jsonable_encoder(compute(db, user_id=user_id, **params))
+        self.backend.set(key, value)
+        return value
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop cached analytics for a user and the manager-wide scope."""
+        if not self.enabled:
+            return
+        self.backend.incr(f"analytics-version:{self._scope(user_id)}")
+        self.backend.incr(f"analytics-version:{self.GLOBAL_SCOPE}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": self.enabled, **self.backend.stats_dict()}
+
+
+analytics_cache = AnalyticsCache(
+    create_cache(
+        settings.CACHE_BACKEND,
+        max_entries=settings.ANALYTICS_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.ANALYTICS_CACHE_TTL_SECONDS,
+        redis_url=settings.REDIS_URL,
+    ),
+    enabled=settings.ANALYTICS_CACHE_ENABLED,
+)
@@ -1,26 +1,52 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
+from sqlalchemy import func, tuple_
 from app.models.expense import Expense, ExpenseStatus
-from app.models.category import Category
+from app.models.expense_rollup import ExpenseMonthlyRollup as Rollup
 from app.schemas.analytics import AnalyticsResponse, CategoryBreakdown, MonthlyTrend
+from app.services.category_registry import category_registry
+from app.services.rollup_service import RollupService
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 
 
+# Months of history in trends (and the comprehensive analytics' monthly_trends)
+TREND_MONTHS = 6
+
+
 class AnalyticsService:
+    """Expense analytics.
+
+    Aggregates are read from the expense_monthly_rollups table (maintained by
+    RollupService on every expense write), so their cost depends on the number
+    of months x categories x statuses rather than on the number of expenses.
+    Queries group by category id; names come from the category registry.
+    """
+    @staticmethod
+    def _rollups(db: Session, *columns, user_id: Optional[int] = None):
+        """Query rollup buckets, skipping ones emptied by status changes."""
+        query = db.query(*columns).filter(Rollup.count > 0)
+        if user_id:
+            query = query.filter(Rollup.user_id == user_id)
+        return query
+    
+    @staticmethod
+    def _trend_start(months: int):
+        """First month included in trends (the month containing now - months*30 days)."""
+        return RollupService.month_of(datetime.utcnow() - timedelta(days=months * 30))
+    
     @staticmethod
     def get_category_breakdown(db: Session, user_id: Optional[int] = None) -> List[CategoryBreakdown]:
         """Get expense breakdown by category."""
-        query = db.query(
-            Category.name,
-            func.sum(Expense.amount).label('total_amount'),
-            func.count(Expense.id).label('count')
-        ).join(Expense, Category.id == Expense.category_id)
-        
-        if user_id:
-            query = query.filter(Expense.user_id == user_id)
+        query = AnalyticsService._rollups(
+            db,
+            Rollup.category_id,
+            func.sum(Rollup.total_amount).label('total_amount'),
+            func.sum(Rollup.count).label('count'),
+            user_id=user_id
+        )
         
-        results = query.group_by(Category.name).all()
+        results = query.group_by(Rollup.category_id).all()
+        names = category_registry.names(db, {result.category_id for result in results})
         
         # Calculate total for percentage
         total_amount = sum(result.total_amount for result in results)
@@ -29,7 +55,7 @@ class AnalyticsService:
         for result in results:
             percentage = (result.total_amount / total_amount * 100) if total_amount > 0 else 0
             breakdown.append(CategoryBreakdown(
-                category_name=result.name,
+                category_name=names.get(result.category_id, category_registry.UNKNOWN_NAME),
                 total_amount=float(result.total_amount),
                 percentage=round(percentage, 2),
                 count=result.count
@@ -38,21 +64,17 @@ class AnalyticsService:
         return sorted(breakdown, key=lambda x: x.total_amount, reverse=True)
     
     @staticmethod
-    def get_monthly_trends(db: Session, user_id: Optional[int] = None, months: int = 6) -> List[MonthlyTrend]:
+    def get_monthly_trends(db: Session, user_id: Optional[int] = None, months: int = TREND_MONTHS) -> List[MonthlyTrend]:
         """Get monthly expense trends."""
-        end_date = datetime.utcnow()
-        start_date = end_date - timedelta(days=months * 30)
-        
-        query = db.query(
-            func.date_trunc('month', Expense.date).label('month'),
-            func.sum(Expense.amount).label('total_amount'),
-            func.count(Expense.id).label('count')
-        ).filter(Expense.date >= start_date)
+        query = AnalyticsService._rollups(
+            db,
+            Rollup.month,
+            func.sum(Rollup.total_amount).label('total_amount'),
+            func.sum(Rollup.count).label('count'),
+            user_id=user_id
+        ).filter(Rollup.month >= AnalyticsService._trend_start(months))
         
-        if user_id:
-            query = query.filter(Expense.user_id == user_id)
-        
-        results = query.group_by(func.date_trunc('month', Expense.date)).order_by(func.date_trunc('month', Expense.date)).all()
+        results = query.group_by(Rollup.month).order_by(Rollup.month).all()
         
         trends = []
         for result in results:
@@ -67,24 +89,22 @@ class AnalyticsService:
     @staticmethod
     def get_status_breakdown(db: Session, user_id: Optional[int] = None) -> Dict[str, int]:
         """Get expense breakdown by status."""
-        query = db.query(Expense.status, func.count(Expense.id))
-        
-        if user_id:
-            query = query.filter(Expense.user_id == user_id)
+        query = AnalyticsService._rollups(db, Rollup.status, func.sum(Rollup.count), user_id=user_id)
         
-        results = query.group_by(Expense.status).all()
+        results = query.group_by(Rollup.status).all()
         
         return {status.value: count for status, count in results}
     
     @staticmethod
     def get_recent_expenses(db: Session, user_id: Optional[int] = None, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent expenses for analytics."""
-        query = db.query(Expense).join(Category, Expense.category_id == Category.id)
+        query = db.query(Expense)
         
         if user_id:
             query = query.filter(Expense.user_id == user_id)
         
         expenses = query.order_by(Expense.created_at.desc()).limit(limit).all()
+        names = category_registry.names(db, {expense.category_id for expense in expenses})
         
         recent_expenses = []
         for expense in expenses:
@@ -92,7 +112,7 @@ class AnalyticsService:
                 "id": expense.id,
                 "title": expense.title,
                 "amount": float(expense.amount),
-                "category": expense.category.name,
+                "category": names.get(expense.category_id, category_registry.UNKNOWN_NAME),
                 "status": expense.status.value,
                 "date": expense.date.isoformat(),
                 "created_at": expense.created_at.isoformat()
@@ -101,21 +121,72 @@ class AnalyticsService:
         return recent_expenses
     
     @staticmethod
-    def get_comprehensive_analytics(db: Session, user_id: Optional[int] = None) -> AnalyticsResponse:
-        """Get comprehensive analytics for a user or all users."""
-        # Get basic stats
-        query = db.query(Expense)
-        if user_id:
-            query = query.filter(Expense.user_id == user_id)
+    def get_comprehensive_analytics(db: Session, user_id: Optional[int] = None, months: int = TREND_MONTHS) -> AnalyticsResponse:
+        """Get comprehensive analytics for a user or all users.
+
+        Totals, category, status and month groupings are computed in one pass
+        over the rollup buckets with GROUPING SETS; only the (index-driven)
+        recent expenses list is fetched separately.
+        """
+        trend_start = AnalyticsService._trend_start(months)
+        
+        scoped = AnalyticsService._rollups(
+            db,
+            Rollup.category_id.label('category'),
+            Rollup.status.label('status'),
+            Rollup.month.label('month'),
+            Rollup.total_amount.label('amount'),
+            Rollup.count.label('count'),
+            user_id=user_id
+        ).cte('scoped')
+        
+        # grouping() bitmask: 4 = category rolled up, 2 = status, 1 = month
+        rows = db.query(
+            func.grouping(scoped.c.category, scoped.c.status, scoped.c.month).label('grouping'),
+            scoped.c.category,
+            scoped.c.status,
+            scoped.c.month,
+            func.sum(scoped.c.amount).label('total_amount'),
+            func.sum(scoped.c.count).label('count')
+        ).group_by(func.grouping_sets(
+            tuple_(),
+            tuple_(scoped.c.category),
+            tuple_(scoped.c.status),
+            tuple_(scoped.c.month)
+        )).all()
+        
+        total_amount, total_count = 0, 0
+        categories, trends, status_breakdown = [], [], {}
+        for row in rows:
+            if row.grouping == 7:
+                total_amount, total_count = row.total_amount or 0, row.count or 0
+            elif row.grouping == 3:
+                categories.append(row)
+            elif row.grouping == 5:
+                status_breakdown[row.status.value] = row.count
+            elif row.grouping == 6 and row.month >= trend_start:
+                trends.append(row)
+        
+        category_total = sum(row.total_amount for row in categories)
+        names = category_registry.names(db, {row.category for row in categories})
+        top_categories = sorted((
+            CategoryBreakdown(
+                category_name=names.get(row.category, category_registry.UNKNOWN_NAME),
+                total_amount=float(row.total_amount),
+                percentage=round(row.total_amount / category_total * 100, 2) if category_total > 0 else 0,
+                count=row.count
+            ) for row in categories
+        ), key=lambda x: x.total_amount, reverse=True)
+        
+        monthly_trends = [
+            MonthlyTrend(
+                month=row.month.strftime('%Y-%m'),
+                total_amount=float(row.total_amount),
+                count=row.count
+            ) for row in sorted(trends, key=lambda row: row.month)
+        ]
         
-        total_amount = query.with_entities(func.sum(Expense.amount)).scalar() or 0
-        total_count = query.count()
         average_amount = total_amount / total_count if total_count > 0 else 0
-        
-        # Get breakdowns
-        top_categories = AnalyticsService.get_category_breakdown(db, user_id)
-        monthly_trends = AnalyticsService.get_monthly_trends(db, user_id)
-        status_breakdown = AnalyticsService.get_status_breakdown(db, user_id)
         recent_expenses = AnalyticsService.get_recent_expenses(db, user_id)
         
         return AnalyticsResponse(
@@ -126,4 +197,4 @@ class AnalyticsService:
             monthly_trends=monthly_trends,
             status_breakdown=status_breakdown,
             recent_expenses=recent_expenses
-        ) 
\ No newline at end of file
+        )
@@ -1,15 +1,19 @@
 from sqlalchemy.orm import Session
+from app.core.database import run_db, DbSession
 from app.models.user import User, UserRole
 from app.schemas.user import UserCreate, UserLogin
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.core.security import pwd_context, get_password_hash, create_access_token
+from app.core.password_hasher import password_hasher
+from app.services.principal_cache import principal_cache
 from typing import Optional
 
 
 class AuthService:
     @staticmethod
-    def create_user(db: Session, user: UserCreate) -> User:
+    def create_user(db: Session, user: UserCreate, hashed_password: Optional[str] = None) -> User:
         """Create a new user."""
-        hashed_password = get_password_hash(user.password)
+        if hashed_password is None:
+            hashed_password = get_password_hash(user.password)
         db_user = User(
             email=user.email,
             username=user.username,
@@ -26,8 +30,45 @@ class AuthService:
     def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
         """Authenticate user with email and password."""
         user = db.query(User).filter(User.email == email).first()
-        if not user or not verify_password(password, user.hashed_password):
+        if not user:
             return None
+        valid, new_hash = pwd_context.verify_and_update(password, user.hashed_password)
+        if not valid:
+            return None
+        if new_hash:
+            AuthService.update_password_hash(db, user, new_hash)
+        return user
+    
+    @staticmethod
+    def update_password_hash(db: Session, user: User, hashed_password: str) -> None:
+        """Store a rehashed password (e.g. after a bcrypt cost change)."""
+        user.hashed_password = hashed_password
+        db.commit()
+        db.refresh(user)
+    
+    @staticmethod
+    async def create_user_async(db: DbSession, user: UserCreate) -> User:
+        """Create a new user, hashing the password on the password hasher pool.
+        
+        Raises PasswordHasherBusy when the pool is saturated.
+        """
+        hashed_password = await password_hasher.hash(user.password)
+        return await run_db(db, AuthService.create_user, user, hashed_password)
+    
+    @staticmethod
+    async def authenticate_user_async(db: DbSession, email: str, password: str) -> Optional[User]:
+        """Authenticate user on the password hasher pool, upgrading the stored hash if needed.
+        
+        Raises PasswordHasherBusy when the pool is saturated.
+        """
+        user = await run_db(db, AuthService.get_user_by_email, email)
+        if not user:
+            return None
+        valid, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+        if not valid:
+            return None
+        if new_hash:
+            await run_db(db, AuthService.update_password_hash, user, new_hash)
         return user
     
     @staticmethod
@@ -40,13 +81,37 @@ class AuthService:
         """Get user by ID."""
         return db.query(User).filter(User.id == user_id).first()
     
+    @staticmethod
+    def update_user_access(
+        db: Session, user_id: int, is_active: Optional[bool] = None, role: Optional[UserRole] = None
+    ) -> Optional[User]:
+        """Change a user's active flag and/or role, revoking their existing tokens."""
+        user = AuthService.get_user_by_id(db, user_id)
+        if user is None:
+            return None
+        changed = False
+        if is_active is not None and is_active != user.is_active:
+            user.is_active = is_active
+            changed = True
+        if role is not None and role != user.role:
+            user.role = role
+            changed = True
+        if changed:
+            old_version = user.token_version
+            user.token_version = old_version + 1
+            db.commit()
+            principal_cache.invalidate(user.id, old_version)
+            db.refresh(user)
+        return user
+    
     @staticmethod
     def create_access_token_for_user(user: User) -> str:
         """Create access token for user."""
         data = {
             "sub": user.email,
             "user_id": user.id,
-            "role": user.role.value
+            "role": user.role.value,
+            "ver": user.token_version or 0
         }
         return create_access_token(data=data)
     
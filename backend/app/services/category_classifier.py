@@ -0,0 +1,139 @@
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.category import Category
+from app.models.expense import Expense
+
+# (title, description, amount, category name)
+Sample = Tuple[str, Optional[str], float, str]
+
+TOKEN_RE = re.compile(r"[a-z]{2,}")
+
+
+def features(title: str, description: Optional[str], amount: float) -> Dict[str, float]:
+    """Term counts for an expense: title words (weighted up), description words and an amount bucket."""
+    counts: Dict[str, float] = defaultdict(float)
+    for token in TOKEN_RE.findall(title.lower()):
+        counts[token] += 2.0
+    for token in TOKEN_RE.findall((description or "").lower()):
+        counts[token] += 1.0
+    # Half-decade buckets: 1-3, 3-10, 10-31, 31-100, ...
+    bucket = int(math.floor(math.log10(amount) * 2)) if amount > 0 else -1
+    counts[f"__amount_{bucket}"] += 1.0
+    return counts
+
+
+class CategoryClassifier:
+    """Multinomial naive Bayes over TF-IDF-weighted expense features.
+
+    Small enough to train on every labelled expense in seconds and to
+    predict in microseconds, with calibrated-enough posteriors to decide
+    when to fall back to the LLM.
+    """
+
+    def __init__(self, classes: List[str], priors: Dict[str, float], idf: Dict[str, float],
+                 log_probs: Dict[str, Dict[str, float]], unseen: Dict[str, float], samples: int = 0):
+        self.classes = classes
+        self.priors = priors
+        self.idf = idf
+        self.log_probs = log_probs
+        self.unseen = unseen
+        self.samples = samples
+
+    @classmethod
+    def fit(cls, samples: Iterable[Sample], alpha: float = 0.1) -> "CategoryClassifier":
+        docs = [(features(title, description, amount), label) for title, description, amount, label in samples]
+        if not docs:
+            raise ValueError("No labelled expenses to train on")
+        document_frequency: Counter = Counter()
+        for counts, _ in docs:
+            document_frequency.update(counts.keys())
+        idf = {token: math.log((1 + len(docs)) / (1 + df)) + 1 for token, df in document_frequency.items()}
+
+        weights: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        class_counts: Counter = Counter()
+        for counts, label in docs:
+            class_counts[label] += 1
+            for token, count in counts.items():
+                weights[label][token] += (1 + math.log(count)) * idf[token]
+
+        vocabulary = len(idf)
+        classes = sorted(class_counts)
+        log_probs, unseen = {}, {}
+        for label in classes:
+            denominator = sum(weights[label].values()) + alpha * vocabulary
+            log_probs[label] = {token: math.log((w + alpha) / denominator) for token, w in weights[label].items()}
+            unseen[label] = math.log(alpha / denominator)
+        priors = {label: math.log(class_counts[label] / len(docs)) for label in classes}
+        return cls(classes, priors, idf, log_probs, unseen, samples=len(docs))
+
+    def predict_proba(self, title: str, description: Optional[str], amount: float) -> List[Tuple[str, float]]:
+        """(category, probability) for every class, most likely first."""
+        weighted = {
+            token: (1 + math.log(count)) * self.idf[token]
+            for token, count in features(title, description, amount).items() if token in self.idf
+        }
+        scores = {}
+        for label in self.classes:
+            table, default = self.log_probs[label], self.unseen[label]
+            scores[label] = self.priors[label] + sum(w * table.get(token, default) for token, w in weighted.items())
+        top = max(scores.values())
+        exp = {label: math.exp(score - top) for label, score in scores.items()}
+        total = sum(exp.values())
+        return sorted(((label, value / total) for label, value in exp.items()), key=lambda item: -item[1])
+
+    def predict(self, title: str, description: Optional[str], amount: float) -> Tuple[str, float]:
+        """Most likely category and its probability."""
+        return self.predict_proba(title, description, amount)[0]
+
+    def to_dict(self) -> dict:
+        return {"classes": self.classes, "priors": self.priors, "idf": self.idf,
+                "log_probs": self.log_probs, "unseen": self.unseen, "samples": self.samples}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CategoryClassifier":
+        return cls(data["classes"], data["priors"], data["idf"], data["log_probs"], data["unseen"],
+                   samples=data.get("samples", 0))
+
+    def save(self, path: str) -> None:
+        """Write the model atomically so running workers never read a partial file."""
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "CategoryClassifier":
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+def training_samples(db: Session) -> List[Sample]:
+    """Every labelled expense as (title, description, amount, category name)."""
+    return db.query(Expense.title, Expense.description, Expense.amount, Category.name).join(
+        Category, Expense.category_id == Category.id
+    ).all()
+
+
+_lock = threading.Lock()
+_loaded: Dict[str, object] = {"mtime": None, "model": None}
+
+
+def get_classifier() -> Optional[CategoryClassifier]:
+    """The model at CATEGORY_MODEL_PATH, reloaded when the file changes; None if not trained yet."""
+    try:
+        mtime = os.stat(settings.CATEGORY_MODEL_PATH).st_mtime
+    except OSError:
+        return None
+    if _loaded["mtime"] != mtime:
+        with _lock:
+            if _loaded["mtime"] != mtime:
+                _loaded["model"] = CategoryClassifier.load(settings.CATEGORY_MODEL_PATH)
+                _loaded["mtime"] = mtime
+    return _loaded["model"]
@@ -0,0 +1,132 @@
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.metrics import Counter
+from app.models.category import Category
+from app.services.data_versions import CATEGORIES_SCOPE, DataVersions
+
+REGISTRY_LOADS = Counter(
+    "category_registry_loads_total", "Category registry reloads by reason (version_changed, unknown_id)", ["reason"]
+)
+
+
+class CategoryEntry(NamedTuple):
+    id: int
+    name: str
+    description: Optional[str]
+    created_at: Optional[datetime]
+
+
+class CategorySnapshot(NamedTuple):
+    version: int
+    by_id: Dict[int, CategoryEntry]
+    by_name: Dict[str, CategoryEntry]
+
+    def names(self) -> Dict[int, str]:
+        return {category_id: entry.name for category_id, entry in self.by_id.items()}
+
+
+class CategoryRegistry:
+    """Process-wide in-memory copy of the categories table.
+
+    Each worker loads the table once and serves id/name lookups from memory.
+    The ``categories`` data version (bumped by ``create_category``) is
+    checked at most every ``check_seconds``, and the table is reloaded when
+    it moved, so workers pick up each other's changes. Category ids and names
+    never change once created, so an id the snapshot does not know (e.g. a
+    category inserted outside the API) is always resolved: the missing ids
+    are looked up by primary key, and the table is reloaded only if one of
+    them exists. Ids that do not exist (which clients can send at will)
+    therefore never cost more than that lookup.
+    """
+
+    # Name shown for an id that is not in the table at all (e.g. deleted by hand)
+    UNKNOWN_NAME = "Unknown"
+
+    def __init__(self, check_seconds: float):
+        self.check_seconds = check_seconds
+        self._snapshot = CategorySnapshot(-1, {}, {})
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _load(db: Session, version: int) -> CategorySnapshot:
+        rows = db.query(Category.id, Category.name, Category.description, Category.created_at).order_by(Category.id).all()
+        entries = [CategoryEntry(*row) for row in rows]
+        return CategorySnapshot(version, {entry.id: entry for entry in entries}, {entry.name: entry for entry in entries})
+
+    def _reload(self, db: Session, version: int, reason: str) -> CategorySnapshot:
+        with self._lock:
+            # Another thread may have reloaded while this one waited for the lock
+            if self._snapshot.version != version:
+                self._snapshot = self._load(db, version)
+                REGISTRY_LOADS.inc(reason=reason)
+            return self._snapshot
+
+    def _resolve(self, db: Session, snapshot: CategorySnapshot, missing: Set[int]) -> CategorySnapshot:
+        """Snapshot covering every id in ``missing`` that exists, reloaded only if any does."""
+        existing = {row.id for row in db.query(Category.id).filter(Category.id.in_(missing))}
+        if not existing:
+            return snapshot
+        with self._lock:
+            # Another thread may have loaded them while this one waited for the lock
+            if not existing.issubset(self._snapshot.by_id):
+                self._snapshot = self._load(db, self._snapshot.version)
+                REGISTRY_LOADS.inc(reason="unknown_id")
+            return self._snapshot
+
+    def snapshot(self, db: Session, version: Optional[int] = None) -> CategorySnapshot:
+        """The current snapshot, reloaded first if the categories version moved.
+
+        Pass ``version`` when the caller has just read it (e.g. for an ETag)
+        so the snapshot is guaranteed to be at least that fresh; otherwise
+        the stored version is re-read once ``check_seconds`` have passed.
+        """
+        if version is None:
+            now = time.monotonic()
+            if now - self._checked_at < self.check_seconds:
+                return self._snapshot
+            version = DataVersions.get(db, [CATEGORIES_SCOPE])[CATEGORIES_SCOPE]
+            self._checked_at = now
+        if version == self._snapshot.version:
+            return self._snapshot
+        return self._reload(db, version, "version_changed")
+
+    def names(self, db: Session, ids: Iterable[int] = ()) -> Dict[int, str]:
+        """Category names by id, resolving any of ``ids`` the snapshot does not know."""
+        snapshot = self.snapshot(db)
+        missing = set(ids).difference(snapshot.by_id)
+        if missing:
+            snapshot = self._resolve(db, snapshot, missing)
+        return snapshot.names()
+
+    def get(self, db: Session, category_id: int) -> Optional[CategoryEntry]:
+        snapshot = self.snapshot(db)
+        if category_id not in snapshot.by_id:
+            snapshot = self._resolve(db, snapshot, {category_id})
+        return snapshot.by_id.get(category_id)
+
+    def find(self, db: Session, name: str) -> Optional[CategoryEntry]:
+        """Category by exact name; may miss one created in another worker in the last ``check_seconds``."""
+        return self.snapshot(db).by_name.get(name)
+
+    def all(self, db: Session, version: Optional[int] = None) -> List[CategoryEntry]:
+        return list(self.snapshot(db, version).by_id.values())
+
+    def invalidate(self) -> None:
+        """Re-check the version on the next lookup (call after changing categories)."""
+        self._checked_at = float("-inf")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "version": self._snapshot.version,
+            "categories": len(self._snapshot.by_id),
+            "check_seconds": self.check_seconds,
+            "loads": {labels["reason"]: int(value) for labels, value in REGISTRY_LOADS.samples()},
+        }
+
+
+category_registry = CategoryRegistry(settings.CATEGORY_REGISTRY_CHECK_SECONDS)
@@ -0,0 +1,50 @@
+from typing import Dict, Iterable, Sequence
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.models.data_version import DataVersion
+
+ALL_SCOPE = "all"
+CATEGORIES_SCOPE = "categories"
+
+
+def user_scope(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+class DataVersions:
+    """Per-scope version counters stored in the database, shared by every worker.
+
+    Writers bump the scopes they touched right after committing; readers
+    fetch the versions before reading the data, so a response is never
+    labelled with a version newer than its data. A missing scope is
+    version 0.
+    """
+
+    @staticmethod
+    def get(db: Session, scopes: Sequence[str]) -> Dict[str, int]:
+        rows = db.query(DataVersion.scope, DataVersion.version).filter(DataVersion.scope.in_(scopes)).all()
+        versions = dict(rows)
+        return {scope: versions.get(scope, 0) for scope in scopes}
+
+    @staticmethod
+    def bump(db: Session, scopes: Iterable[str]) -> None:
+        """Increment each scope's version and commit."""
+        # Sorted, so concurrent bumps lock the rows in the same order
+        values = [{"scope": scope, "version": 1} for scope in sorted(set(scopes))]
+        if not values:
+            return
+        stmt = insert(DataVersion).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["scope"],
+            set_={"version": DataVersion.version + 1, "updated_at": func.now()},
+        )
+        db.execute(stmt)
+        db.commit()
+
+    @staticmethod
+    def expenses_changed(db: Session, user_ids: Iterable[int]) -> None:
+        """Bump the versions of these users' expenses and of the manager-wide scope."""
+        scopes = [user_scope(user_id) for user_id in user_ids]
+        if scopes:
+            DataVersions.bump(db, scopes + [ALL_SCOPE])
@@ -0,0 +1,183 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, List, Optional, Sequence
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from app.core.config import settings
+from app.core.database import DbSession
+from app.models.category import Category
+from app.models.expense import Expense, ExpenseStatus
+from app.models.user import User
+
+FORMATS = ("csv", "ndjson", "parquet")
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+COLUMNS = (
+    "id", "title", "amount", "description", "date", "status", "user_id", "user_name",
+    "category_id", "category_name", "created_at", "updated_at",
+)
+
+
+def _plain(value: Any) -> Any:
+    """Row value as a CSV/JSON-friendly scalar."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, ExpenseStatus):
+        return value.value
+    return value
+
+
+def encode_csv(rows: Sequence[Sequence[Any]], header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(COLUMNS)
+    writer.writerows([_plain(value) for value in row] for row in rows)
+    return buffer.getvalue().encode()
+
+
+def encode_ndjson(rows: Sequence[Sequence[Any]], header: bool = False) -> bytes:
+    return "".join(
+        json.dumps(dict(zip(COLUMNS, (_plain(value) for value in row)))) + "\n" for row in rows
+    ).encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands out what was written since the last ``take``.
+
+    Lets the Parquet writer stream row groups out as they are finished; the
+    running position is kept so the footer offsets stay correct.
+    """
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def take(self) -> bytes:
+        data, self.chunks = b"".join(self.chunks), []
+        return data
+
+
+class ParquetEncoder:
+    """Encodes row batches as one Parquet file, one row group per batch."""
+
+    def __init__(self):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet export requires the 'pyarrow' package: pip install pyarrow") from e
+        self.pa, self.pq = pa, pq
+        self.schema = pa.schema([
+            ("id", pa.int64()), ("title", pa.string()), ("amount", pa.float64()),
+            ("description", pa.string()), ("date", pa.timestamp("us")), ("status", pa.string()),
+            ("user_id", pa.int64()), ("user_name", pa.string()), ("category_id", pa.int64()),
+            ("category_name", pa.string()), ("created_at", pa.timestamp("us", tz="UTC")),
+            ("updated_at", pa.timestamp("us", tz="UTC")),
+        ])
+        self.sink = _ChunkSink()
+        self.writer = pq.ParquetWriter(self.sink, self.schema, compression="snappy")
+
+    def __call__(self, rows: Sequence[Sequence[Any]], header: bool = False) -> bytes:
+        columns = list(zip(*rows)) if rows else [()] * len(COLUMNS)
+        status = COLUMNS.index("status")
+        columns[status] = [value.value if value is not None else None for value in columns[status]]
+        self.writer.write_table(self.pa.Table.from_arrays(
+            [self.pa.array(column, type=field.type) for column, field in zip(columns, self.schema)],
+            schema=self.schema,
+        ))
+        return self.sink.take()
+
+    def close(self) -> bytes:
+        self.writer.close()
+        return self.sink.take()
+
+
+def _tail(encode: Callable[..., bytes], sent: bool) -> List[bytes]:
+    """What follows the last batch: a bare CSV header if there were no rows, the Parquet footer."""
+    tail = [] if sent else [encode([], header=True)]
+    if isinstance(encode, ParquetEncoder):
+        tail.append(encode.close())
+    return tail
+
+
+def _encode_batches(batches: Iterable[Sequence[Sequence[Any]]], encode: Callable[..., bytes]) -> Iterator[bytes]:
+    sent = False
+    for rows in batches:
+        yield encode(rows, header=not sent)
+        sent = True
+    yield from _tail(encode, sent)
+
+
+class ExpenseExportService:
+    @staticmethod
+    def export_query(
+        user_id: Optional[int] = None, status: Optional[ExpenseStatus] = None,
+        category_id: Optional[int] = None, date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None
+    ):
+        """SELECT of every export column, filtered, in (date, id) order."""
+        query = select(
+            Expense.id, Expense.title, Expense.amount, Expense.description, Expense.date, Expense.status,
+            Expense.user_id, User.full_name, Expense.category_id, Category.name,
+            Expense.created_at, Expense.updated_at,
+        ).join(User, Expense.user_id == User.id).join(Category, Expense.category_id == Category.id)
+        if user_id is not None:
+            query = query.where(Expense.user_id == user_id)
+        if status is not None:
+            query = query.where(Expense.status == status)
+        if category_id is not None:
+            query = query.where(Expense.category_id == category_id)
+        if date_from is not None:
+            query = query.where(Expense.date >= date_from)
+        if date_to is not None:
+            query = query.where(Expense.date <= date_to)
+        return query.order_by(Expense.date, Expense.id)
+
+    @staticmethod
+    def encoder(fmt: str) -> Callable[..., bytes]:
+        """Batch encoder for ``fmt``; raises ImportError for Parquet without pyarrow."""
+        if fmt == "parquet":
+            return ParquetEncoder()
+        return encode_csv if fmt == "csv" else encode_ndjson
+
+    @staticmethod
+    async def stream(db: DbSession, query, encode: Callable[..., bytes]) -> AsyncIterator[bytes]:
+        """Encoded export, batch by batch, read through a server-side cursor.
+
+        Only ``EXPORT_BATCH_SIZE`` rows are in memory at a time. On a sync
+        Session the fetching and encoding run in the threadpool.
+        """
+        query = query.execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        if isinstance(db, AsyncSession):
+            result = await db.stream(query)
+            sent = False
+            async for rows in result.partitions():
+                yield encode(rows, header=not sent)
+                sent = True
+            for chunk in _tail(encode, sent):
+                yield chunk
+            return
+        result = await run_in_threadpool(db.execute, query)
+        async for chunk in iterate_in_threadpool(_encode_batches(result.partitions(), encode)):
+            yield chunk
+
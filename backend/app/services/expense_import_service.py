@@ -0,0 +1,271 @@
+import csv
+import io
+import json
+import logging
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import IO, Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.expense import Expense, ExpenseStatus
+from app.models.user import User
+from app.schemas.expense import ExpenseImportRow
+from app.services.analytics_cache import analytics_cache
+from app.services.category_registry import category_registry
+from app.services.data_versions import DataVersions
+from app.services.rollup_service import RollupService
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("csv", "ndjson")
+
+
+class UnreadableInput(NamedTuple):
+    """Marks where the file stopped being readable; nothing after it is imported."""
+    error: str
+
+
+# (line number, raw row, None when the line is not a JSON object, or UnreadableInput)
+RawRow = Tuple[int, Union[Dict[str, Any], None, UnreadableInput]]
+
+COPY_COLUMNS = ("title", "amount", "description", "date", "status", "user_id", "category_id")
+
+
+class _Lines:
+    """A text file's lines, counted, rejecting any that are not valid UTF-8.
+
+    Invalid bytes fail either while decoding (strict files) or, for files
+    opened with ``errors="surrogateescape"``, on the line that holds them.
+    """
+
+    def __init__(self, file: IO[str]):
+        self.file = file
+        self.number = 0
+
+    def __iter__(self) -> "_Lines":
+        return self
+
+    def __next__(self) -> str:
+        line = next(self.file)
+        line.encode("utf-8")
+        self.number += 1
+        return line
+
+
+def read_rows(file: IO[str], fmt: str) -> Iterator[RawRow]:
+    """Stream (line, row) pairs from a CSV (with header) or NDJSON text file.
+
+    Invalid UTF-8 or malformed CSV ends the stream with an
+    ``UnreadableInput`` at the failing line, so the rows before it can
+    still be imported and the error reported.
+    """
+    lines = _Lines(file)
+    try:
+        if fmt == "csv":
+            reader = csv.DictReader(lines)
+            for row in reader:
+                # Empty cells mean "not given", not an empty string
+                yield reader.line_num, {key: value for key, value in row.items() if key and value not in ("", None)}
+            return
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield lines.number, row if isinstance(row, dict) else None
+    except UnicodeError:
+        yield lines.number + 1, UnreadableInput("Invalid UTF-8; this line and the rest of the file were not imported")
+    except csv.Error as e:
+        yield lines.number, UnreadableInput(f"Malformed CSV ({e}); this line and the rest of the file were not imported")
+
+
+def _chunks(rows: Iterable[RawRow], size: int) -> Iterator[List[RawRow]]:
+    chunk: List[RawRow] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class ExpenseImportService:
+    @staticmethod
+    def _category_lookup(db: Session) -> Tuple[Set[int], Dict[str, int]]:
+        """All category ids, and ids by lower-cased name."""
+        # Imports are rare; re-read the version rather than trust a snapshot up to check_seconds old
+        category_registry.invalidate()
+        categories = category_registry.snapshot(db).by_id
+        return set(categories), {entry.name.lower(): category_id for category_id, entry in categories.items()}
+
+    @staticmethod
+    def _known_users(db: Session, user_ids: Set[int], known: Set[int], unknown: Set[int]) -> None:
+        """Sort ``user_ids`` into ``known``/``unknown``, querying only ids not seen before."""
+        missing = user_ids - known - unknown
+        if not missing:
+            return
+        found = {row.id for row in db.query(User.id).filter(User.id.in_(missing))}
+        known |= found
+        unknown |= missing - found
+
+    @staticmethod
+    def _validate(
+        db: Session, chunk: List[RawRow], owner_id: int, any_user: bool,
+        categories: Tuple[Set[int], Dict[str, int]], known_users: Set[int], unknown_users: Set[int]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Split a chunk into insertable expense rows and per-line errors."""
+        category_ids, category_names = categories
+        parsed: List[Tuple[int, ExpenseImportRow]] = []
+        errors: List[Dict[str, Any]] = []
+        for line, raw in chunk:
+            if raw is None:
+                errors.append({"line": line, "errors": ["Not a JSON object"]})
+                continue
+            if isinstance(raw, UnreadableInput):
+                errors.append({"line": line, "errors": [raw.error]})
+                continue
+            try:
+                parsed.append((line, ExpenseImportRow.model_validate(raw)))
+            except ValidationError as e:
+                errors.append({"line": line, "errors": [
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+                ]})
+
+        if any_user:
+            ExpenseImportService._known_users(
+                db, {row.user_id for _, row in parsed if row.user_id is not None}, known_users, unknown_users
+            )
+
+        valid: List[Dict[str, Any]] = []
+        for line, row in parsed:
+            problems = []
+            category_id = row.category_id
+            if category_id is None and row.category is not None:
+                category_id = category_names.get(row.category.strip().lower())
+            if category_id is None:
+                problems.append(f"Unknown category: {row.category}" if row.category else "category or category_id is required")
+            elif category_id not in category_ids:
+                problems.append(f"Unknown category_id: {category_id}")
+
+            user_id = row.user_id if row.user_id is not None else owner_id
+            status = ExpenseStatus(row.status) if row.status else ExpenseStatus.PENDING
+            if not any_user and (user_id != owner_id or status != ExpenseStatus.PENDING):
+                problems.append("Only managers can import expenses for other users or with a status")
+            elif user_id in unknown_users:
+                problems.append(f"Unknown user_id: {user_id}")
+
+            if problems:
+                errors.append({"line": line, "errors": problems})
+                continue
+            valid.append({
+                "title": row.title,
+                "amount": row.amount,
+                "description": row.description or None,
+                "date": _naive_utc(row.date),
+                "status": status,
+                "user_id": user_id,
+                "category_id": category_id,
+            })
+        return valid, errors
+
+    @staticmethod
+    def _copy(db: Session, rows: List[Dict[str, Any]]) -> bool:
+        """Load rows with COPY when the driver supports it (psycopg2). Returns False otherwise."""
+        if db.get_bind().dialect.driver != "psycopg2":
+            return False
+        cursor = db.connection().connection.driver_connection.cursor()
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow((
+                row["title"], row["amount"], row["description"], row["date"].isoformat(),
+                # The enum column stores member names
+                row["status"].name, row["user_id"], row["category_id"],
+            ))
+        buffer.seek(0)
+        cursor.copy_expert(f"COPY expenses ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        return True
+
+    @staticmethod
+    def _insert(db: Session, rows: List[Dict[str, Any]]) -> None:
+        """Insert one chunk and its rollup deltas in the current transaction (does not commit)."""
+        if not ExpenseImportService._copy(db, rows):
+            db.execute(insert(Expense), rows)
+
+        buckets: Dict[tuple, List[float]] = defaultdict(lambda: [0.0, 0])
+        for row in rows:
+            bucket = buckets[(row["user_id"], row["category_id"], row["status"], RollupService.month_of(row["date"]))]
+            bucket[0] += row["amount"]
+            bucket[1] += 1
+        for (user_id, category_id, status, month), (amount, count) in buckets.items():
+            RollupService.apply_delta(
+                db, user_id, category_id, status, datetime.combine(month, datetime.min.time()), amount, count
+            )
+
+    @staticmethod
+    def import_rows(
+        db: Session, rows: Iterable[RawRow], owner_id: int, any_user: bool = False,
+        chunk_size: Optional[int] = None, max_errors: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Validate and insert rows chunk by chunk, one transaction per chunk.
+
+        Invalid rows are reported (up to ``max_errors``) and skipped; the rest
+        of their chunk is still imported. An unreadable stretch of the file
+        ends the import with an error at that line. ``owner_id`` owns rows without a
+        ``user_id``; only with ``any_user`` may rows name another user or a
+        status other than pending.
+        """
+        chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+        max_errors = settings.IMPORT_MAX_ERRORS if max_errors is None else max_errors
+        categories = ExpenseImportService._category_lookup(db)
+        known_users, unknown_users = {owner_id}, set()
+        imported = failed = 0
+        errors: List[Dict[str, Any]] = []
+
+        for chunk in _chunks(rows, chunk_size):
+            valid, chunk_errors = ExpenseImportService._validate(
+                db, chunk, owner_id, any_user, categories, known_users, unknown_users
+            )
+            if valid:
+                try:
+                    ExpenseImportService._insert(db, valid)
+                    db.commit()
+                except Exception as e:
+                    # Earlier chunks stay committed; report this one and carry on
+                    db.rollback()
+                    logger.warning("Import chunk starting at line %d failed: %s", chunk[0][0], e)
+                    lines = sorted({line for line, _ in chunk} - {error["line"] for error in chunk_errors})
+                    chunk_errors += [{"line": line, "errors": [f"Insert failed: {type(e).__name__}"]} for line in lines]
+                    valid = []
+                else:
+                    user_ids = {row["user_id"] for row in valid}
+                    for user_id in user_ids:
+                        analytics_cache.invalidate(user_id)
+                    DataVersions.expenses_changed(db, user_ids)
+            chunk_errors.sort(key=lambda error: error["line"])
+            imported += len(valid)
+            failed += len(chunk_errors)
+            errors.extend(chunk_errors[:max(0, max_errors - len(errors))])
+
+        return {"imported": imported, "failed": failed, "errors": errors, "errors_truncated": failed > len(errors)}
+
+    @staticmethod
+    def import_file(
+        db: Session, file: IO[str], fmt: str, owner_id: int, any_user: bool = False,
+        chunk_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Stream-parse a CSV or NDJSON text file and import it (see ``import_rows``)."""
+        return ExpenseImportService.import_rows(
+            db, read_rows(file, fmt), owner_id, any_user=any_user, chunk_size=chunk_size
+        )
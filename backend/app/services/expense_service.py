@@ -1,13 +1,64 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, select, tuple_, update
 from app.models.expense import Expense, ExpenseStatus
 from app.models.user import User, UserRole
-from app.schemas.expense import ExpenseCreate, ExpenseUpdate
-from typing import List, Optional
+from app.schemas.expense import ExpenseCreate, ExpenseUpdate, ExpenseStatusFilter
+from app.services.rollup_service import RollupService
+from app.services.analytics_cache import analytics_cache
+from app.services.category_registry import category_registry
+from app.services.data_versions import DataVersions
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 
 
 class ExpenseService:
+    @staticmethod
+    def _with_names(query, include_user: bool = True):
+        """Eager-load category (and optionally user) in the same SELECT.
+
+        Responses read ``expense.category.name`` and ``expense.user.full_name``
+        for every row; without this each row triggers two lazy SELECTs.
+        """
+        query = query.options(joinedload(Expense.category, innerjoin=True))
+        if include_user:
+            query = query.options(joinedload(Expense.user, innerjoin=True))
+        return query
+    
+    @staticmethod
+    def _list_rows(db: Session):
+        """Column query for list responses, shaped like ExpenseResponse minus category_name.
+
+        Returns plain rows instead of ORM objects, so large lists skip
+        identity-map hydration and can be serialized without validation.
+        Category names come from the category registry (see ``_named``).
+        """
+        return db.query(
+            Expense.title, Expense.amount, Expense.description, Expense.date, Expense.category_id,
+            Expense.id, Expense.status, Expense.user_id, Expense.created_at, Expense.updated_at,
+            User.full_name.label("user_name"),
+        ).join(User, Expense.user_id == User.id)
+    
+    @staticmethod
+    def _named(db: Session, rows: List[Row]) -> List[Dict[str, Any]]:
+        """List rows as dicts with ``category_name`` filled in from the category registry."""
+        names = category_registry.names(db, {row.category_id for row in rows})
+        return [{**row._asdict(), "category_name": names.get(row.category_id, category_registry.UNKNOWN_NAME)} for row in rows]
+    
+    @staticmethod
+    def _paginate(query, skip: int, limit: int, after: Optional[Tuple[datetime, int]]) -> List[Any]:
+        """Order newest first by (date, id) and apply keyset or offset paging.
+
+        ``after`` is the (date, id) of the last row of the previous page; when
+        given, the page is found with an index seek instead of OFFSET.
+        """
+        if after is not None:
+            query = query.filter(tuple_(Expense.date, Expense.id) < tuple_(*after))
+        query = query.order_by(Expense.date.desc(), Expense.id.desc())
+        if after is None and skip:
+            query = query.offset(skip)
+        return query.limit(limit).all()
+    
     @staticmethod
     def create_expense(db: Session, expense: ExpenseCreate, user_id: int) -> Expense:
         """Create a new expense."""
@@ -21,48 +72,142 @@ class ExpenseService:
             status=ExpenseStatus.PENDING
         )
         db.add(db_expense)
+        db.flush()
+        RollupService.record_created(db, db_expense)
         db.commit()
+        analytics_cache.invalidate(user_id)
+        DataVersions.expenses_changed(db, [user_id])
         db.refresh(db_expense)
         return db_expense
     
     @staticmethod
-    def get_user_expenses(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[Expense]:
-        """Get expenses for a specific user."""
-        return db.query(Expense).filter(Expense.user_id == user_id).offset(skip).limit(limit).all()
+    def get_user_expenses(
+        db: Session, user_id: int, skip: int = 0, limit: int = 100,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[Dict[str, Any]]:
+        """Get expenses for a specific user, as list dicts."""
+        query = ExpenseService._list_rows(db).filter(Expense.user_id == user_id)
+        return ExpenseService._named(db, ExpenseService._paginate(query, skip, limit, after))
     
     @staticmethod
-    def get_all_expenses(db: Session, skip: int = 0, limit: int = 100) -> List[Expense]:
-        """Get all expenses (for managers)."""
-        return db.query(Expense).offset(skip).limit(limit).all()
+    def get_all_expenses(
+        db: Session, skip: int = 0, limit: int = 100,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[Dict[str, Any]]:
+        """Get all expenses (for managers), as list dicts."""
+        query = ExpenseService._list_rows(db)
+        return ExpenseService._named(db, ExpenseService._paginate(query, skip, limit, after))
     
     @staticmethod
     def get_expense_by_id(db: Session, expense_id: int) -> Optional[Expense]:
-        """Get expense by ID."""
-        return db.query(Expense).filter(Expense.id == expense_id).first()
+        """Get expense by ID, with ``category_name`` and ``user_name`` set for the response."""
+        expense = db.query(Expense).options(joinedload(Expense.user, innerjoin=True)).filter(
+            Expense.id == expense_id
+        ).first()
+        if expense:
+            expense.category_name = category_registry.get(db, expense.category_id).name
+            expense.user_name = expense.user.full_name
+        return expense
     
     @staticmethod
     def update_expense_status(db: Session, expense_id: int, status: ExpenseStatus, manager_id: int) -> Optional[Expense]:
         """Update expense status (approve/reject)."""
-        expense = db.query(Expense).filter(Expense.id == expense_id).first()
+        expense = db.query(Expense).filter(Expense.id == expense_id).with_for_update().first()
         if expense:
+            old_status = expense.status
             expense.status = status
+            RollupService.record_status_change(db, expense, old_status)
             db.commit()
+            analytics_cache.invalidate(expense.user_id)
+            DataVersions.expenses_changed(db, [expense.user_id])
             db.refresh(expense)
         return expense
     
+    @staticmethod
+    def _status_filter_criteria(filters: ExpenseStatusFilter) -> list:
+        criteria = [Expense.status == filters.status]
+        if filters.category_id is not None:
+            criteria.append(Expense.category_id == filters.category_id)
+        if filters.user_id is not None:
+            criteria.append(Expense.user_id == filters.user_id)
+        if filters.min_amount is not None:
+            criteria.append(Expense.amount >= filters.min_amount)
+        if filters.max_amount is not None:
+            criteria.append(Expense.amount <= filters.max_amount)
+        if filters.date_from is not None:
+            criteria.append(Expense.date >= filters.date_from)
+        if filters.date_to is not None:
+            criteria.append(Expense.date <= filters.date_to)
+        return criteria
+    
+    @staticmethod
+    def bulk_update_status(
+        db: Session, status: ExpenseStatus, ids: Optional[List[int]] = None,
+        filters: Optional[ExpenseStatusFilter] = None
+    ) -> Dict[str, Any]:
+        """Set the status of many expenses in one UPDATE ... RETURNING.
+
+        Expenses are chosen by ``ids`` or by ``filters``. Rows already in
+        ``status`` are left alone; listed ids that were not changed are
+        reported as skipped with the reason.
+        """
+        criteria = [Expense.id.in_(ids)] if ids is not None else ExpenseService._status_filter_criteria(filters)
+        # Lock the matched rows and remember their old status for the rollups
+        old = select(Expense.id, Expense.status.label("old_status")).where(
+            Expense.status != status, *criteria
+        ).with_for_update().subquery()
+        changed = db.execute(
+            update(Expense)
+            .where(Expense.id == old.c.id)
+            .values(status=status, updated_at=func.now())
+            .returning(Expense.id, Expense.user_id, Expense.category_id, Expense.date, Expense.amount, old.c.old_status)
+            .execution_options(synchronize_session=False)
+        ).all()
+        RollupService.record_status_changes(db, changed, status)
+        db.commit()
+        user_ids = {row.user_id for row in changed}
+        for user_id in user_ids:
+            analytics_cache.invalidate(user_id)
+        DataVersions.expenses_changed(db, user_ids)
+        
+        updated = sorted(row.id for row in changed)
+        skipped = []
+        if ids is not None:
+            rest = set(ids) - set(updated)
+            found = dict(db.query(Expense.id, Expense.status).filter(Expense.id.in_(rest)).all()) if rest else {}
+            skipped = [
+                {"id": expense_id, "reason": f"already {found[expense_id].value}" if expense_id in found else "not found"}
+                for expense_id in sorted(rest)
+            ]
+        return {"status": status, "updated": updated, "skipped": skipped}
+    
     @staticmethod
     def get_user_recent_expenses(db: Session, user_id: int, days: int = 30) -> List[Expense]:
         """Get recent expenses for a user (for AI analysis)."""
         cutoff_date = datetime.utcnow() - timedelta(days=days)
-        return db.query(Expense).filter(
+        query = ExpenseService._with_names(db.query(Expense), include_user=False)
+        return query.filter(
             Expense.user_id == user_id,
             Expense.date >= cutoff_date
         ).all()
     
     @staticmethod
-    def get_expenses_by_status(db: Session, status: ExpenseStatus, skip: int = 0, limit: int = 100) -> List[Expense]:
-        """Get expenses by status."""
-        return db.query(Expense).filter(Expense.status == status).offset(skip).limit(limit).all()
+    def get_user_recent_expense_versions(db: Session, user_id: int, days: int = 30) -> List[Tuple[int, Optional[datetime]]]:
+        """Get (id, updated_at) of a user's recent expenses, to fingerprint AI inputs without loading them."""
+        cutoff_date = datetime.utcnow() - timedelta(days=days)
+        return db.query(Expense.id, Expense.updated_at).filter(
+            Expense.user_id == user_id,
+            Expense.date >= cutoff_date
+        ).order_by(Expense.id).all()
+    
+    @staticmethod
+    def get_expenses_by_status(
+        db: Session, status: ExpenseStatus, skip: int = 0, limit: int = 100,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[Dict[str, Any]]:
+        """Get expenses by status, as list dicts."""
+        query = ExpenseService._list_rows(db).filter(Expense.status == status)
+        return ExpenseService._named(db, ExpenseService._paginate(query, skip, limit, after))
     
     @staticmethod
     def get_expense_stats(db: Session, user_id: Optional[int] = None) -> dict:
@@ -0,0 +1,233 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Any, Optional
+
+import httpx
+from groq import Groq, AsyncGroq, APIConnectionError, APIStatusError, APITimeoutError
+from app.core.config import settings
+from app.core.metrics import Counter, Gauge, Histogram
+
+logger = logging.getLogger(__name__)
+
+LLM_LATENCY = Histogram(
+    "llm_request_seconds", "Latency of each Groq request attempt", ["operation", "outcome"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0),
+)
+LLM_ERRORS = Counter("llm_errors_total", "Failed Groq request attempts by kind", ["operation", "kind"])
+LLM_RETRIES = Counter("llm_retries_total", "Groq request attempts that were retried", ["operation"])
+LLM_CIRCUIT_STATE = Gauge("llm_circuit_state", "Groq circuit breaker state (0 closed, 1 half-open, 2 open)")
+
+# Statuses worth retrying: timeouts, conflicts, rate limits and server errors
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling Groq while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    After ``failure_threshold`` failed calls in a row the circuit opens and
+    calls fail fast. After ``reset_seconds`` one trial call is let through
+    (half-open); its success closes the circuit, its failure re-opens it.
+    """
+    CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self) -> bool:
+        """Whether a call may go out now (claims the single half-open trial if needed)."""
+        with self._lock:
+            state = self.state
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial_in_flight or self.failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    logger.warning("Groq circuit breaker opened after %d consecutive failures", self.failures)
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def abandon(self) -> None:
+        """Give back a half-open trial that says nothing about Groq's health
+        (cancelled before it finished, or rejected as a bad request)."""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+def _error_kind(exc: Exception) -> str:
+    if isinstance(exc, APITimeoutError):
+        return "timeout"
+    if isinstance(exc, APIConnectionError):
+        return "connection"
+    if isinstance(exc, APIStatusError):
+        return str(exc.status_code)
+    return type(exc).__name__
+
+
+def _retryable(exc: Exception) -> bool:
+    if isinstance(exc, (APITimeoutError, APIConnectionError)):
+        return True
+    return isinstance(exc, APIStatusError) and exc.status_code in RETRYABLE_STATUS
+
+
+class LLMClient:
+    """One long-lived Groq client per process, with timeouts, retries and a circuit breaker.
+
+    The underlying SDK clients (and their keep-alive connection pools) are
+    created on first use and shared by every request. The SDK's own retries
+    are disabled; failed attempts that are worth retrying are retried here
+    with full-jitter exponential backoff (honouring ``Retry-After``), up to
+    ``max_attempts``. Each call's final failure counts towards the breaker.
+    """
+
+    def __init__(
+        self, api_key: str, base_url: str = "", timeout: float = 30, max_attempts: int = 3,
+        backoff_seconds: float = 0.5, backoff_max_seconds: float = 8, breaker: Optional[CircuitBreaker] = None
+    ):
+        self.api_key = api_key
+        self.base_url = base_url or None
+        self.timeout = httpx.Timeout(timeout, connect=min(timeout, 5.0))
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_seconds = backoff_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.breaker = breaker or CircuitBreaker(5, 30)
+        self._sync_client = None
+        self._async_client = None
+        self._lock = threading.Lock()
+
+    @property
+    def sync_client(self) -> Groq:
+        with self._lock:
+            if self._sync_client is None:
+                self._sync_client = Groq(api_key=self.api_key, base_url=self.base_url,
+                                         timeout=self.timeout, max_retries=0)
+            return self._sync_client
+
+    @property
+    def async_client(self) -> AsyncGroq:
+        with self._lock:
+            if self._async_client is None:
+                self._async_client = AsyncGroq(api_key=self.api_key, base_url=self.base_url,
+                                               timeout=self.timeout, max_retries=0)
+            return self._async_client
+
+    def _delay(self, attempt: int, exc: Exception) -> float:
+        delay = random.uniform(0, min(self.backoff_max_seconds, self.backoff_seconds * 2 ** attempt))
+        if isinstance(exc, APIStatusError):
+            retry_after = exc.response.headers.get("retry-after")
+            try:
+                delay = max(delay, min(float(retry_after), self.backoff_max_seconds))
+            except (TypeError, ValueError):
+                pass
+        return delay
+
+    def _before_attempt(self, operation: str) -> None:
+        if not self.breaker.allow():
+            LLM_ERRORS.inc(operation=operation, kind="circuit_open")
+            raise CircuitOpenError("Groq is unavailable (circuit open)")
+
+    def _after_failure(self, operation: str, attempt: int, exc: Exception, started: float) -> bool:
+        """Record a failed attempt; True if it should be retried."""
+        LLM_LATENCY.observe(time.perf_counter() - started, operation=operation, outcome="error")
+        LLM_ERRORS.inc(operation=operation, kind=_error_kind(exc))
+        # A failed half-open trial re-opens the circuit instead of retrying
+        retry = (_retryable(exc) and attempt + 1 < self.max_attempts
+                 and self.breaker.state == CircuitBreaker.CLOSED)
+        if _retryable(exc) and not retry:
+            self.breaker.record_failure()
+        elif not _retryable(exc):
+            # The request itself was bad: neither a failure nor a success for the breaker
+            self.breaker.abandon()
+        if retry:
+            LLM_RETRIES.inc(operation=operation)
+        return retry
+
+    def _after_success(self, operation: str, started: float) -> None:
+        LLM_LATENCY.observe(time.perf_counter() - started, operation=operation, outcome="ok")
+        self.breaker.record_success()
+
+    def create(self, operation: str, **kwargs) -> Any:
+        """``chat.completions.create`` on the sync client, with retries and the breaker."""
+        for attempt in range(self.max_attempts):
+            self._before_attempt(operation)
+            started = time.perf_counter()
+            try:
+                response = self.sync_client.chat.completions.create(**kwargs)
+            except Exception as e:
+                if not self._after_failure(operation, attempt, e, started):
+                    raise
+                time.sleep(self._delay(attempt, e))
+                continue
+            self._after_success(operation, started)
+            return response
+
+    async def acreate(self, operation: str, **kwargs) -> Any:
+        """``chat.completions.create`` on the async client, with retries and the breaker.
+
+        With ``stream=True`` only opening the stream is retried.
+        """
+        for attempt in range(self.max_attempts):
+            self._before_attempt(operation)
+            started = time.perf_counter()
+            try:
+                response = await self.async_client.chat.completions.create(**kwargs)
+            except Exception as e:
+                if not self._after_failure(operation, attempt, e, started):
+                    raise
+                await asyncio.sleep(self._delay(attempt, e))
+                continue
+            except BaseException:
+                self.breaker.abandon()
+                raise
+            self._after_success(operation, started)
+            return response
+
+
+def _create_default() -> LLMClient:
+    client = LLMClient(
+        api_key=settings.GROQ_API_KEY,
+        base_url=settings.GROQ_BASE_URL,
+        timeout=settings.AI_TIMEOUT_SECONDS,
+        max_attempts=settings.AI_MAX_ATTEMPTS,
+        backoff_seconds=settings.AI_RETRY_BACKOFF_SECONDS,
+        backoff_max_seconds=settings.AI_RETRY_BACKOFF_MAX_SECONDS,
+        breaker=CircuitBreaker(settings.AI_BREAKER_FAILURE_THRESHOLD, settings.AI_BREAKER_RESET_SECONDS),
+    )
+    states = {CircuitBreaker.CLOSED: 0, CircuitBreaker.HALF_OPEN: 1, CircuitBreaker.OPEN: 2}
+    LLM_CIRCUIT_STATE.set_function(lambda: states[client.breaker.state])
+    return client
+
+
+llm_client = _create_default()
@@ -0,0 +1,69 @@
+from datetime import datetime
+from app.core.cache import create_cache
+from app.core.config import settings
+from app.models.user import User, UserRole
+from typing import Any, Dict, Optional
+
+
+class PrincipalCache:
+    """Short-lived cache of authenticated users for ``get_current_user``.
+
+    Entries are keyed by user id and token version. Deactivating a user or
+    changing their role bumps the version (revoking older tokens) and deletes
+    the old entry. With the per-process memory backend, other workers may keep
+    serving the old entry until its TTL expires.
+    """
+    FIELDS = ("id", "email", "username", "full_name", "is_active", "token_version")
+
+    def __init__(self, backend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+
+    @staticmethod
+    def _key(user_id: int, token_version: int) -> str:
+        return f"principal:{user_id}:v{token_version}"
+
+    @staticmethod
+    def _dump(user: User) -> Dict[str, Any]:
+        data = {field: getattr(user, field) for field in PrincipalCache.FIELDS}
+        data["role"] = user.role.value
+        data["created_at"] = user.created_at.isoformat() if user.created_at else None
+        return data
+
+    @staticmethod
+    def _load(data: Dict[str, Any]) -> User:
+        """Rebuild a detached User; it is never attached to a session."""
+        values = dict(data)
+        values["role"] = UserRole(values["role"])
+        if values["created_at"]:
+            values["created_at"] = datetime.fromisoformat(values["created_at"])
+        return User(**values)
+
+    def get(self, user_id: int, token_version: int) -> Optional[User]:
+        if not self.enabled:
+            return None
+        data = self.backend.get(self._key(user_id, token_version))
+        return self._load(data) if data is not None else None
+
+    def set(self, user: User) -> None:
+        if self.enabled:
+            self.backend.set(self._key(user.id, user.token_version), self._dump(user))
+
+    def invalidate(self, user_id: int, token_version: int) -> None:
+        """Drop the entry for one token version of a user."""
+        if self.enabled:
+            self.backend.delete(self._key(user_id, token_version))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": self.enabled, **self.backend.stats_dict()}
+
+
+principal_cache = PrincipalCache(
+    create_cache(
+        settings.CACHE_BACKEND,
+        max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+        redis_url=settings.REDIS_URL,
+    ),
+    enabled=settings.PRINCIPAL_CACHE_ENABLED,
+)
@@ -0,0 +1,116 @@
+import math
+import re
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from statistics import median
+from typing import Any, Callable, List, Optional, Tuple
+from app.models.expense import Expense
+
+CHARS_PER_TOKEN = 4
+
+# Row limits tried in order until the digest fits the token budget.
+ROW_LIMITS = (10, 6, 3, 1)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for Llama-style tokenizers (~4 characters per token)."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def merchant_of(expense: Expense) -> str:
+    """Best-effort merchant key: the first words of the title, without digits or punctuation."""
+    words = re.sub(r"[^a-z& ]+", " ", expense.title.lower()).split()
+    return " ".join(words[:3]) or "unknown"
+
+
+def week_of(expense: Expense) -> date:
+    """Monday of the week the expense falls in."""
+    day = expense.date.date() if isinstance(expense.date, datetime) else expense.date
+    return day - timedelta(days=day.weekday())
+
+
+def _totals(expenses: List[Expense], key: Callable[[Expense], Any]) -> List[Tuple[Any, float, int]]:
+    """(key, total amount, count) per group, largest total first."""
+    groups = defaultdict(lambda: [0.0, 0])
+    for expense in expenses:
+        group = groups[key(expense)]
+        group[0] += float(expense.amount)
+        group[1] += 1
+    return sorted(((k, total, count) for k, (total, count) in groups.items()), key=lambda row: -row[1])
+
+
+def _clip(text: str, length: int = 60) -> str:
+    return text if len(text) <= length else text[:length - 1] + "…"
+
+
+class ExpenseDigest:
+    """Compact, size-bounded summary of a list of expenses for LLM prompts.
+
+    Expenses are aggregated by category, week and merchant, and the largest
+    outliers (amount relative to their category's median) are kept verbatim.
+    The rendered text has a fixed number of rows, so its size does not grow
+    with the number of expenses.
+    """
+
+    def __init__(self, expenses: List[Expense], top_outliers: int = 5):
+        self.count = len(expenses)
+        self.total = sum(float(expense.amount) for expense in expenses)
+        self.start = min(expense.date for expense in expenses) if expenses else None
+        self.end = max(expense.date for expense in expenses) if expenses else None
+        self.categories = _totals(expenses, lambda expense: expense.category.name)
+        self.weeks = sorted(_totals(expenses, week_of), key=lambda row: row[0], reverse=True)
+        self.merchants = _totals(expenses, merchant_of)
+        self.outliers = self._outliers(expenses, top_outliers)
+
+    @staticmethod
+    def _outliers(expenses: List[Expense], top: int) -> List[Tuple[Expense, float]]:
+        """The ``top`` expenses with the highest amount / category median ratio."""
+        amounts = defaultdict(list)
+        for expense in expenses:
+            amounts[expense.category_id].append(float(expense.amount))
+        medians = {category_id: median(values) for category_id, values in amounts.items()}
+        scored = [
+            (expense, float(expense.amount) / medians[expense.category_id] if medians[expense.category_id] else 1.0)
+            for expense in expenses
+        ]
+        scored.sort(key=lambda item: (item[1], float(item[0].amount)), reverse=True)
+        return scored[:top]
+
+    @staticmethod
+    def _rows(title: str, rows: List[Tuple[Any, float, int]], limit: int, rest_label: str) -> List[str]:
+        lines = [title]
+        for key, total, count in rows[:limit]:
+            lines.append(f"- {key}: ${total:.2f} ({count})")
+        rest = rows[limit:]
+        if rest:
+            lines.append(f"- {len(rest)} {rest_label}: ${sum(r[1] for r in rest):.2f} ({sum(r[2] for r in rest)})")
+        return lines
+
+    def render(self, limit: int = ROW_LIMITS[0], outliers: Optional[int] = None) -> str:
+        """Render the digest with at most ``limit`` rows per breakdown."""
+        if not self.count:
+            return "No expenses."
+        lines = [
+            f"Period: {self.start:%Y-%m-%d} to {self.end:%Y-%m-%d}",
+            f"Total: ${self.total:.2f} across {self.count} expenses (average ${self.total / self.count:.2f})",
+        ]
+        lines += self._rows("By category, total (count):", self.categories, limit, "other categories")
+        lines += self._rows("By week starting, newest first:", self.weeks, limit, "earlier weeks")
+        lines += self._rows("By merchant, total (count):", self.merchants, limit, "other merchants")
+        shown = self.outliers[:limit if outliers is None else outliers]
+        if shown:
+            lines.append("Largest outliers (amount vs category median):")
+            for expense, ratio in shown:
+                lines.append(
+                    f'- {expense.date:%Y-%m-%d} "{_clip(expense.title)}" {expense.category.name} '
+                    f"${float(expense.amount):.2f} ({ratio:.1f}x median)"
+                )
+        return "\n".join(lines)
+
+    def fit(self, token_budget: int) -> str:
+        """Render with the most detail that fits ``token_budget`` tokens (the 1-row form if none does)."""
+        for limit in ROW_LIMITS:
+            text = self.render(limit)
+            if estimate_tokens(text) <= token_budget:
+                return text
+        return self.render(ROW_LIMITS[-1], outliers=0)
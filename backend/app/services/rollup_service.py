@@ -0,0 +1,126 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from app.models.expense import Expense, ExpenseStatus
+from app.models.expense_rollup import ExpenseMonthlyRollup
+from collections import defaultdict
+from typing import Iterable, List, Dict, Any
+from datetime import date, datetime
+
+
+class RollupService:
+    @staticmethod
+    def month_of(value: datetime) -> date:
+        """Return the first day of the month ``value`` falls in."""
+        return value.date().replace(day=1)
+
+    @staticmethod
+    def apply_delta(
+        db: Session, user_id: int, category_id: int, status: ExpenseStatus,
+        expense_date: datetime, amount: float, count: int
+    ) -> None:
+        """Add ``amount``/``count`` to one rollup bucket (does not commit)."""
+        stmt = insert(ExpenseMonthlyRollup).values(
+            user_id=user_id,
+            category_id=category_id,
+            status=status,
+            month=RollupService.month_of(expense_date),
+            total_amount=amount,
+            count=count
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "category_id", "status", "month"],
+            set_={
+                "total_amount": ExpenseMonthlyRollup.total_amount + stmt.excluded.total_amount,
+                "count": ExpenseMonthlyRollup.count + stmt.excluded.count,
+            }
+        )
+        db.execute(stmt)
+
+    @staticmethod
+    def record_created(db: Session, expense: Expense) -> None:
+        """Account for a newly inserted expense."""
+        RollupService.apply_delta(
+            db, expense.user_id, expense.category_id, expense.status,
+            expense.date, expense.amount, 1
+        )
+
+    @staticmethod
+    def record_status_change(db: Session, expense: Expense, old_status: ExpenseStatus) -> None:
+        """Move an expense from its old status bucket to its current one."""
+        if old_status == expense.status:
+            return
+        RollupService.apply_delta(
+            db, expense.user_id, expense.category_id, old_status,
+            expense.date, -expense.amount, -1
+        )
+        RollupService.record_created(db, expense)
+
+    @staticmethod
+    def record_status_changes(db: Session, rows: Iterable[Any], new_status: ExpenseStatus) -> None:
+        """Move many expenses to ``new_status`` with one delta per touched bucket.
+
+        ``rows`` carry ``user_id``, ``category_id``, ``date``, ``amount`` and
+        ``old_status`` (e.g. from UPDATE ... RETURNING).
+        """
+        deltas: Dict[tuple, List[float]] = defaultdict(lambda: [0.0, 0])
+        for row in rows:
+            if row.old_status == new_status:
+                continue
+            month = RollupService.month_of(row.date)
+            for status, sign in ((row.old_status, -1), (new_status, 1)):
+                delta = deltas[(row.user_id, row.category_id, status, month)]
+                delta[0] += sign * row.amount
+                delta[1] += sign
+        for (user_id, category_id, status, month), (amount, count) in deltas.items():
+            RollupService.apply_delta(
+                db, user_id, category_id, status, datetime.combine(month, datetime.min.time()), amount, count
+            )
+
+    @staticmethod
+    def _raw_rollups_sql() -> str:
+        return """
+            SELECT user_id, category_id, status, date_trunc('month', date)::date AS month,
+                   sum(amount) AS total_amount, count(*) AS count
+            FROM expenses
+            GROUP BY user_id, category_id, status, date_trunc('month', date)::date
+        """
+
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        """Recompute every rollup row from raw expenses. Returns rows written.
+
+        The rollup table is locked first so concurrent expense writes wait and
+        then apply their deltas on top of the rebuilt totals.
+        """
+        db.execute(text("LOCK TABLE expense_monthly_rollups IN EXCLUSIVE MODE"))
+        db.execute(text("DELETE FROM expense_monthly_rollups"))
+        result = db.execute(text(
+            "INSERT INTO expense_monthly_rollups (user_id, category_id, status, month, total_amount, count) "
+            + RollupService._raw_rollups_sql()
+        ))
+        db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def verify(db: Session, tolerance: float = 0.005) -> List[Dict[str, Any]]:
+        """Compare rollups with raw expenses and return every bucket that drifted."""
+        rows = db.execute(text(f"""
+            WITH raw AS ({RollupService._raw_rollups_sql()})
+            SELECT coalesce(r.user_id, x.user_id) AS user_id,
+                   coalesce(r.category_id, x.category_id) AS category_id,
+                   coalesce(r.status, x.status) AS status,
+                   coalesce(r.month, x.month) AS month,
+                   coalesce(x.total_amount, 0) AS expected_amount,
+                   coalesce(r.total_amount, 0) AS rollup_amount,
+                   coalesce(x.count, 0) AS expected_count,
+                   coalesce(r.count, 0) AS rollup_count
+            FROM expense_monthly_rollups r
+            FULL OUTER JOIN raw x
+              ON r.user_id = x.user_id AND r.category_id = x.category_id
+             AND r.status = x.status AND r.month = x.month
+            WHERE coalesce(r.count, 0) <> coalesce(x.count, 0)
+               OR abs(coalesce(r.total_amount, 0) - coalesce(x.total_amount, 0)) > :tolerance
+            ORDER BY 1, 2, 3, 4
+        """), {"tolerance": tolerance})
+        return [dict(row._mapping) for row in rows]
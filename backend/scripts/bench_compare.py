@@ -0,0 +1,56 @@
+"""Diff two ``scripts.bench_suite`` result files and flag regressions.
+
+Cases present in both files are compared by median, per scale, slowest
+ratio first. A case counts as a regression when NEW/BASE exceeds
+``--threshold`` and it got at least ``--min-ms`` slower; the exit status is
+non-zero if there is any. Differences in database, seed, user count or end
+date between the runs are reported as warnings.
+
+    python -m scripts.bench_compare bench-results/OLD.json bench-results/NEW.json --threshold 1.2
+"""
+import argparse
+import json
+import sys
+
+
+def compare(base_path: str, new_path: str, threshold: float, min_ms: float) -> int:
+    """Print per-case median ratios (new/base); 1 if any case regressed beyond ``threshold``."""
+    with open(base_path) as f:
+        base = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    for key in ("database", "end", "seed", "users"):
+        if base["meta"].get(key) != new["meta"].get(key):
+            print(f"warning: {key} differs ({base['meta'].get(key)} vs {new['meta'].get(key)})")
+    regressions = 0
+    for scale in (scale for scale in new["scales"] if scale in base["scales"]):
+        print(f"== {int(scale):,} expenses")
+        old_results, new_results = base["scales"][scale]["results"], new["scales"][scale]["results"]
+        rows = []
+        for name in (name for name in new_results if name in old_results):
+            old, current = old_results[name].get("median_ms"), new_results[name].get("median_ms")
+            if old is None or current is None:
+                continue
+            ratio = current / old if old else float("inf")
+            regressed = ratio > threshold and current - old > min_ms
+            regressions += regressed
+            rows.append((ratio, name, old, current, regressed))
+        for ratio, name, old, current, regressed in sorted(rows, reverse=True):
+            flag = "  REGRESSION" if regressed else ""
+            print(f"  {name:<58} {old:10.2f} -> {current:10.2f} ms  {ratio:5.2f}x{flag}")
+    print(f"{regressions} regression(s) over {threshold:.2f}x")
+    return 1 if regressions else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("base", help="results of the reference commit")
+    parser.add_argument("new", help="results to check")
+    parser.add_argument("--threshold", type=float, default=1.25, help="median ratio counted as a regression")
+    parser.add_argument("--min-ms", type=float, default=0.5, help="ignore slowdowns smaller than this")
+    args = parser.parse_args()
+    return compare(args.base, args.new, threshold=args.threshold, min_ms=args.min_ms)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
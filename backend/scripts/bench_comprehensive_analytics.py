@@ -0,0 +1,154 @@
+"""Compare the per-section and GROUPING SETS comprehensive analytics paths.
+
+"before" rebuilds the response the way get_comprehensive_analytics used to:
+one query over raw expenses each for sum, count, categories, trends, status
+and recent expenses. "after" is the current implementation. Both are run
+for the busiest user and for the manager-wide (/analytics/all) scope, and
+their responses are checked for equality.
+
+Run it from ``backend/`` against a disposable, migrated database:
+
+    python -m scripts.bench_comprehensive_analytics --seed 2000000 --runs 20
+"""
+import argparse
+import statistics
+import sys
+import time
+from typing import Any, Callable, List, Optional
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session, contains_eager
+
+from app.core.database import SessionLocal
+from app.models.category import Category
+from app.models.expense import Expense
+from app.schemas.analytics import AnalyticsResponse, CategoryBreakdown, MonthlyTrend
+from app.services.analytics_service import AnalyticsService, TREND_MONTHS
+from scripts.check_query_plans import seed
+
+
+def before(db: Session, user_id: Optional[int] = None) -> AnalyticsResponse:
+    """The original multi-query implementation, over raw expenses.
+
+    The queries are inlined because the AnalyticsService section methods now
+    read the rollup table. The trend window starts on the first day of the
+    month, as the current implementation's does, so the responses compare.
+    """
+    def scoped(query):
+        return query.filter(Expense.user_id == user_id) if user_id else query
+
+    query = scoped(db.query(Expense))
+    total_amount = query.with_entities(func.sum(Expense.amount)).scalar() or 0
+    total_count = query.count()
+
+    categories = scoped(db.query(
+        Category.name,
+        func.sum(Expense.amount).label('total_amount'),
+        func.count(Expense.id).label('count')
+    ).join(Expense, Category.id == Expense.category_id)).group_by(Category.name).all()
+    category_total = sum(row.total_amount for row in categories)
+    top_categories = sorted((
+        CategoryBreakdown(
+            category_name=row.name,
+            total_amount=float(row.total_amount),
+            percentage=round(row.total_amount / category_total * 100, 2) if category_total > 0 else 0,
+            count=row.count
+        ) for row in categories
+    ), key=lambda x: x.total_amount, reverse=True)
+
+    month = func.date_trunc('month', Expense.date)
+    trends = scoped(db.query(
+        month.label('month'),
+        func.sum(Expense.amount).label('total_amount'),
+        func.count(Expense.id).label('count')
+    ).filter(Expense.date >= AnalyticsService._trend_start(TREND_MONTHS))).group_by(month).order_by(month).all()
+
+    statuses = scoped(db.query(Expense.status, func.count(Expense.id))).group_by(Expense.status).all()
+
+    recent = scoped(
+        db.query(Expense).join(Expense.category).options(contains_eager(Expense.category))
+    ).order_by(Expense.created_at.desc()).limit(10).all()
+
+    return AnalyticsResponse(
+        total_expenses=float(total_amount),
+        total_count=total_count,
+        average_amount=float(total_amount / total_count if total_count > 0 else 0),
+        top_categories=top_categories,
+        monthly_trends=[
+            MonthlyTrend(month=row.month.strftime('%Y-%m'), total_amount=float(row.total_amount), count=row.count)
+            for row in trends
+        ],
+        status_breakdown={status.value: count for status, count in statuses},
+        recent_expenses=[{
+            "id": expense.id,
+            "title": expense.title,
+            "amount": float(expense.amount),
+            "category": expense.category.name,
+            "status": expense.status.value,
+            "date": expense.date.isoformat(),
+            "created_at": expense.created_at.isoformat()
+        } for expense in recent],
+    )
+
+
+def after(db: Session, user_id: Optional[int] = None) -> AnalyticsResponse:
+    return AnalyticsService.get_comprehensive_analytics(db, user_id)
+
+
+def normalized(response: AnalyticsResponse) -> Any:
+    """Response as plain data with floats rounded (sum order may differ between plans)."""
+    def walk(value):
+        if isinstance(value, float):
+            return round(value, 4)
+        if isinstance(value, dict):
+            return {key: walk(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [walk(item) for item in value]
+        return value
+    return walk(response.model_dump())
+
+
+def time_runs(db: Session, call: Callable[[], AnalyticsResponse], runs: int) -> List[float]:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - start) * 1000)
+        db.rollback()
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=0,
+                        help="ensure at least this many synthetic expenses exist first")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.seed:
+            seed(db, args.seed)
+        rows = db.execute(text("SELECT count(*) FROM expenses")).scalar()
+        busiest = db.execute(text(
+            "SELECT user_id FROM expenses GROUP BY user_id ORDER BY count(*) DESC LIMIT 1"
+        )).scalar()
+        print(f"{rows} expenses, {args.runs} runs per path (ms)")
+        print(f"{'scope':<12} {'path':<7} {'median':>9} {'p95':>9} {'min':>9}")
+
+        mismatches = 0
+        for scope, user_id in (("user", busiest), ("all", None)):
+            if normalized(before(db, user_id)) != normalized(after(db, user_id)):
+                mismatches += 1
+                print(f"MISMATCH: before/after responses differ for scope={scope}")
+            for name, path in (("before", before), ("after", after)):
+                timings = sorted(time_runs(db, lambda: path(db, user_id), args.runs))
+                p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+                print(f"{scope:<12} {name:<7} {statistics.median(timings):>9.1f} {p95:>9.1f} {timings[0]:>9.1f}")
+        return 1 if mismatches else 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
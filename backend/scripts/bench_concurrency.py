@@ -0,0 +1,131 @@
+"""Throughput of /ai/summary under many concurrent clients while the LLM is slow.
+
+The Groq clients are replaced with fakes that take ``--ai-latency`` seconds
+to answer, then ``--clients`` concurrent clients hammer two routes in-process
+(no network): the current async ``/ai/summary`` and a copy of the previous
+sync handler, which holds a threadpool slot for the whole Groq call. Run it
+once with ASYNC_DB=false and once with ASYNC_DB=true to compare DB modes.
+
+    python -m scripts.bench_concurrency --clients 500 --requests 2000 --ai-latency 2
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+from typing import List
+
+import httpx
+from fastapi import Depends
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import func
+
+from app.api.dependencies import security
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.security import verify_token
+from app.main import app
+from app.models.expense import Expense
+from app.models.user import User
+from app.services import ai_service, llm_client
+from app.services.auth_service import AuthService
+from app.services.expense_service import ExpenseService
+
+
+def fake_completion() -> SimpleNamespace:
+    message = SimpleNamespace(content="Spending looks healthy.")
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def install_fake_groq(latency: float) -> None:
+    """Swap the Groq clients for fakes that sleep ``latency`` seconds per call."""
+    class FakeCompletions:
+        def create(self, **kwargs):
+            time.sleep(latency)
+            return fake_completion()
+
+    class FakeAsyncCompletions:
+        async def create(self, **kwargs):
+            await asyncio.sleep(latency)
+            return fake_completion()
+
+    class FakeGroq:
+        def __init__(self, **kwargs):
+            self.chat = SimpleNamespace(completions=FakeCompletions())
+
+    class FakeAsyncGroq:
+        def __init__(self, **kwargs):
+            self.chat = SimpleNamespace(completions=FakeAsyncCompletions())
+
+    # The shared client creates its SDK clients lazily, on first use
+    llm_client.Groq = FakeGroq
+    llm_client.AsyncGroq = FakeAsyncGroq
+
+
+@app.post("/bench/legacy-summary")
+def legacy_summary(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """The pre-async handler shape: one sync session held across a blocking Groq call."""
+    db = SessionLocal()
+    try:
+        current_user = AuthService.get_user_by_id(db, verify_token(credentials.credentials)["user_id"])
+        expenses = ExpenseService.get_user_recent_expenses(db=db, user_id=current_user.id, days=30)
+        insights = ai_service.AIService().analyze_user_expenses(expenses, current_user.full_name)
+        return {"insights": insights, "total_expenses": len(expenses)}
+    finally:
+        db.close()
+
+
+async def run(path: str, headers: dict, clients: int, requests: int) -> List[float]:
+    """Issue ``requests`` POSTs to ``path`` from ``clients`` concurrent workers."""
+    latencies: List[float] = []
+    remaining = iter(range(requests))
+    transport = httpx.ASGITransport(app=app)
+
+    async def client_loop(client: httpx.AsyncClient) -> None:
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await client.post(path, json={"days": 30}, headers=headers)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        await asyncio.gather(*(client_loop(client) for _ in range(clients)))
+    return latencies
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--ai-latency", type=float, default=2.0, help="seconds per fake Groq call")
+    args = parser.parse_args()
+
+    install_fake_groq(args.ai_latency)
+    db = SessionLocal()
+    try:
+        user_id = db.query(Expense.user_id).group_by(Expense.user_id).order_by(
+            func.count(Expense.id).desc()
+        ).limit(1).scalar()
+        if user_id is None:
+            print("Need at least one user with expenses.", file=sys.stderr)
+            return 2
+        headers = {"Authorization": f"Bearer {AuthService.create_access_token_for_user(db.get(User, user_id))}"}
+    finally:
+        db.close()
+
+    print(f"ASYNC_DB={settings.ASYNC_DB}, {args.clients} clients, {args.requests} requests, "
+          f"AI latency {args.ai_latency:.1f}s")
+    for label, path in (("sync handler (legacy)", "/bench/legacy-summary"),
+                        ("async handler", f"{settings.API_V1_STR}/ai/summary")):
+        start = time.perf_counter()
+        latencies = sorted(asyncio.run(run(path, headers, args.clients, args.requests)))
+        elapsed = time.perf_counter() - start
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(f"{label:<22} {len(latencies) / elapsed:8.1f} req/s   "
+              f"p50 {statistics.median(latencies):6.2f}s   p99 {p99:6.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
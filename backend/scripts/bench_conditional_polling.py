@@ -0,0 +1,113 @@
+"""Replay frontend-style polling of the analytics and category endpoints with ETags.
+
+Each simulated user polls every endpoint once per round, sending back the
+ETag of its last 200 as ``If-None-Match`` the way a browser does. Every
+``--write-every`` polls one of the users records a new expense, which must
+turn that user's (and the manager-wide) next polls back into 200s. The
+report is the share of polls answered 304 and median latency of 200s vs 304s
+per endpoint.
+
+Run it from ``backend/`` against a disposable, migrated database (it creates
+expenses):
+
+    python -m scripts.bench_conditional_polling --users 20 --rounds 50 --write-every 25
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+
+from app.core.database import SessionLocal
+from app.main import app
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.user import User, UserRole
+from app.services.auth_service import AuthService
+
+API = "/api/v1"
+USER_ENDPOINTS = ("/analytics/monthly", "/analytics/categories", "/analytics/trends",
+                  "/analytics/status", "/analytics/recent", "/categories/")
+MANAGER_ENDPOINTS = ("/analytics/all",)
+
+
+def pollers(limit: int) -> Tuple[List[Tuple[User, Dict[str, str]]], List[int]]:
+    """The ``limit`` users with most expenses, with auth headers, and the category ids."""
+    db = SessionLocal()
+    try:
+        users = (
+            db.query(User).join(Expense, Expense.user_id == User.id).filter(User.is_active.is_(True))
+            .group_by(User.id).order_by(func.count(Expense.id).desc()).limit(limit).all()
+        )
+        category_ids = [row.id for row in db.query(Category.id)]
+        return [
+            (user, {"Authorization": "Bearer " + AuthService.create_access_token_for_user(user)})
+            for user in users
+        ], category_ids
+    finally:
+        db.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20, help="simulated polling users")
+    parser.add_argument("--rounds", type=int, default=50, help="polls of every endpoint per user")
+    parser.add_argument("--write-every", type=int, default=25, help="one new expense per this many polls (0: none)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    users, category_ids = pollers(args.users)
+    if not users or not category_ids:
+        print("Need users with expenses and at least one category", file=sys.stderr)
+        return 2
+    rng = random.Random(args.seed)
+    client = TestClient(app)
+    etags: Dict[Tuple[int, str], str] = {}
+    latencies: Dict[str, Dict[int, List[float]]] = defaultdict(lambda: defaultdict(list))
+    polls = writes = 0
+
+    for _ in range(args.rounds):
+        for user, headers in users:
+            endpoints = USER_ENDPOINTS + (MANAGER_ENDPOINTS if user.role == UserRole.MANAGER else ())
+            for endpoint in endpoints:
+                request_headers = dict(headers)
+                if (user.id, endpoint) in etags:
+                    request_headers["If-None-Match"] = etags[(user.id, endpoint)]
+                start = time.perf_counter()
+                response = client.get(API + endpoint, headers=request_headers)
+                elapsed = time.perf_counter() - start
+                if response.status_code not in (200, 304):
+                    print(f"{endpoint}: HTTP {response.status_code}", file=sys.stderr)
+                    return 1
+                latencies[endpoint][response.status_code].append(elapsed)
+                etags[(user.id, endpoint)] = response.headers["ETag"]
+                polls += 1
+
+                if args.write_every and polls % args.write_every == 0:
+                    _, writer_headers = rng.choice(users)
+                    client.post(API + "/expenses/", headers=writer_headers, json={
+                        "title": "Polling benchmark", "amount": round(rng.uniform(5, 500), 2),
+                        "date": datetime.utcnow().isoformat(), "category_id": rng.choice(category_ids),
+                    }).raise_for_status()
+                    writes += 1
+
+    print(f"{polls} polls, {writes} writes, {len(users)} users")
+    print(f"{'endpoint':<24}{'304 share':>10}{'200 ms':>10}{'304 ms':>10}")
+    not_modified = 0
+    for endpoint, by_status in latencies.items():
+        ok, cached = by_status.get(200, []), by_status.get(304, [])
+        not_modified += len(cached)
+        median = lambda samples: f"{statistics.median(samples) * 1000:.2f}" if samples else "-"
+        print(f"{endpoint:<24}{len(cached) / (len(ok) + len(cached)):>10.1%}{median(ok):>10}{median(cached):>10}")
+    print(f"{'overall':<24}{not_modified / polls:>10.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
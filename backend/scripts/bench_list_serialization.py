@@ -0,0 +1,100 @@
+"""Compare the ORM + pydantic and the lean column-row paths for expense list responses.
+
+"before" builds a page the way the list endpoints used to: ORM objects with
+eager-loaded category and user, ad-hoc ``category_name``/``user_name``
+attributes, validation into ``List[ExpenseResponse]`` and stdlib JSON, as
+FastAPI does for a ``response_model``. "after" is the current path: column
+rows rendered straight to JSON with orjson. Both bodies are checked for
+equality; the report is pages/s and rows/s per path.
+
+Run it from ``backend/`` against a disposable, migrated database:
+
+    python -m scripts.bench_list_serialization --seed 200000 --limit 1000 --runs 50
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from typing import Callable, List, Optional
+
+from pydantic import TypeAdapter
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.core.responses import FastJSONResponse
+from app.models.expense import Expense
+from app.schemas.expense import ExpenseResponse
+from app.services.expense_service import ExpenseService
+from scripts.check_query_plans import seed
+
+RESPONSE = TypeAdapter(List[ExpenseResponse])
+
+
+def before(db: Session, limit: int, user_id: Optional[int] = None) -> bytes:
+    """The original ORM-hydrating, model-validating list path."""
+    query = ExpenseService._with_names(db.query(Expense), include_user=user_id is None)
+    if user_id is not None:
+        query = query.filter(Expense.user_id == user_id)
+    expenses = ExpenseService._paginate(query, 0, limit, None)
+    for expense in expenses:
+        expense.category_name = expense.category.name
+        expense.user_name = expense.user.full_name
+    content = RESPONSE.dump_python(RESPONSE.validate_python(expenses, from_attributes=True), mode="json")
+    body = json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+    db.expunge_all()
+    return body
+
+
+def after(db: Session, limit: int, user_id: Optional[int] = None) -> bytes:
+    if user_id is not None:
+        rows = ExpenseService.get_user_expenses(db, user_id=user_id, limit=limit)
+    else:
+        rows = ExpenseService.get_all_expenses(db, limit=limit)
+    return FastJSONResponse(rows).body
+
+
+def timed(fn: Callable[[], bytes], runs: int) -> List[float]:
+    fn()  # warm up
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=0,
+                        help="top the database up to this many synthetic expenses first (PostgreSQL)")
+    parser.add_argument("--limit", type=int, default=1000, help="rows per page")
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.seed:
+            seed(db, args.seed)
+        user_id = db.query(Expense.user_id).group_by(Expense.user_id).order_by(func.count().desc()).limit(1).scalar()
+        ok = True
+        for scope, uid in (("/expenses/", None), ("/expenses/user", user_id)):
+            old, new = before(db, args.limit, uid), after(db, args.limit, uid)
+            same = json.loads(old) == json.loads(new)
+            ok &= same
+            rows = len(json.loads(new))
+            print(f"{scope} ({rows} rows per page){'' if same else '  MISMATCH'}")
+            results = {}
+            for name, fn in (("before", lambda: before(db, args.limit, uid)), ("after", lambda: after(db, args.limit, uid))):
+                median = statistics.median(timed(fn, args.runs))
+                results[name] = median
+                print(f"  {name:<7} {median * 1000:8.2f} ms/page  {rows / median:10,.0f} rows/s")
+            print(f"  speedup {results['before'] / results['after']:.1f}x")
+        return 0 if ok else 1
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
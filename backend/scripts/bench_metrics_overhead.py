@@ -0,0 +1,131 @@
+"""Measure the per-request cost of the request metrics middleware and SQL hooks.
+
+Two otherwise identical FastAPI apps with one trivial route (a path
+parameter, like most of the API) are driven through raw ASGI calls, one with
+``RequestMetricsMiddleware`` and one without, alternating in rounds; the
+overhead is the difference of the median per-request times. The SQL
+statement hooks are timed the same way on in-memory SQLite engines with and
+without them, per statement. The estimate for a request running
+``--statements`` queries is checked against ``--budget-us``.
+
+Needs no database; run it from ``backend/``:
+
+    python -m scripts.bench_metrics_overhead --requests 20000 --statements 5 --budget-us 50
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from typing import Callable, List
+
+from fastapi import FastAPI, Response
+from sqlalchemy import create_engine, text
+
+from app.core import request_metrics
+from app.core.request_metrics import RequestMetricsMiddleware, track_statements
+
+
+def build_app(with_metrics: bool) -> FastAPI:
+    app = FastAPI()
+    if with_metrics:
+        app.add_middleware(RequestMetricsMiddleware)
+
+    @app.get("/api/v1/items/{item_id}")
+    async def item(item_id: int):
+        return Response(b"ok", media_type="text/plain")
+
+    return app
+
+
+async def drive(app: FastAPI, requests: int) -> float:
+    """Seconds per request for ``requests`` sequential ASGI calls."""
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for i in range(requests):
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": f"/api/v1/items/{i}", "raw_path": f"/api/v1/items/{i}".encode(),
+            "query_string": b"", "root_path": "", "headers": [(b"host", b"bench")],
+            "client": ("127.0.0.1", 1), "server": ("bench", 80),
+        }
+        await app(scope, receive, send)
+    return (time.perf_counter() - start) / requests
+
+
+def middleware_overhead(requests: int, rounds: int) -> List[float]:
+    """Median seconds per request without and with the middleware."""
+    plain, instrumented = build_app(False), build_app(True)
+    results = {False: [], True: []}
+
+    async def run():
+        await drive(plain, 500)
+        await drive(instrumented, 500)
+        for _ in range(rounds):
+            results[False].append(await drive(plain, requests // rounds))
+            results[True].append(await drive(instrumented, requests // rounds))
+
+    asyncio.run(run())
+    return [statistics.median(results[False]), statistics.median(results[True])]
+
+
+def time_statements(execute: Callable[[], None], statements: int) -> float:
+    """Seconds per statement for ``statements`` sequential executions."""
+    start = time.perf_counter()
+    for _ in range(statements):
+        execute()
+    return (time.perf_counter() - start) / statements
+
+
+def statement_overhead(statements: int, rounds: int) -> List[float]:
+    """Median seconds per ``SELECT 1`` without and with the hooks (inside a request)."""
+    plain, tracked = create_engine("sqlite://"), create_engine("sqlite://")
+    track_statements(tracked)
+    token = request_metrics._request.set(request_metrics._RequestStats({}))
+    try:
+        with plain.connect() as plain_conn, tracked.connect() as tracked_conn:
+            run_plain = lambda: plain_conn.execute(text("SELECT 1")).scalar()
+            run_tracked = lambda: tracked_conn.execute(text("SELECT 1")).scalar()
+            time_statements(run_plain, 1000)
+            time_statements(run_tracked, 1000)
+            samples = {False: [], True: []}
+            for _ in range(rounds):
+                samples[False].append(time_statements(run_plain, statements // rounds))
+                samples[True].append(time_statements(run_tracked, statements // rounds))
+    finally:
+        request_metrics._request.reset(token)
+    return [statistics.median(samples[False]), statistics.median(samples[True])]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000, help="requests per app")
+    parser.add_argument("--rounds", type=int, default=20, help="alternating rounds the requests are split into")
+    parser.add_argument("--statements", type=int, default=5, help="SQL statements assumed per request")
+    parser.add_argument("--budget-us", type=float, default=50.0, help="allowed overhead per request (µs)")
+    args = parser.parse_args()
+
+    plain, instrumented = middleware_overhead(args.requests, args.rounds)
+    without, with_hooks = statement_overhead(args.requests, args.rounds)
+    per_request = (instrumented - plain) * 1e6
+    per_statement = (with_hooks - without) * 1e6
+    total = per_request + args.statements * per_statement
+
+    print(f"{'':<28}{'without µs':>12}{'with µs':>12}{'overhead µs':>13}")
+    print(f"{'request (trivial route)':<28}{plain * 1e6:>12.1f}{instrumented * 1e6:>12.1f}{per_request:>13.1f}")
+    print(f"{'SQL statement (SELECT 1)':<28}{without * 1e6:>12.1f}{with_hooks * 1e6:>12.1f}{per_statement:>13.1f}")
+    print(f"Estimated overhead for a request with {args.statements} statements: {total:.1f} µs "
+          f"(budget {args.budget_us:.0f} µs)")
+    if total > args.budget_us:
+        print("Over budget", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,349 @@
+"""Time every ExpenseService, AnalyticsService and AuthService method and every API route at several data sizes.
+
+For each scale in ``--scales`` the database is first topped up to that many
+expenses with ``scripts.generate_data`` (deterministic, so every commit is
+measured on the same rows). Each case is then called once to warm up and
+``--runs`` times more: service methods directly on a Session, routes through
+the ASGI app with a TestClient (auth, validation, serialization included).
+Analytics caching is switched off so analytics cases measure the queries.
+
+Results go to a JSON file: per scale and case the min/median/p95/mean in
+milliseconds, plus the git commit, database and parameters. Methods and
+routes without a case are listed under ``not_covered``. Diff two result
+files with ``scripts.bench_compare``.
+
+Run it from ``backend/`` against a disposable, migrated PostgreSQL database
+(it creates expenses, users and categories):
+
+    python -m scripts.bench_suite --scales 10000,1000000,10000000 --output bench-results/$(git rev-parse --short HEAD).json
+    python -m scripts.bench_compare bench-results/OLD.json bench-results/NEW.json
+
+AI routes call Groq; they are only included with ``--ai`` (point
+``GROQ_BASE_URL`` at ``scripts.fake_llm_server`` to leave Groq out of it).
+"""
+import argparse
+import asyncio
+import io
+import itertools
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.main import app
+from app.models.expense import Expense, ExpenseStatus
+from app.models.user import User, UserRole
+from app.schemas.expense import ExpenseCreate
+from app.schemas.user import UserCreate
+from app.services.analytics_cache import analytics_cache
+from app.services.analytics_service import AnalyticsService
+from app.services.auth_service import AuthService
+from app.services.expense_service import ExpenseService
+from scripts.generate_data import PASSWORD, generate, user_email
+
+API = settings.API_V1_STR
+SERVICES = (ExpenseService, AnalyticsService, AuthService)
+
+Case = Tuple[str, Callable[[], Any]]
+
+
+class Fixture:
+    """Users, ids and helpers shared by the cases at one scale."""
+
+    def __init__(self, db: Session, client: TestClient, end: datetime):
+        self.db = db
+        self.client = client
+        self.end = end
+        self.loop = asyncio.new_event_loop()
+        self.run = uuid.uuid4().hex[:8]
+        self.counter = itertools.count()
+        self.statuses = itertools.cycle((ExpenseStatus.APPROVED, ExpenseStatus.REJECTED))
+
+        busiest = db.query(Expense.user_id).join(User, User.id == Expense.user_id).filter(
+            User.role == UserRole.EMPLOYEE, User.email.like("bench-user-%")
+        ).group_by(Expense.user_id).order_by(func.count(Expense.id).desc()).limit(1).scalar()
+        self.employee = db.get(User, busiest)
+        self.manager = db.query(User).filter(User.email == user_email(0)).one()
+        own = db.query(Expense).filter(Expense.user_id == self.employee.id)
+        middle = own.order_by(Expense.date).offset(own.count() // 2).first()
+        self.expense_id, self.after = middle.id, (middle.date, middle.id)
+        self.category_id = middle.category_id
+        self.bulk_ids = [row.id for row in own.with_entities(Expense.id).order_by(Expense.id).limit(100)]
+        # A throwaway account for the access-changing cases
+        self.target = AuthService.create_user(db, UserCreate(
+            email=f"bench-suite-{self.run}@example.com", username=f"bench-suite-{self.run}",
+            full_name="Bench Suite", password=PASSWORD,
+        ))
+        self.employee_headers = self.headers(self.employee)
+        self.manager_headers = self.headers(self.manager)
+        db.expunge_all()
+
+    @staticmethod
+    def headers(user: User) -> Dict[str, str]:
+        return {"Authorization": "Bearer " + AuthService.create_access_token_for_user(user)}
+
+    def unique(self, prefix: str) -> str:
+        return f"{prefix}-{self.run}-{next(self.counter)}"
+
+    def new_expense(self) -> ExpenseCreate:
+        return ExpenseCreate(title="Benchmark expense", amount=42.5, date=self.end, category_id=self.category_id)
+
+    def new_user(self) -> UserCreate:
+        name = self.unique("bench-new")
+        return UserCreate(email=f"{name}@example.com", username=name, full_name="Bench New", password=PASSWORD)
+
+    def import_csv(self, rows: int = 100) -> bytes:
+        lines = ["title,amount,date,category_id"]
+        lines += [f"Imported {i},{10 + i % 90}.50,{self.end:%Y-%m-%d},{self.category_id}" for i in range(rows)]
+        return ("\n".join(lines) + "\n").encode()
+
+
+def service_cases(fx: Fixture) -> List[Case]:
+    db, employee, manager = fx.db, fx.employee, fx.manager
+    return [
+        ("ExpenseService.create_expense", lambda: ExpenseService.create_expense(db, fx.new_expense(), employee.id)),
+        ("ExpenseService.get_user_expenses", lambda: ExpenseService.get_user_expenses(db, employee.id)),
+        ("ExpenseService.get_user_expenses (cursor)",
+         lambda: ExpenseService.get_user_expenses(db, employee.id, after=fx.after)),
+        ("ExpenseService.get_all_expenses", lambda: ExpenseService.get_all_expenses(db)),
+        ("ExpenseService.get_all_expenses (cursor)", lambda: ExpenseService.get_all_expenses(db, after=fx.after)),
+        ("ExpenseService.get_expense_by_id", lambda: ExpenseService.get_expense_by_id(db, fx.expense_id)),
+        ("ExpenseService.update_expense_status",
+         lambda: ExpenseService.update_expense_status(db, fx.expense_id, next(fx.statuses), manager.id)),
+        ("ExpenseService.bulk_update_status (100 ids)",
+         lambda: ExpenseService.bulk_update_status(db, next(fx.statuses), ids=fx.bulk_ids)),
+        ("ExpenseService.get_user_recent_expenses", lambda: ExpenseService.get_user_recent_expenses(db, employee.id)),
+        ("ExpenseService.get_user_recent_expense_versions",
+         lambda: ExpenseService.get_user_recent_expense_versions(db, employee.id)),
+        ("ExpenseService.get_expenses_by_status",
+         lambda: ExpenseService.get_expenses_by_status(db, ExpenseStatus.PENDING)),
+        ("ExpenseService.get_expense_stats", lambda: ExpenseService.get_expense_stats(db, employee.id)),
+        ("ExpenseService.get_expense_stats (all)", lambda: ExpenseService.get_expense_stats(db)),
+    ] + [
+        (f"AnalyticsService.{name}{suffix}", lambda name=name, user_id=user_id: getattr(AnalyticsService, name)(db, user_id))
+        for name in ("get_category_breakdown", "get_monthly_trends", "get_status_breakdown",
+                     "get_recent_expenses", "get_comprehensive_analytics")
+        for suffix, user_id in (("", employee.id), (" (all)", None))
+    ] + [
+        ("AuthService.create_user", lambda: AuthService.create_user(db, fx.new_user())),
+        ("AuthService.create_user_async", lambda: fx.loop.run_until_complete(AuthService.create_user_async(db, fx.new_user()))),
+        ("AuthService.authenticate_user", lambda: AuthService.authenticate_user(db, employee.email, PASSWORD)),
+        ("AuthService.authenticate_user_async",
+         lambda: fx.loop.run_until_complete(AuthService.authenticate_user_async(db, employee.email, PASSWORD))),
+        ("AuthService.update_password_hash",
+         lambda: AuthService.update_password_hash(db, db.get(User, fx.target.id), fx.target.hashed_password)),
+        ("AuthService.get_user_by_email", lambda: AuthService.get_user_by_email(db, employee.email)),
+        ("AuthService.get_user_by_id", lambda: AuthService.get_user_by_id(db, employee.id)),
+        ("AuthService.update_user_access",
+         lambda: AuthService.update_user_access(db, fx.target.id, is_active=next(fx.counter) % 2 == 0)),
+        ("AuthService.create_access_token_for_user", lambda: AuthService.create_access_token_for_user(employee)),
+        ("AuthService.is_manager", lambda: AuthService.is_manager(employee)),
+    ]
+
+
+def route_cases(fx: Fixture, ai: bool) -> List[Case]:
+    client, employee_headers, manager_headers = fx.client, fx.employee_headers, fx.manager_headers
+
+    def call(method: str, path: str, headers: Optional[Dict[str, str]] = None, **kwargs) -> Callable[[], Any]:
+        def request():
+            response = client.request(method, API + path, headers=headers, **kwargs)
+            response.raise_for_status()
+            return response
+        return request
+
+    def register():
+        user = fx.new_user()
+        return call("POST", "/auth/register", json=user.model_dump(mode="json"))()
+
+    expense = lambda: fx.new_expense().model_dump(mode="json")
+    cases = [
+        ("POST /auth/register", register),
+        ("POST /auth/login", call("POST", "/auth/login", json={"email": fx.employee.email, "password": PASSWORD})),
+        ("GET /auth/me", call("GET", "/auth/me", employee_headers)),
+        ("POST /expenses/", lambda: call("POST", "/expenses/", employee_headers, json=expense())()),
+        ("POST /expenses/import", lambda: call(
+            "POST", "/expenses/import", employee_headers, params={"format": "csv"},
+            files={"file": ("bench.csv", io.BytesIO(fx.import_csv()), "text/csv")},
+        )()),
+        ("GET /expenses/user", call("GET", "/expenses/user", employee_headers)),
+        ("GET /expenses/", call("GET", "/expenses/", manager_headers)),
+        ("GET /expenses/export", call("GET", "/expenses/export", employee_headers, params={
+            "format": "csv", "date_from": (fx.end - timedelta(days=90)).isoformat(),
+        })),
+        ("GET /expenses/{expense_id}", call("GET", f"/expenses/{fx.expense_id}", manager_headers)),
+        ("PUT /expenses/{expense_id}/approve", call("PUT", f"/expenses/{fx.expense_id}/approve", manager_headers)),
+        ("PUT /expenses/{expense_id}/reject", call("PUT", f"/expenses/{fx.expense_id}/reject", manager_headers)),
+        ("POST /expenses/bulk-status", lambda: call("POST", "/expenses/bulk-status", manager_headers, json={
+            "status": next(fx.statuses).value, "ids": fx.bulk_ids,
+        })()),
+        ("GET /expenses/status/{status}", call("GET", "/expenses/status/pending", manager_headers)),
+        ("GET /analytics/all", call("GET", "/analytics/all", manager_headers)),
+        ("GET /analytics/cache/stats", call("GET", "/analytics/cache/stats", manager_headers)),
+    ] + [
+        (f"GET /analytics/{name}", call("GET", f"/analytics/{name}", employee_headers))
+        for name in ("monthly", "categories", "trends", "status", "recent")
+    ] + [
+        ("GET /ai/cache/stats", call("GET", "/ai/cache/stats", manager_headers)),
+        ("GET /categories/", call("GET", "/categories/", employee_headers)),
+        ("POST /categories/", lambda: call("POST", "/categories/", manager_headers, json={"name": fx.unique("Bench")})()),
+        ("GET /categories/{category_id}", call("GET", f"/categories/{fx.category_id}", employee_headers)),
+        ("GET /admin/db/pool", call("GET", "/admin/db/pool", manager_headers)),
+        ("GET /admin/principal-cache/stats", call("GET", "/admin/principal-cache/stats", manager_headers)),
+        ("GET /admin/category-registry/stats", call("GET", "/admin/category-registry/stats", manager_headers)),
+        ("GET /admin/conditional-get/stats", call("GET", "/admin/conditional-get/stats", manager_headers)),
+        ("PATCH /admin/users/{user_id}", lambda: call(
+            "PATCH", f"/admin/users/{fx.target.id}", manager_headers, json={"is_active": next(fx.counter) % 2 == 0},
+        )()),
+    ]
+    if ai:
+        cases += [
+            ("POST /ai/summary", call("POST", "/ai/summary", employee_headers, json={"days": 30})),
+            ("POST /ai/summary/stream", call("POST", "/ai/summary/stream", employee_headers, json={"days": 30})),
+            ("POST /ai/predict-category", call("POST", "/ai/predict-category", employee_headers, params={
+                "title": "Team dinner", "amount": 84.0,
+            })),
+            ("POST /ai/predict-category/batch", call("POST", "/ai/predict-category/batch", employee_headers, json={
+                "items": [{"title": "Taxi", "amount": 23.0}, {"title": "Hotel stay", "amount": 310.0}],
+            })),
+            ("POST /ai/budget-recommendations", call("POST", "/ai/budget-recommendations", employee_headers, params={
+                "monthly_budget": 2500,
+            })),
+        ]
+    return cases
+
+
+def not_covered(cases: List[Case]) -> Dict[str, List[str]]:
+    """Public service methods and API routes that no case exercises."""
+    names = {name.split(" ")[0] for name, _ in cases}
+    methods = [
+        f"{service.__name__}.{name}" for service in SERVICES for name, member in vars(service).items()
+        if not name.startswith("_") and isinstance(member, staticmethod)
+    ]
+    routes = {name.split(" (")[0] for name, _ in cases}
+    api_routes = [
+        f"{method} {route.path[len(API):]}" for route in app.routes if route.path.startswith(API)
+        for method in sorted(getattr(route, "methods", ()))
+    ]
+    return {
+        "methods": [name for name in methods if name not in names],
+        "routes": [name for name in api_routes if name not in routes],
+    }
+
+
+def measure(fn: Callable[[], Any], db: Session, runs: int) -> Dict[str, Any]:
+    samples = []
+    for run in range(runs + 1):
+        start = time.perf_counter()
+        try:
+            fn()
+        except Exception as e:
+            db.rollback()
+            message = str(e).splitlines()[0][:200] if str(e) else ""
+            return {"error": f"{type(e).__name__}: {message}"}
+        elapsed = time.perf_counter() - start
+        db.expunge_all()
+        if run:  # the first call warms caches and connections
+            samples.append(elapsed * 1000)
+    samples.sort()
+    return {
+        "runs": runs,
+        "min_ms": round(samples[0], 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+    }
+
+
+def git_revision() -> Dict[str, Any]:
+    def git(*args: str) -> str:
+        return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+    try:
+        return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+
+
+def run_suite(args: argparse.Namespace) -> Dict[str, Any]:
+    end = args.end or date.today()
+    pattern = re.compile(args.only) if args.only else None
+    analytics_cache.enabled = False
+    client = TestClient(app)
+    with engine.connect() as connection:
+        server_version = ".".join(str(part) for part in connection.dialect.server_version_info or ())
+    report: Dict[str, Any] = {
+        "meta": {
+            **git_revision(),
+            "started_at": datetime.utcnow().isoformat() + "Z",
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": f"{engine.dialect.name} {server_version}".strip(),
+            "async_db": settings.ASYNC_DB,
+            "runs": args.runs, "users": args.users, "seed": args.seed, "end": end.isoformat(),
+        },
+        "scales": {},
+    }
+    for scale in args.scales:
+        db = SessionLocal()
+        try:
+            print(f"== {scale:,} expenses")
+            started = time.perf_counter()
+            generate(db, scale, users=args.users, seed=args.seed, end=end)
+            generated = time.perf_counter() - started
+            rows = db.query(func.count(Expense.id)).scalar()
+            fx = Fixture(db, client, datetime.combine(end, datetime.min.time()))
+            cases = service_cases(fx) + route_cases(fx, args.ai)
+            results = {}
+            for name, fn in cases:
+                if pattern and not pattern.search(name):
+                    continue
+                results[name] = result = measure(fn, db, args.runs)
+                print(f"  {name:<58} {result.get('error') or format(result['median_ms'], '10.2f') + ' ms'}")
+            report["scales"][str(scale)] = {
+                "rows": rows, "generate_seconds": round(generated, 1),
+                "results": results, "not_covered": not_covered(cases),
+            }
+            fx.loop.close()
+        finally:
+            db.close()
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=lambda value: [int(part) for part in value.split(",")],
+                        default=[10_000, 1_000_000, 10_000_000], help="comma-separated expense counts")
+    parser.add_argument("--runs", type=int, default=20, help="timed calls per case (after one warm-up call)")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--end", type=date.fromisoformat, default=None,
+                        help="latest synthetic expense date, YYYY-MM-DD (default today)")
+    parser.add_argument("--only", help="regex; only run cases whose name matches")
+    parser.add_argument("--ai", action="store_true", help="include the AI routes (needs Groq or the fake LLM server)")
+    parser.add_argument("--output", help="write the JSON results here (default bench-results/<commit>.json)")
+    args = parser.parse_args()
+
+    report = run_suite(args)
+    output = args.output or f"bench-results/{(report['meta']['commit'] or 'unknown')[:12]}.json"
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+    print(f"Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
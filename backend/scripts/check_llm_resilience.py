@@ -0,0 +1,154 @@
+"""Exercise the shared Groq client's timeouts, retries and circuit breaker against the fake LLM server.
+
+Starts ``scripts.fake_llm_server`` in-process on a free port, points an
+``LLMClient`` at it with short timeouts and backoff, and runs one scenario
+per behaviour. Prints ok/FAIL per scenario and exits non-zero on any failure.
+No database or Groq key is needed.
+
+    python -m scripts.check_llm_resilience
+"""
+import asyncio
+import socket
+import sys
+import threading
+import time
+from typing import Awaitable, Callable, List, Tuple
+
+import httpx
+import uvicorn
+from groq import APIStatusError, APITimeoutError
+
+from app.services.llm_client import CircuitBreaker, CircuitOpenError, LLMClient
+from scripts import fake_llm_server
+
+REQUEST = {"model": "fake", "messages": [{"role": "user", "content": "hi"}], "max_tokens": 10}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(fake_llm_server.app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def main_async(base_url: str) -> List[Tuple[str, bool, str]]:
+    control = httpx.AsyncClient(base_url=base_url)
+
+    async def configure(**values) -> None:
+        defaults = {"latency": 0.0, "fail_status": 503, "fail_count": 0, "retry_after": None}
+        await control.post("/_control", json={**defaults, **values})
+
+    async def requests_seen() -> int:
+        return (await control.get("/_control")).json()["requests"]
+
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=0.5)
+    client = LLMClient(api_key="fake", base_url=base_url, timeout=0.3, max_attempts=3,
+                       backoff_seconds=0.02, backoff_max_seconds=0.1, breaker=breaker)
+    results: List[Tuple[str, bool, str]] = []
+
+    async def scenario(name: str, check: Callable[[], Awaitable[Tuple[bool, str]]]) -> None:
+        try:
+            passed, detail = await check()
+        except Exception as e:
+            passed, detail = False, f"unexpected {type(e).__name__}: {e}"
+        results.append((name, passed, detail))
+
+    async def success():
+        await configure()
+        response = await client.acreate("check", **REQUEST)
+        return response.choices[0].message.content.startswith("Spending") and await requests_seen() == 1, "1 request"
+
+    async def transient_errors_are_retried():
+        await configure(fail_status=503, fail_count=2)
+        await client.acreate("check", **REQUEST)
+        seen = await requests_seen()
+        return seen == 3, f"{seen} requests for 2 failures"
+
+    async def rate_limit_honours_retry_after():
+        await configure(fail_status=429, fail_count=1, retry_after=0.1)
+        start = time.perf_counter()
+        await client.acreate("check", **REQUEST)
+        waited = time.perf_counter() - start
+        return waited >= 0.1, f"waited {waited:.2f}s"
+
+    async def client_errors_are_not_retried():
+        await configure(fail_status=400, fail_count=1)
+        try:
+            await client.acreate("check", **REQUEST)
+            return False, "no error raised"
+        except APIStatusError as e:
+            seen = await requests_seen()
+            return e.status_code == 400 and seen == 1 and breaker.state == "closed", f"{seen} request(s)"
+
+    async def slow_calls_time_out():
+        await configure(latency=1.0)
+        start = time.perf_counter()
+        try:
+            await client.acreate("check", **REQUEST)
+            return False, "no timeout"
+        except APITimeoutError:
+            elapsed = time.perf_counter() - start
+            return elapsed < 1.5, f"gave up after {elapsed:.2f}s (3 attempts x 0.3s)"
+
+    async def breaker_opens_and_fails_fast():
+        await configure(fail_status=500, fail_count=-1)
+        for _ in range(2):
+            try:
+                await client.acreate("check", **REQUEST)
+            except APIStatusError:
+                pass
+        seen = await requests_seen()
+        start = time.perf_counter()
+        try:
+            await client.acreate("check", **REQUEST)
+            return False, "call went through"
+        except CircuitOpenError:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            quiet = await requests_seen() == seen
+            return breaker.state == "open" and quiet, f"failed fast in {elapsed_ms:.2f}ms"
+
+    async def breaker_recovers_after_reset():
+        await configure()
+        await asyncio.sleep(breaker.reset_seconds)
+        await client.acreate("check", **REQUEST)
+        return breaker.state == "closed", f"state {breaker.state}"
+
+    async def streaming():
+        await configure()
+        stream = await client.acreate("check", **REQUEST, stream=True)
+        text = "".join([chunk.choices[0].delta.content or "" async for chunk in stream])
+        return text.startswith("Spending"), f"{len(text)} chars streamed"
+
+    # Independent scenarios start from a closed circuit; the last three build on each other
+    for check in (success, transient_errors_are_retried, rate_limit_honours_retry_after,
+                  client_errors_are_not_retried, slow_calls_time_out):
+        await scenario(check.__name__, check)
+        breaker.record_success()
+    for check in (breaker_opens_and_fails_fast, breaker_recovers_after_reset, streaming):
+        await scenario(check.__name__, check)
+
+    await control.aclose()
+    return results
+
+
+def main() -> int:
+    port = free_port()
+    server = start_server(port)
+    try:
+        results = asyncio.run(main_async(f"http://127.0.0.1:{port}"))
+    finally:
+        server.should_exit = True
+    for name, passed, detail in results:
+        print(f"{'ok  ' if passed else 'FAIL'} {name:<34} {detail}")
+    return 0 if all(passed for _, passed, _ in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
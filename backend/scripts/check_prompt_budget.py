@@ -0,0 +1,75 @@
+"""Show AI prompt sizes as the number of expenses grows, and fail if any exceeds the budget.
+
+Synthetic expenses are built in memory (no database or Groq key needed) and
+passed through the summary and budget prompt builders. The size the old
+builders produced (every expense as indented JSON) is shown for comparison.
+
+    python -m scripts.check_prompt_budget --counts 10 100 400 5000
+"""
+import argparse
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.models.category import Category
+from app.models.expense import Expense
+from app.services.ai_service import AIService
+from app.services.prompt_builder import estimate_tokens
+
+CATEGORIES = ["Travel", "Meals & Entertainment", "Office Supplies", "Software & Subscriptions", "Transportation"]
+MERCHANTS = ["Uber trip", "Delta flight", "Starbucks coffee", "Staples order", "AWS invoice", "Hilton stay",
+             "Client lunch", "Zoom subscription", "Parking garage", "Team dinner"]
+
+
+def synthetic_expenses(count: int, days: int = 30, seed: int = 7):
+    rng = random.Random(seed)
+    categories = [Category(id=i + 1, name=name) for i, name in enumerate(CATEGORIES)]
+    now = datetime(2024, 1, 31, 12)
+    expenses = []
+    for i in range(count):
+        category = rng.choice(categories)
+        expenses.append(Expense(
+            id=i + 1,
+            title=f"{rng.choice(MERCHANTS)} #{i}",
+            amount=round(rng.lognormvariate(3.5, 1.0), 2),
+            description="Synthetic expense for prompt sizing",
+            date=now - timedelta(minutes=rng.randrange(days * 24 * 60)),
+            category_id=category.id,
+            category=category,
+        ))
+    return expenses
+
+
+def legacy_tokens(expenses) -> int:
+    """Size of the expense JSON the previous summary prompt embedded."""
+    return estimate_tokens(json.dumps([{
+        "title": expense.title,
+        "amount": float(expense.amount),
+        "category": expense.category.name,
+        "date": expense.date.strftime("%Y-%m-%d"),
+        "description": expense.description or "No description",
+    } for expense in expenses], indent=2))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 400, 5000])
+    args = parser.parse_args()
+
+    budget = settings.AI_PROMPT_TOKEN_BUDGET
+    print(f"token budget {budget} (estimated at ~4 chars/token)")
+    print(f"{'expenses':>9} {'legacy':>9} {'summary':>9} {'budget':>9}")
+    over = 0
+    for count in args.counts:
+        expenses = synthetic_expenses(count)
+        summary = estimate_tokens(AIService._summary_request(expenses, "Jane Doe")["messages"][1]["content"])
+        recommendations = estimate_tokens(AIService._budget_request(expenses, 2500.0)["messages"][1]["content"])
+        over += (summary > budget) + (recommendations > budget)
+        print(f"{count:>9} {legacy_tokens(expenses):>9} {summary:>9} {recommendations:>9}")
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
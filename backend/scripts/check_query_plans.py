@@ -0,0 +1,185 @@
+"""Fail if a hot service query falls back to a sequential scan on expenses.
+
+Every query below is executed through the real service methods, the SQL the
+ORM emits is captured from the engine, and each statement is re-run under
+EXPLAIN (FORMAT JSON). The check exits non-zero if any plan contains a
+``Seq Scan`` on the ``expenses`` table.
+
+Run it from ``backend/`` against a disposable, migrated database:
+
+    alembic upgrade head
+    python -m scripts.check_query_plans --seed 200000
+"""
+import argparse
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal, engine
+from app.models.expense import Expense, ExpenseStatus
+from app.services.analytics_service import AnalyticsService
+from app.services.expense_service import ExpenseService
+from app.services.rollup_service import RollupService
+
+# Tables that are allowed to be scanned sequentially (tiny lookup tables;
+# data_versions is read by the category registry's version check).
+SEQ_SCAN_ALLOWED = {"categories", "users", "data_versions"}
+
+SEED_USERS = 200
+SEED_CATEGORIES = [
+    "Travel", "Meals & Entertainment", "Office Supplies", "Software & Subscriptions",
+    "Transportation", "Utilities", "Marketing & Advertising", "Professional Services",
+    "Training & Education", "Miscellaneous",
+]
+
+
+def seed(db: Session, expenses: int) -> None:
+    """Top the database up to ``expenses`` rows of synthetic data."""
+    existing = db.execute(text("SELECT count(*) FROM expenses")).scalar()
+    if existing >= expenses:
+        return
+
+    for name in SEED_CATEGORIES:
+        db.execute(
+            text("INSERT INTO categories (name) VALUES (:name) ON CONFLICT (name) DO NOTHING"),
+            {"name": name},
+        )
+    db.execute(text("""
+        INSERT INTO users (email, username, hashed_password, full_name, role, is_active)
+        SELECT 'plan-check-' || g || '@example.com', 'plan-check-' || g, 'x',
+               'Plan Check ' || g, CASE WHEN g % 20 = 0 THEN 'MANAGER' ELSE 'EMPLOYEE' END::userrole, true
+        FROM generate_series(1, :n) AS g
+        ON CONFLICT DO NOTHING
+    """), {"n": SEED_USERS})
+    db.execute(text("""
+        INSERT INTO expenses (title, amount, description, date, status, user_id, category_id, created_at)
+        SELECT 'Synthetic expense ' || g,
+               round((random() * 500)::numeric, 2),
+               NULL,
+               now() - (random() * interval '730 days'),
+               (ARRAY['PENDING', 'APPROVED', 'REJECTED'])[1 + (g % 3)]::expensestatus,
+               u.ids[1 + (g % array_length(u.ids, 1))],
+               c.ids[1 + (g % array_length(c.ids, 1))],
+               now() - (random() * interval '730 days')
+        FROM generate_series(1, :n) AS g,
+             (SELECT array_agg(id) AS ids FROM users) AS u,
+             (SELECT array_agg(id) AS ids FROM categories) AS c
+    """), {"n": expenses - existing})
+    db.commit()
+    RollupService.rebuild(db)
+    db.execute(text("ANALYZE"))
+
+
+def sample_ids(db: Session) -> Tuple[int, Expense]:
+    """Pick a user and a mid-table expense (used as a keyset cursor) from the seeded data."""
+    user_id = db.execute(text(
+        "SELECT user_id FROM expenses GROUP BY user_id ORDER BY count(*) DESC LIMIT 1"
+    )).scalar()
+    middle = db.query(Expense).filter(Expense.user_id == user_id).order_by(Expense.date).offset(
+        db.query(Expense).filter(Expense.user_id == user_id).count() // 2
+    ).first()
+    return user_id, middle
+
+
+def service_queries(user_id: int, expense: Expense) -> List[Tuple[str, Callable[[Session], Any]]]:
+    """Every service call whose SQL must be index-driven."""
+    expense_id, after = expense.id, (expense.date, expense.id)
+    return [
+        ("ExpenseService.get_user_expenses",
+         lambda db: ExpenseService.get_user_expenses(db, user_id=user_id)),
+        ("ExpenseService.get_user_expenses (cursor)",
+         lambda db: ExpenseService.get_user_expenses(db, user_id=user_id, after=after)),
+        ("ExpenseService.get_all_expenses",
+         lambda db: ExpenseService.get_all_expenses(db)),
+        ("ExpenseService.get_all_expenses (cursor)",
+         lambda db: ExpenseService.get_all_expenses(db, after=after)),
+        ("ExpenseService.get_expenses_by_status",
+         lambda db: ExpenseService.get_expenses_by_status(db, status=ExpenseStatus.PENDING)),
+        ("ExpenseService.get_expenses_by_status (cursor)",
+         lambda db: ExpenseService.get_expenses_by_status(db, status=ExpenseStatus.PENDING, after=after)),
+        ("ExpenseService.get_expense_by_id",
+         lambda db: ExpenseService.get_expense_by_id(db, expense_id=expense_id)),
+        ("ExpenseService.get_user_recent_expenses",
+         lambda db: ExpenseService.get_user_recent_expenses(db, user_id=user_id)),
+        ("ExpenseService.get_expense_stats",
+         lambda db: ExpenseService.get_expense_stats(db, user_id=user_id)),
+        ("AnalyticsService.get_category_breakdown",
+         lambda db: AnalyticsService.get_category_breakdown(db, user_id=user_id)),
+        ("AnalyticsService.get_monthly_trends",
+         lambda db: AnalyticsService.get_monthly_trends(db, user_id=user_id)),
+        ("AnalyticsService.get_status_breakdown",
+         lambda db: AnalyticsService.get_status_breakdown(db, user_id=user_id)),
+        ("AnalyticsService.get_recent_expenses (user)",
+         lambda db: AnalyticsService.get_recent_expenses(db, user_id=user_id)),
+        ("AnalyticsService.get_recent_expenses (all)",
+         lambda db: AnalyticsService.get_recent_expenses(db)),
+        ("AnalyticsService.get_comprehensive_analytics",
+         lambda db: AnalyticsService.get_comprehensive_analytics(db, user_id=user_id)),
+    ]
+
+
+def capture_statements(db: Session, call: Callable[[Session], Any]) -> List[Tuple[str, Any]]:
+    """Run ``call`` and return the SELECT statements it sent to the database."""
+    captured: List[Tuple[str, Any]] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        call(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        db.rollback()
+    return captured
+
+
+def seq_scans(plan: Dict[str, Any]) -> List[str]:
+    """Return the relations scanned sequentially anywhere in ``plan``."""
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") not in SEQ_SCAN_ALLOWED:
+        found.append(plan.get("Relation Name"))
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=0,
+                        help="ensure at least this many synthetic expenses exist before checking")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.seed:
+            seed(db, args.seed)
+        user_id, expense = sample_ids(db)
+        if user_id is None:
+            print("No expenses found; run with --seed N first.", file=sys.stderr)
+            return 2
+
+        failures = 0
+        for label, call in service_queries(user_id, expense):
+            for statement, parameters in capture_statements(db, call):
+                plan = db.connection().exec_driver_sql(
+                    "EXPLAIN (FORMAT JSON) " + statement, parameters
+                ).scalar()
+                scanned = seq_scans(plan[0]["Plan"])
+                if scanned:
+                    failures += 1
+                    print(f"FAIL {label}: Seq Scan on {', '.join(scanned)}")
+                    print(f"     {' '.join(statement.split())}")
+                else:
+                    print(f"ok   {label}")
+                db.rollback()
+        return 1 if failures else 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
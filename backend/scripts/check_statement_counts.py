@@ -0,0 +1,91 @@
+"""Fail if an expense list endpoint issues more SQL as the page grows.
+
+Each list route is requested through the ASGI app at several page sizes
+while the engine counts the statements it executes. The count must be the
+same for every page size; a difference means a per-row (N+1) relationship
+load has crept back in.
+
+Run it from ``backend/`` against a database with some expenses in it:
+
+    python -m scripts.check_statement_counts
+"""
+import sys
+from typing import Dict, List, Tuple
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, func
+
+from app.core.database import SessionLocal, engine
+from app.main import app
+from app.models.expense import Expense
+from app.models.user import User, UserRole
+from app.services.auth_service import AuthService
+from app.services.category_registry import category_registry
+from app.services.principal_cache import principal_cache
+
+PAGE_SIZES = [1, 10, 100, 1000]
+
+
+def auth_headers(user: User) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {AuthService.create_access_token_for_user(user)}"}
+
+
+def count_statements(client: TestClient, path: str, headers: Dict[str, str], limit: int) -> Tuple[int, int]:
+    """Return (statements executed, rows returned) for one request."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = client.get(path, params={"limit": limit}, headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    response.raise_for_status()
+    return len(statements), len(response.json())
+
+
+def main() -> int:
+    db = SessionLocal()
+    try:
+        manager = db.query(User).filter(User.role == UserRole.MANAGER, User.is_active.is_(True)).first()
+        busiest = db.query(Expense.user_id).group_by(Expense.user_id).order_by(
+            func.count(Expense.id).desc()
+        ).limit(1).scalar()
+        employee = db.get(User, busiest) if busiest else None
+        if manager is None or employee is None:
+            print("Need at least one active manager and one user with expenses.", file=sys.stderr)
+            return 2
+        routes: List[Tuple[str, Dict[str, str]]] = [
+            ("/api/v1/expenses/user", auth_headers(employee)),
+            ("/api/v1/expenses/", auth_headers(manager)),
+            ("/api/v1/expenses/status/pending", auth_headers(manager)),
+        ]
+        # The category registry re-reads its data version every check_seconds, which would add a
+        # statement to whichever request happens to hit it: load it once, then stop checking
+        category_registry.snapshot(db)
+        category_registry.check_seconds = float("inf")
+    finally:
+        db.close()
+
+    # With the principal cache only the first request per user pays for the users lookup;
+    # turn it off so every request runs the same statements.
+    principal_cache.enabled = False
+    client = TestClient(app)
+    failures = 0
+    for path, headers in routes:
+        counts = {limit: count_statements(client, path, headers, limit) for limit in PAGE_SIZES}
+        distinct = {statements for statements, _ in counts.values()}
+        summary = ", ".join(f"limit={limit}: {rows} rows/{statements} stmts"
+                            for limit, (statements, rows) in counts.items())
+        if len(distinct) == 1:
+            print(f"ok   {path} ({summary})")
+        else:
+            failures += 1
+            print(f"FAIL {path} ({summary})")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""A local stand-in for Groq's chat completions API, for testing without a key or network.
+
+Serves ``POST /openai/v1/chat/completions`` (plain and ``stream=true``) with a
+canned answer. Latency and failures are controlled at runtime through
+``POST /_control`` and read back (with the request count) from
+``GET /_control``:
+
+    {"latency": 0.2, "fail_status": 503, "fail_count": 2, "retry_after": null}
+
+``fail_count`` requests fail with ``fail_status`` before it recovers; -1
+fails every request until changed. Point the app at it with
+``GROQ_BASE_URL=http://127.0.0.1:8099``.
+
+    python -m scripts.fake_llm_server --port 8099
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Dict, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+ANSWER = "Spending looks healthy. Travel is the largest category; consider booking flights earlier."
+
+app = FastAPI(title="Fake LLM")
+state: Dict[str, Any] = {"latency": 0.0, "fail_status": 503, "fail_count": 0, "retry_after": None, "requests": 0}
+
+
+class Control(BaseModel):
+    latency: Optional[float] = None
+    fail_status: Optional[int] = None
+    fail_count: Optional[int] = None
+    retry_after: Optional[float] = None
+
+
+@app.get("/_control")
+async def get_control():
+    return state
+
+
+@app.post("/_control")
+async def set_control(control: Control):
+    state.update(control.model_dump(exclude_unset=True))
+    state["requests"] = 0
+    return state
+
+
+def _completion(content: str, model: str) -> Dict[str, Any]:
+    return {
+        "id": "chatcmpl-fake",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+def _answer(body: Dict[str, Any]) -> str:
+    """A plausible answer for the request: JSON categories for batch prompts, text otherwise."""
+    if (body.get("response_format") or {}).get("type") == "json_object":
+        prompt = body["messages"][-1]["content"]
+        count = prompt.count('"i": ')
+        return json.dumps({"categories": ["Miscellaneous"] * count})
+    return ANSWER
+
+
+@app.post("/openai/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    state["requests"] += 1
+    await asyncio.sleep(state["latency"])
+
+    if state["fail_count"]:
+        if state["fail_count"] > 0:
+            state["fail_count"] -= 1
+        headers = {"retry-after": str(state["retry_after"])} if state["retry_after"] is not None else {}
+        return JSONResponse({"error": {"message": "fake failure", "type": "fake"}},
+                            status_code=state["fail_status"], headers=headers)
+
+    content, model = _answer(body), body.get("model", "fake")
+    if not body.get("stream"):
+        return _completion(content, model)
+
+    async def chunks():
+        for word in content.split(" "):
+            chunk = {"id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": int(time.time()),
+                     "model": model, "choices": [{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}]}
+            yield f"data: {json.dumps(chunk)}\n\n"
+            await asyncio.sleep(0.01)
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(chunks(), media_type="text/event-stream")
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    args = parser.parse_args()
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
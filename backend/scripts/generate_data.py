@@ -0,0 +1,253 @@
+"""Fill users/categories/expenses with deterministic, realistically distributed synthetic data.
+
+Expense row ``i`` depends only on ``--seed``, ``--end``, the user count and
+``i``: rows are generated in fixed blocks, each from its own seeded RNG, so
+topping a database up from 10k to 1M rows produces the same 1M rows as
+generating 1M at once. Distributions:
+
+* users: ``bench-user-NNNNNN@example.com``, every 20th a manager, all with
+  the password ``benchmark123``; activity is Pareto-skewed, so a few users
+  own a large share of the expenses
+* categories: the ten standard categories, Zipf-weighted (Travel and Meals
+  dominate, Utilities is rare), each with its own log-normal amount curve
+  and typical titles
+* dates: spread over ``--years`` years up to ``--end``, denser towards the
+  present, in business hours; ``created_at`` trails ``date`` by up to 3 days
+* status: recent expenses are mostly pending, older ones mostly approved
+
+Rollups are rebuilt and the data versions bumped afterwards, so analytics,
+caches and ETags of a running server stay correct.
+
+Run it from ``backend/`` against a disposable, migrated database:
+
+    python -m scripts.generate_data --users 1000 --expenses 1000000
+"""
+import argparse
+import csv
+import io
+import itertools
+import math
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, insert, text
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.core.security import get_password_hash
+from app.models.category import Category
+from app.models.expense import Expense, ExpenseStatus
+from app.models.user import User, UserRole
+from app.services.data_versions import CATEGORIES_SCOPE, DataVersions
+from app.services.rollup_service import RollupService
+
+PASSWORD = "benchmark123"
+BLOCK = 10_000
+MANAGER_EVERY = 20
+PENDING, APPROVED, REJECTED = ExpenseStatus.PENDING, ExpenseStatus.APPROVED, ExpenseStatus.REJECTED
+
+# name, description, relative frequency, median amount, log-normal sigma, typical titles
+CATEGORIES: Sequence[Tuple[str, str, float, float, float, Sequence[str]]] = (
+    ("Travel", "Business travel expenses including flights, hotels, and transportation", 10, 420, 0.8,
+     ("Flight to client site", "Hotel stay", "Conference travel", "Train tickets", "Rental car")),
+    ("Meals & Entertainment", "Business meals, client entertainment, and dining expenses", 8, 45, 0.7,
+     ("Client lunch", "Team dinner", "Coffee meeting", "Working lunch", "Client dinner")),
+    ("Transportation", "Local transportation, parking, and commuting expenses", 5, 25, 0.6,
+     ("Taxi", "Parking", "Ride share", "Fuel", "Toll charges")),
+    ("Office Supplies", "Office equipment, stationery, and workplace materials", 4, 35, 0.9,
+     ("Printer paper", "Notebooks and pens", "Desk lamp", "Monitor stand", "Toner cartridge")),
+    ("Software & Subscriptions", "Software licenses, cloud services, and digital tools", 3, 60, 1.0,
+     ("IDE license", "Cloud hosting", "Design tool subscription", "Video calls plan", "API credits")),
+    ("Training & Education", "Training courses, conferences, and educational materials", 2, 350, 0.9,
+     ("Online course", "Conference ticket", "Technical books", "Certification exam", "Workshop fee")),
+    ("Professional Services", "Consulting, legal, and professional service fees", 1.5, 900, 0.9,
+     ("Legal review", "Consulting hours", "Accounting services", "Translation", "Recruiting fee")),
+    ("Marketing & Advertising", "Marketing campaigns, advertising, and promotional expenses", 1.2, 500, 1.1,
+     ("Ad campaign", "Trade show booth", "Printed flyers", "Sponsored post", "Promotional items")),
+    ("Miscellaneous", "Other business expenses not covered by specific categories", 1, 30, 1.0,
+     ("Courier", "Bank fee", "Gift for client", "Postage", "Visa fee")),
+    ("Utilities", "Office utilities, internet, and communication services", 0.6, 80, 0.5,
+     ("Mobile phone bill", "Home internet", "Office electricity", "Co-working day pass", "Phone roaming")),
+)
+
+FIRST_NAMES = ("Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn",
+               "Robin", "Drew", "Emery", "Harper", "Kai", "Logan", "Noa", "Parker", "Reese", "Sky")
+LAST_NAMES = ("Smith", "Garcia", "Chen", "Okafor", "Novak", "Silva", "Kim", "Muller", "Rossi", "Haddad",
+              "Ivanova", "Nakamura", "Dubois", "Kowalski", "Singh", "Larsen", "Costa", "Moreau", "Lopez", "Brown")
+
+COPY_COLUMNS = ("title", "amount", "description", "date", "status", "user_id", "category_id", "created_at")
+
+# (title, amount, description, date, status, user index, category index, created_at)
+SyntheticRow = Tuple[str, float, Optional[str], datetime, ExpenseStatus, int, int, datetime]
+
+
+def user_email(index: int) -> str:
+    return f"bench-user-{index:06d}@example.com"
+
+
+def _cumulative(weights: Sequence[float]) -> List[float]:
+    return list(itertools.accumulate(weights))
+
+
+def user_weights(seed: int, users: int) -> List[float]:
+    """Pareto-distributed activity per user index, stable for a given seed."""
+    rng = random.Random(f"{seed}:users")
+    return [rng.paretovariate(1.2) for _ in range(users)]
+
+
+def generate_block(seed: int, block: int, user_cum: List[float], end: datetime, years: int) -> List[SyntheticRow]:
+    """The ``BLOCK`` synthetic expenses with row numbers ``block * BLOCK`` onwards (``end`` is a midnight)."""
+    rng = random.Random(f"{seed}:expenses:{block}")
+    category_cum = _cumulative([category[2] for category in CATEGORIES])
+    span_days = years * 365
+    users = rng.choices(range(len(user_cum)), cum_weights=user_cum, k=BLOCK)
+    categories = rng.choices(range(len(CATEGORIES)), cum_weights=category_cum, k=BLOCK)
+    rows = []
+    for user, category in zip(users, categories):
+        _, _, _, median, sigma, titles = CATEGORIES[category]
+        # sqrt skews towards 1, i.e. towards the present: the company grows
+        days_ago = span_days * (1 - math.sqrt(rng.random()))
+        # Business hours, 08:00-20:00
+        when = end - timedelta(days=int(days_ago)) + timedelta(minutes=480 + int(rng.random() * 720))
+        pending, approved = (0.80, 0.95) if days_ago < 14 else (0.04, 0.90)
+        draw = rng.random()
+        status = PENDING if draw < pending else APPROVED if draw < approved else REJECTED
+        title = titles[int(rng.random() * len(titles))]
+        amount = round(min(max(rng.lognormvariate(math.log(median), sigma), 1.0), 25000.0), 2)
+        description = f"{title} ({when:%b %Y})" if rng.random() < 0.4 else None
+        created_at = min(when + timedelta(minutes=int(rng.random() * 3 * 24 * 60)), end + timedelta(days=1))
+        rows.append((title, amount, description, when, status, user, category, created_at))
+    return rows
+
+
+def ensure_categories(db: Session) -> List[int]:
+    """Ids of the synthetic categories, by CATEGORIES index, inserting missing ones."""
+    existing = dict(db.query(Category.name, Category.id).filter(Category.name.in_([c[0] for c in CATEGORIES])).all())
+    missing = [{"name": name, "description": description}
+               for name, description, *_ in CATEGORIES if name not in existing]
+    if missing:
+        db.execute(insert(Category), missing)
+        db.commit()
+        DataVersions.bump(db, [CATEGORIES_SCOPE])
+        existing = dict(db.query(Category.name, Category.id).filter(Category.name.in_([c[0] for c in CATEGORIES])).all())
+    return [existing[category[0]] for category in CATEGORIES]
+
+
+def ensure_users(db: Session, seed: int, users: int) -> List[int]:
+    """Ids of the synthetic users, by index, inserting missing ones."""
+    emails = [user_email(index) for index in range(users)]
+    existing = dict(db.query(User.email, User.id).filter(User.email.like("bench-user-%@example.com")).all())
+    missing = [index for index, email in enumerate(emails) if email not in existing]
+    if missing:
+        rng = random.Random(f"{seed}:names")
+        names = [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}" for _ in range(users)]
+        hashed_password = get_password_hash(PASSWORD)
+        for start in range(0, len(missing), BLOCK):
+            db.execute(insert(User), [{
+                "email": emails[index],
+                "username": emails[index].split("@")[0],
+                "hashed_password": hashed_password,
+                "full_name": names[index],
+                "role": UserRole.MANAGER if index % MANAGER_EVERY == 0 else UserRole.EMPLOYEE,
+                "is_active": True,
+            } for index in missing[start:start + BLOCK]])
+        db.commit()
+        existing = dict(db.query(User.email, User.id).filter(User.email.like("bench-user-%@example.com")).all())
+    return [existing[email] for email in emails]
+
+
+def _write(db: Session, rows: List[Tuple]) -> None:
+    """Insert expense tuples (COPY_COLUMNS order) with COPY on psycopg2, executemany elsewhere."""
+    if db.get_bind().dialect.driver == "psycopg2":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            # The enum column stores member names
+            writer.writerow([value.name if isinstance(value, ExpenseStatus) else value for value in row])
+        buffer.seek(0)
+        cursor = db.connection().connection.driver_connection.cursor()
+        cursor.copy_expert(f"COPY expenses ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    else:
+        db.execute(insert(Expense), [dict(zip(COPY_COLUMNS, row)) for row in rows])
+
+
+def generate(
+    db: Session, expenses: int, users: int = 1000, seed: int = 1, years: int = 3,
+    end: Optional[date] = None, log: Callable[[str], None] = print
+) -> int:
+    """Top the expenses table up to ``expenses`` rows. Returns the number of rows added.
+
+    Existing rows (synthetic or not) count towards the total; the new rows
+    continue the synthetic sequence from there.
+    """
+    end_at = datetime.combine(end or date.today(), datetime.min.time())
+    category_ids = ensure_categories(db)
+    user_ids = ensure_users(db, seed, users)
+    existing = db.query(func.count(Expense.id)).scalar()
+    if existing >= expenses:
+        return 0
+
+    postgres = db.get_bind().dialect.name == "postgresql"
+    user_cum = _cumulative(user_weights(seed, users))
+    buckets: Dict[tuple, List[float]] = defaultdict(lambda: [0.0, 0])
+    started = time.perf_counter()
+    for block in range(existing // BLOCK, (expenses - 1) // BLOCK + 1):
+        first = block * BLOCK
+        rows = generate_block(seed, block, user_cum, end_at, years)
+        rows = rows[max(existing - first, 0):expenses - first]
+        resolved = [
+            (title, amount, description, when, status, user_ids[user], category_ids[category], created_at)
+            for title, amount, description, when, status, user, category, created_at in rows
+        ]
+        _write(db, resolved)
+        db.commit()
+        if not postgres:
+            for _, amount, _, when, status, user_id, category_id, _ in resolved:
+                bucket = buckets[(user_id, category_id, status, RollupService.month_of(when))]
+                bucket[0] += amount
+                bucket[1] += 1
+        done = min(first + BLOCK, expenses)
+        if done % (BLOCK * 50) == 0 or done == expenses:
+            log(f"  {done:,} / {expenses:,} expenses ({(done - existing) / (time.perf_counter() - started):,.0f} rows/s)")
+
+    log("  rebuilding rollups")
+    if postgres:
+        RollupService.rebuild(db)
+        db.execute(text("ANALYZE"))
+        db.commit()
+    else:
+        for (user_id, category_id, status, month), (amount, count) in buckets.items():
+            RollupService.apply_delta(
+                db, user_id, category_id, status, datetime.combine(month, datetime.min.time()), amount, count
+            )
+        db.commit()
+    DataVersions.expenses_changed(db, user_ids)
+    return expenses - existing
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--expenses", type=int, required=True, help="top the expenses table up to this many rows")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--years", type=int, default=3, help="how far back expense dates go")
+    parser.add_argument("--end", type=date.fromisoformat, default=None,
+                        help="latest expense date, YYYY-MM-DD (default today; fix it for identical data)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        added = generate(db, args.expenses, users=args.users, seed=args.seed, years=args.years, end=args.end)
+    finally:
+        db.close()
+    print(f"Added {added:,} expenses in {time.perf_counter() - started:.1f}s.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
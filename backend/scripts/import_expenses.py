@@ -0,0 +1,63 @@
+"""Bulk-import expenses from a CSV or NDJSON file.
+
+    python -m scripts.import_expenses expenses.csv --owner jane.smith@company.com
+    python -m scripts.import_expenses history.ndjson --owner 2 --chunk-size 10000
+
+Columns/keys: title, amount, date, description, category_id or category (name),
+and optionally user_id and status. Rows without a user_id belong to
+``--owner``. Runs with manager rights: rows may name any user and status.
+Invalid rows are printed and skipped; exits non-zero if any row failed.
+"""
+import argparse
+import sys
+import time
+
+from app.core.database import SessionLocal
+from app.models.user import User
+from app.services.expense_import_service import ExpenseImportService, FORMATS
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="file to import ('-' for stdin)")
+    parser.add_argument("--owner", required=True, help="email or id of the user who owns rows without user_id")
+    parser.add_argument("--format", choices=FORMATS, help="default: from the file extension")
+    parser.add_argument("--chunk-size", type=int, help="rows per transaction (default IMPORT_CHUNK_SIZE)")
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    db = SessionLocal()
+    try:
+        owner = db.query(User).filter(
+            User.id == int(args.owner) if args.owner.isdigit() else User.email == args.owner
+        ).first()
+        if owner is None:
+            print(f"No such user: {args.owner}", file=sys.stderr)
+            return 2
+
+        # Undecodable bytes are kept so the import stops at, and reports, the exact line
+        if args.path == "-":
+            sys.stdin.reconfigure(errors="surrogateescape")
+            file = sys.stdin
+        else:
+            file = open(args.path, encoding="utf-8-sig", errors="surrogateescape", newline="")
+        started = time.perf_counter()
+        with file:
+            result = ExpenseImportService.import_file(
+                db, file, fmt, owner_id=owner.id, any_user=True, chunk_size=args.chunk_size
+            )
+        elapsed = time.perf_counter() - started
+    finally:
+        db.close()
+
+    for error in result["errors"]:
+        print(f"line {error['line']}: {'; '.join(error['errors'])}")
+    if result["errors_truncated"]:
+        print(f"... {result['failed'] - len(result['errors'])} more failed row(s) not shown")
+    rows = result["imported"] + result["failed"]
+    print(f"Imported {result['imported']} of {rows} rows in {elapsed:.2f}s ({rows / elapsed:,.0f} rows/s).")
+    return 1 if result["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+"""Rebuild or verify the expense_monthly_rollups table.
+
+    python -m scripts.rollups verify    # report buckets that drifted from raw expenses
+    python -m scripts.rollups rebuild   # recompute every bucket from raw expenses
+
+``verify`` exits non-zero when drift is found.
+"""
+import argparse
+import sys
+
+from app.core.database import SessionLocal
+from app.services.rollup_service import RollupService
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["verify", "rebuild"])
+    parser.add_argument("--tolerance", type=float, default=0.005,
+                        help="allowed absolute difference in summed amounts (verify)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.command == "rebuild":
+            written = RollupService.rebuild(db)
+            print(f"Rebuilt {written} rollup rows.")
+            return 0
+
+        drift = RollupService.verify(db, tolerance=args.tolerance)
+        for row in drift:
+            print(
+                f"user={row['user_id']} category={row['category_id']} status={row['status']} "
+                f"month={row['month']:%Y-%m}: expected {row['expected_count']} / "
+                f"{row['expected_amount']:.2f}, rollup has {row['rollup_count']} / {row['rollup_amount']:.2f}"
+            )
+        print(f"{len(drift)} drifted rollup bucket(s).")
+        return 1 if drift else 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""Train the local category classifier from labelled expenses and report its quality.
+
+A seeded holdout split measures accuracy, per-category accuracy, how many
+predictions clear the confidence threshold (and how accurate those are), and
+single-prediction latency. The model is then retrained on every expense and
+written to CATEGORY_MODEL_PATH, where running workers pick it up.
+
+    python -m scripts.train_category_classifier --holdout 0.2
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.category_classifier import CategoryClassifier, training_samples
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--holdout", type=float, default=0.2, help="fraction of expenses held out for evaluation")
+    parser.add_argument("--threshold", type=float, default=settings.CATEGORY_CONFIDENCE_THRESHOLD)
+    parser.add_argument("--out", default=settings.CATEGORY_MODEL_PATH)
+    parser.add_argument("--seed", type=int, default=13)
+    parser.add_argument("--dry-run", action="store_true", help="report only; do not write the model")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        samples = training_samples(db)
+    finally:
+        db.close()
+    if len(samples) < 10:
+        print(f"Need at least 10 labelled expenses, found {len(samples)}.", file=sys.stderr)
+        return 2
+
+    shuffled = list(samples)
+    random.Random(args.seed).shuffle(shuffled)
+    split = int(len(shuffled) * (1 - args.holdout))
+    train, test = shuffled[:split], shuffled[split:]
+
+    start = time.perf_counter()
+    model = CategoryClassifier.fit(train)
+    train_seconds = time.perf_counter() - start
+
+    latencies, correct, confident, confident_correct = [], 0, 0, 0
+    per_class, per_class_correct = Counter(), Counter()
+    for title, description, amount, label in test:
+        start = time.perf_counter()
+        predicted, confidence = model.predict(title, description, amount)
+        latencies.append((time.perf_counter() - start) * 1_000_000)
+        hit = predicted == label
+        correct += hit
+        per_class[label] += 1
+        per_class_correct[label] += hit
+        if confidence >= args.threshold:
+            confident += 1
+            confident_correct += hit
+
+    print(f"{len(train)} training / {len(test)} holdout expenses, {len(model.classes)} categories, "
+          f"{len(model.idf)} features, trained in {train_seconds:.2f}s")
+    if test:
+        latencies.sort()
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(f"accuracy           {correct / len(test):.3f}")
+        print(f"above {args.threshold:.2f}         {confident / len(test):.3f} of predictions, "
+              f"accuracy {confident_correct / confident if confident else 0:.3f} (the rest go to Groq)")
+        print(f"latency            p50 {statistics.median(latencies):.0f}us   p99 {p99:.0f}us")
+        for label in sorted(per_class):
+            print(f"  {label:<28} {per_class_correct[label] / per_class[label]:.3f} ({per_class[label]})")
+
+    if not args.dry_run:
+        CategoryClassifier.fit(samples).save(args.out)
+        print(f"model trained on all {len(samples)} expenses written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
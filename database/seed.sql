@@ -70,4 +70,11 @@ INSERT INTO expenses (title, amount, description, date, status, user_id, categor
 ('Client Gift', 80.00, 'Gift for important client', NOW() - INTERVAL '5 days', 'approved', 4, 2, NOW()),
 ('Flight to Conference', 420.00, 'Flight to industry conference', NOW() - INTERVAL '3 days', 'approved', 4, 1, NOW()),
 ('Hotel Booking', 280.00, 'Hotel for conference stay', NOW() - INTERVAL '3 days', 'approved', 4, 1, NOW()),
-('Conference Registration', 300.00, 'Conference registration fee', NOW() - INTERVAL '2 days', 'pending', 4, 9, NOW()); 
\ No newline at end of file
+('Conference Registration', 300.00, 'Conference registration fee', NOW() - INTERVAL '2 days', 'pending', 4, 9, NOW()); 
+-- Build the analytics rollups for the rows inserted above
+INSERT INTO expense_monthly_rollups (user_id, category_id, status, month, total_amount, count)
+SELECT user_id, category_id, status, date_trunc('month', date)::date, sum(amount), count(*)
+FROM expenses
+GROUP BY user_id, category_id, status, date_trunc('month', date)::date
+ON CONFLICT (user_id, category_id, status, month) DO UPDATE
+SET total_amount = EXCLUDED.total_amount, count = EXCLUDED.count;